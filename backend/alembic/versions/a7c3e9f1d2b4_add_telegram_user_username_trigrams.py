@@ -0,0 +1,72 @@
+"""add telegram_user_username_trigrams table
+
+Revision ID: a7c3e9f1d2b4
+Revises: 28933715f49c
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f1d2b4'
+down_revision: Union[str, Sequence[str], None] = '28933715f49c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _build_trigrams(username):
+    username = username.lower()
+    return {username[i:i + 3] for i in range(len(username) - 2)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    trigrams_table = op.create_table(
+        'telegram_user_username_trigrams',
+        sa.Column('trigram', sa.String(length=3), nullable=False),
+        sa.Column('telegram_user_id', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('trigram', 'telegram_user_id')
+    )
+    op.create_index(
+        'ix_telegram_user_username_trigrams_telegram_user_id',
+        'telegram_user_username_trigrams',
+        ['telegram_user_id']
+    )
+
+    # Backfill the index from existing usernames in primary key batches
+    connection = op.get_bind()
+    last_id = None
+    while True:
+        query = "SELECT telegram_user_id, username FROM telegram_users WHERE username IS NOT NULL"
+        params = {"limit": BACKFILL_BATCH_SIZE}
+        if last_id is not None:
+            query += " AND telegram_user_id > :last_id"
+            params["last_id"] = last_id
+        query += " ORDER BY telegram_user_id LIMIT :limit"
+
+        rows = connection.execute(sa.text(query), params).fetchall()
+        if not rows:
+            break
+
+        entries = [
+            {"trigram": trigram, "telegram_user_id": telegram_user_id}
+            for telegram_user_id, username in rows
+            for trigram in _build_trigrams(username)
+        ]
+        if entries:
+            op.bulk_insert(trigrams_table, entries)
+
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_telegram_user_username_trigrams_telegram_user_id', table_name='telegram_user_username_trigrams')
+    op.drop_table('telegram_user_username_trigrams')
@@ -0,0 +1,32 @@
+"""add composite index on chat_members telegram_user_id, chat_id
+
+Revision ID: b5d2f8a4c6e1
+Revises: a7c3e9f1d2b4
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d2f8a4c6e1'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9f1d2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_chat_members_telegram_user_id_chat_id',
+        'chat_members',
+        ['telegram_user_id', 'chat_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_members_telegram_user_id_chat_id', table_name='chat_members')
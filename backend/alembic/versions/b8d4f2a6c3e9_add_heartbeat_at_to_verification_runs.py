@@ -0,0 +1,28 @@
+"""add heartbeat_at to verification_runs
+
+Revision ID: b8d4f2a6c3e9
+Revises: f3b7d1e9a5c2
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4f2a6c3e9'
+down_revision: Union[str, Sequence[str], None] = 'f3b7d1e9a5c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('verification_runs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('verification_runs', 'heartbeat_at')
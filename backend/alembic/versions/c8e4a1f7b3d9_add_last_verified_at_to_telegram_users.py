@@ -0,0 +1,32 @@
+"""add last_verified_at to telegram_users and max_users_per_run to verification schedule
+
+Revision ID: c8e4a1f7b3d9
+Revises: b5d2f8a4c6e1
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e4a1f7b3d9'
+down_revision: Union[str, Sequence[str], None] = 'b5d2f8a4c6e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('telegram_users', sa.Column('last_verified_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_telegram_users_last_verified_at'), 'telegram_users', ['last_verified_at'], unique=False)
+    op.add_column('user_verification_schedule', sa.Column('max_users_per_run', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_verification_schedule', 'max_users_per_run')
+    op.drop_index(op.f('ix_telegram_users_last_verified_at'), table_name='telegram_users')
+    op.drop_column('telegram_users', 'last_verified_at')
@@ -0,0 +1,66 @@
+"""add verification_runs and verification_results tables
+
+Revision ID: d2f6b8c1e4a7
+Revises: c8e4a1f7b3d9
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6b8c1e4a7'
+down_revision: Union[str, Sequence[str], None] = 'c8e4a1f7b3d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'verification_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('chat_id', sa.Integer(), nullable=True),
+        sa.Column('auto_update', sa.Boolean(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('total_users', sa.Integer(), nullable=False),
+        sa.Column('total_checked', sa.Integer(), nullable=False),
+        sa.Column('total_updated', sa.Integer(), nullable=False),
+        sa.Column('total_errors', sa.Integer(), nullable=False),
+        sa.Column('total_with_changes', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('duration_seconds', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['chat_id'], ['chats.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_verification_runs_id'), 'verification_runs', ['id'], unique=False)
+
+    op.create_table(
+        'verification_results',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('telegram_user_id', sa.BigInteger(), nullable=False),
+        sa.Column('chat_id', sa.BigInteger(), nullable=False),
+        sa.Column('chat_title', sa.String(length=255), nullable=True),
+        sa.Column('is_updated', sa.Boolean(), nullable=False),
+        sa.Column('has_changes', sa.Boolean(), nullable=False),
+        sa.Column('changes', sa.JSON(), nullable=True),
+        sa.Column('current_status', sa.String(length=20), nullable=True),
+        sa.Column('checked_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['run_id'], ['verification_runs.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_verification_results_run_id'), 'verification_results', ['run_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_verification_results_run_id'), table_name='verification_results')
+    op.drop_table('verification_results')
+    op.drop_index(op.f('ix_verification_runs_id'), table_name='verification_runs')
+    op.drop_table('verification_runs')
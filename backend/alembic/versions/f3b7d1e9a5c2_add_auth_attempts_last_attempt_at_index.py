@@ -0,0 +1,28 @@
+"""add index on auth_attempts last_attempt_at
+
+Revision ID: f3b7d1e9a5c2
+Revises: e5a9c3d7f1b2
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7d1e9a5c2'
+down_revision: Union[str, Sequence[str], None] = 'e5a9c3d7f1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_auth_attempts_last_attempt_at'), 'auth_attempts', ['last_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_auth_attempts_last_attempt_at'), table_name='auth_attempts')
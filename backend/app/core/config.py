@@ -49,6 +49,27 @@ class Settings(BaseSettings):
     # Message cleanup settings
     MESSAGE_RETENTION_HOURS: int = 168  # Keep messages for 7 days (168 hours)
     CLEANUP_INTERVAL_MINUTES: int = 60  # Run cleanup every hour
+    CLEANUP_CRON: str = ""  # Optional cron expression (e.g. "30 3 * * *") used instead of the interval
+    MESSAGE_CLEANUP_BATCH_SIZE: int = 5000  # Messages deleted per transaction
+    MESSAGE_CLEANUP_BATCH_PAUSE_SECONDS: float = 0.5  # Pause between delete batches to let inserts through
+
+    # Broadcast settings
+    BROADCAST_MESSAGES_PER_SECOND: int = 28  # Stay just under Telegram's ~30 msg/s bot limit
+    BROADCAST_SENDER_TASKS: int = 20  # Concurrent sender tasks pulling from the recipient queue
+    BROADCAST_BLOCKED_FLUSH_SECONDS: int = 5  # How often blocked users are written to the database
+
+    # User verification settings
+    VERIFICATION_REQUESTS_PER_SECOND: int = 25  # getChatMember calls per second across all workers
+    VERIFICATION_WORKER_TASKS: int = 16  # Concurrent getChatMember workers per verification run
+    VERIFICATION_WRITE_BATCH_SIZE: int = 200  # Verified users written to the database per transaction
+
+    # Background jobs leader election (only one API worker runs background jobs)
+    LEADER_LOCK_NAME: str = "tg_admin_background_jobs"  # MySQL GET_LOCK name, also used in the SQLite lock file name
+    LEADER_LOCK_FILE: str = ""  # SQLite lock file path, defaults to next to the database file
+    LEADER_CHECK_INTERVAL_SECONDS: int = 15  # How often followers try to take over and the leader checks its lock
+
+    # Mini app settings
+    MINI_APP_SEARCH_CACHE_TTL_SECONDS: int = 120  # How long repeated searches are served from cache
 
     # Environment
     ENVIRONMENT: str = "development"  # development, production, testing
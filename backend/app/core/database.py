@@ -39,7 +39,10 @@ from app.models.openrouter import OpenRouterSettings
 from app.models.subscription_prices import SubscriptionPrice
 from app.models.chat_subscriptions import ChatSubscription
 from app.models.telegram_user_history import TelegramUserHistory
+from app.models.telegram_user_search_index import TelegramUserUsernameTrigram
 from app.models.user_verification_schedule import UserVerificationSchedule
+from app.models.verification_runs import VerificationRun, VerificationResult
+from app.models.welcome_message_deletions import WelcomeMessageDeletion
 from app.models.manager_chat_access import ManagerChatAccess
 
 # Create async session factory
@@ -0,0 +1,291 @@
+"""
+Background job runner with interval and cron schedules, timeouts, backoff and metrics
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+
+JobFunc = Callable[[], Awaitable[None]]
+
+
+class IntervalSchedule:
+    """Run every `seconds`, measured from the start of the previous run"""
+
+    def __init__(self, seconds: float, jitter_seconds: float = 0, run_on_start: bool = True):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+        self.jitter_seconds = jitter_seconds
+        self.run_on_start = run_on_start
+
+    def first_run(self, now: datetime) -> datetime:
+        return now if self.run_on_start else self.next_run(now)
+
+    def next_run(self, after: datetime) -> datetime:
+        return after + timedelta(seconds=self.seconds)
+
+    def __str__(self) -> str:
+        return f"every {self.seconds:g}s"
+
+
+class CronSchedule:
+    """
+    Five-field cron expression (minute hour day-of-month month day-of-week)
+    in server local time. Fields accept `*`, numbers, ranges `a-b`, lists
+    `a,b` and steps `*/n` or `a-b/n`; day-of-week 0 and 7 are Sunday.
+    """
+
+    _FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str, jitter_seconds: float = 0):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: '{expression}'")
+
+        self.expression = expression
+        self.jitter_seconds = jitter_seconds
+        parsed = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self._FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+        # Standard cron: if both day fields are restricted, either one matching is enough
+        self._days_restricted = fields[2] != '*'
+        self._weekdays_restricted = fields[4] != '*'
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for part in field.split(','):
+            range_part, _, step_part = part.partition('/')
+            step = int(step_part) if step_part else 1
+            if range_part == '*':
+                start, end = low, high
+            elif '-' in range_part:
+                start, end = (int(value) for value in range_part.split('-', 1))
+            else:
+                start = end = int(range_part)
+            if start < low or end > high or start > end or step <= 0:
+                raise ValueError(f"Invalid cron field '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _matches_day(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._days_restricted and self._weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def first_run(self, now: datetime) -> datetime:
+        return self.next_run(now)
+
+    def next_run(self, after: datetime) -> datetime:
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._matches_day(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+    def __str__(self) -> str:
+        return f"cron '{self.expression}'"
+
+
+@dataclass
+class JobMetrics:
+    """Run statistics of one job"""
+    runs: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    overruns: int = 0  # Runs that lasted past their next scheduled time; that slot was skipped
+    is_running: bool = False
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_success_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+    next_run_at: Optional[datetime] = None
+
+
+class Job:
+    """
+    Registered background job.
+
+    Jobs with a schedule run periodically. Jobs without one are long-running
+    workers that are restarted, with backoff, whenever they exit or crash.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: JobFunc,
+        schedule=None,
+        timeout_seconds: Optional[float] = None,
+        retry_delay_seconds: float = 30,
+        max_retry_delay_seconds: float = 3600
+    ):
+        self.name = name
+        self.func = func
+        self.schedule = schedule
+        self.timeout_seconds = timeout_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.max_retry_delay_seconds = max_retry_delay_seconds
+        self.metrics = JobMetrics()
+
+    def get_retry_delay(self) -> float:
+        """Exponential backoff based on the current failure streak"""
+        exponent = max(self.metrics.consecutive_failures - 1, 0)
+        return min(self.retry_delay_seconds * 2 ** exponent, self.max_retry_delay_seconds)
+
+    async def run_once(self) -> bool:
+        """Run the job once, recording metrics. Returns whether it succeeded."""
+        metrics = self.metrics
+        metrics.is_running = True
+        metrics.last_started_at = datetime.now()
+        started = time.monotonic()
+        error = None
+        try:
+            if self.timeout_seconds:
+                await asyncio.wait_for(self.func(), timeout=self.timeout_seconds)
+            else:
+                await self.func()
+        except Exception as e:
+            # TimeoutError is also raised by network calls inside the job,
+            # it is only our timeout if the job has one
+            if isinstance(e, asyncio.TimeoutError) and self.timeout_seconds:
+                error = f"Timed out after {self.timeout_seconds:g}s"
+            else:
+                error = f"{type(e).__name__}: {e}"
+        finally:
+            metrics.is_running = False
+            metrics.last_finished_at = datetime.now()
+            metrics.last_duration_seconds = time.monotonic() - started
+            metrics.runs += 1
+
+        if error is None:
+            metrics.consecutive_failures = 0
+            metrics.last_success_at = metrics.last_finished_at
+            return True
+
+        metrics.failures += 1
+        if metrics.last_duration_seconds >= self.max_retry_delay_seconds:
+            # Ran fine for a long time before failing, start a new failure streak
+            metrics.consecutive_failures = 1
+        else:
+            metrics.consecutive_failures += 1
+        metrics.last_error = error
+        print(f"[Jobs] Job '{self.name}' failed ({metrics.consecutive_failures} in a row): {error}")
+        return False
+
+
+class JobRunner:
+    """Runs registered jobs, one task per job, until stopped"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._tasks)
+
+    def add_job(self, name: str, func: JobFunc, schedule, **options) -> Job:
+        """Register a periodic job with an IntervalSchedule or CronSchedule"""
+        return self._register(Job(name, func, schedule=schedule, **options))
+
+    def add_worker(self, name: str, func: JobFunc, **options) -> Job:
+        """Register a long-running worker that is restarted when it exits"""
+        return self._register(Job(name, func, **options))
+
+    def _register(self, job: Job) -> Job:
+        if job.name in self._jobs:
+            raise ValueError(f"Job '{job.name}' is already registered")
+        self._jobs[job.name] = job
+        return job
+
+    def get_metrics(self) -> Dict[str, dict]:
+        return {
+            name: {
+                "schedule": str(job.schedule) if job.schedule else "worker",
+                "timeout_seconds": job.timeout_seconds,
+                **vars(job.metrics)
+            }
+            for name, job in self._jobs.items()
+        }
+
+    async def _sleep_until(self, job: Job, run_at: datetime, jitter_seconds: float = 0) -> None:
+        delay = max((run_at - datetime.now()).total_seconds(), 0.0)
+        if jitter_seconds:
+            delay += random.uniform(0, jitter_seconds)
+        job.metrics.next_run_at = datetime.now() + timedelta(seconds=delay)
+        await asyncio.sleep(delay)
+
+    async def _run_scheduled(self, job: Job) -> None:
+        schedule = job.schedule
+        run_at = schedule.first_run(datetime.now())
+        while True:
+            try:
+                await self._sleep_until(job, run_at, schedule.jitter_seconds)
+
+                started_at = datetime.now()
+                if await job.run_once():
+                    run_at = schedule.next_run(started_at)
+                    finished_at = datetime.now()
+                    if run_at < finished_at:
+                        # Never start the next run while this one was still going
+                        job.metrics.overruns += 1
+                        run_at = schedule.next_run(finished_at)
+                else:
+                    run_at = datetime.now() + timedelta(seconds=job.get_retry_delay())
+            except Exception as e:
+                # A bug in the runner itself must not end the job for good
+                print(f"[Jobs] Scheduler of job '{job.name}' failed, retrying: {e}")
+                await asyncio.sleep(job.retry_delay_seconds)
+                run_at = datetime.now()
+
+    async def _run_worker(self, job: Job) -> None:
+        while True:
+            try:
+                if await job.run_once():
+                    print(f"[Jobs] Worker '{job.name}' exited, restarting")
+                await self._sleep_until(job, datetime.now() + timedelta(seconds=job.get_retry_delay()))
+            except Exception as e:
+                print(f"[Jobs] Supervisor of worker '{job.name}' failed, restarting: {e}")
+                await asyncio.sleep(job.retry_delay_seconds)
+
+    async def start(self) -> None:
+        """Start a task for every registered job"""
+        if self.is_running:
+            return
+        for job in self._jobs.values():
+            runner = self._run_scheduled if job.schedule else self._run_worker
+            self._tasks.append(asyncio.create_task(runner(job), name=f"job:{job.name}"))
+            print(f"[Jobs] Started job '{job.name}' ({job.schedule or 'worker'})")
+
+    async def stop(self) -> None:
+        """Cancel all job tasks and wait for them to finish"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._jobs.values():
+            job.metrics.is_running = False
+            job.metrics.next_run_at = None
+        if tasks:
+            print(f"[Jobs] Stopped {len(tasks)} jobs")
+
+
+# Global job runner of this process, started only in the background jobs leader
+job_runner = JobRunner()
@@ -0,0 +1,154 @@
+"""
+Leader election so background jobs run in one process when the API runs with several workers
+"""
+
+import asyncio
+import os
+import tempfile
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.database import engine
+
+try:
+    import fcntl
+except ImportError:  # Windows, only a single process is supported there
+    fcntl = None
+
+
+class LeaderElection:
+    """
+    Elects one process as the leader through a lock every process can see.
+
+    - MySQL: a named lock (GET_LOCK) held by a dedicated connection. The
+      server releases it when the connection closes, so if the leader dies
+      another process takes over at its next attempt.
+    - SQLite: an exclusive flock on a file next to the database, released
+      by the OS when the leader process exits.
+
+    Followers retry every LEADER_CHECK_INTERVAL_SECONDS, and the leader
+    checks on the same interval that it still holds the lock.
+    """
+
+    def __init__(self, lock_name: str, check_interval_seconds: float):
+        self.lock_name = lock_name
+        self.check_interval_seconds = check_interval_seconds
+        self.is_leader = False
+        self._url = make_url(settings.DATABASE_URL)
+        self._connection: Optional[AsyncConnection] = None
+        self._lock_file = None
+
+    @property
+    def _uses_mysql(self) -> bool:
+        return self._url.get_backend_name() == "mysql"
+
+    def _get_lock_file_path(self) -> str:
+        if settings.LEADER_LOCK_FILE:
+            return settings.LEADER_LOCK_FILE
+        database = self._url.database
+        if database and database != ":memory:":
+            return f"{os.path.abspath(database)}.{self.lock_name}.lock"
+        return os.path.join(tempfile.gettempdir(), f"{self.lock_name}.lock")
+
+    async def _try_acquire(self) -> bool:
+        if self._uses_mysql:
+            connection = await engine.connect()
+            try:
+                result = await connection.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": self.lock_name})
+                acquired = result.scalar() == 1
+            except Exception:
+                await connection.close()
+                raise
+            if not acquired:
+                await connection.close()
+                return False
+            self._connection = connection
+            return True
+
+        if fcntl is None:
+            return True
+
+        lock_file = open(self._get_lock_file_path(), "a")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    async def _still_held(self) -> bool:
+        """Whether the lock is still ours; also keeps the lock connection from idling out"""
+        if self._connection is None:
+            return True
+
+        result = await self._connection.execute(
+            text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {"name": self.lock_name}
+        )
+        return result.scalar() == 1
+
+    async def _release(self) -> None:
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            try:
+                await connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": self.lock_name})
+            except Exception as e:
+                print(f"[Leader] Error releasing lock '{self.lock_name}': {e}")
+            finally:
+                # Closing the connection releases the lock in any case
+                await connection.close()
+
+        if self._lock_file is not None:
+            lock_file, self._lock_file = self._lock_file, None
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            lock_file.close()
+
+    async def run(
+        self,
+        on_elected: Callable[[], Awaitable[None]],
+        on_demoted: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Campaign for leadership until cancelled, calling the callbacks on every change"""
+        try:
+            while True:
+                if not self.is_leader:
+                    try:
+                        acquired = await self._try_acquire()
+                    except Exception as e:
+                        print(f"[Leader] Error acquiring lock '{self.lock_name}': {e}")
+                        acquired = False
+
+                    if acquired:
+                        self.is_leader = True
+                        print(f"[Leader] Process {os.getpid()} is now the leader, starting background jobs")
+                        await on_elected()
+                else:
+                    try:
+                        held = await self._still_held()
+                    except Exception as e:
+                        print(f"[Leader] Error checking lock '{self.lock_name}': {e}")
+                        held = False
+
+                    if not held:
+                        # Another process may take over now, stop before it starts its jobs
+                        self.is_leader = False
+                        print(f"[Leader] Process {os.getpid()} lost leadership, stopping background jobs")
+                        await on_demoted()
+                        await self._release()
+
+                await asyncio.sleep(self.check_interval_seconds)
+        finally:
+            if self.is_leader:
+                self.is_leader = False
+                await on_demoted()
+            await self._release()
+
+
+# Global leader election of this process
+leader_election = LeaderElection(
+    lock_name=settings.LEADER_LOCK_NAME,
+    check_interval_seconds=settings.LEADER_CHECK_INTERVAL_SECONDS
+)
@@ -3,6 +3,7 @@ FastAPI application main file with OOP structure for Telegram and Admin panel
 """
 
 import asyncio
+from datetime import datetime
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -10,10 +11,10 @@ from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.database import init_db, get_db, async_session
+from app.core.jobs import job_runner, IntervalSchedule, CronSchedule
 from app.routers import api_router
 from app.telegram.bot import TelegramBot
 from app.services.messages import MessageService
-from app.services.chat_subscriptions import ChatSubscriptionsService
 from app.middleware.security import SecurityMiddleware
 from fastapi import Request
 
@@ -21,17 +22,8 @@ from fastapi import Request
 # Global telegram bot instance
 telegram_bot_instance = None
 
-# Global cleanup task reference
-cleanup_task = None
-
-# Global verification task reference
-verification_task = None
-
-# Global chat posts task reference
-chat_posts_task = None
-
-# Global auth attempts reset task reference
-auth_reset_task = None
+# Global leader election task reference
+leader_task = None
 
 
 def set_telegram_bot(bot_instance):
@@ -46,236 +38,149 @@ def get_telegram_bot():
 
 
 async def cleanup_old_messages():
-    """Background task to clean up old messages and expired subscriptions"""
-    while True:
-        try:
-            # Get database session
-            async with async_session() as db:
-                # Clean up old messages
-                message_service = MessageService(db)
-                deleted_count = await message_service.delete_old_messages(settings.MESSAGE_RETENTION_HOURS)
-                if deleted_count > 0:
-                    print(f"Cleaned up {deleted_count} messages older than {settings.MESSAGE_RETENTION_HOURS} hours")
-
-                # Check for expired subscriptions and disable AI content check
-                subscriptions_service = ChatSubscriptionsService(db)
-                chats_service = await get_chats_service(db)
-                expired_subscriptions = await subscriptions_service.get_expiring_subscriptions(days_ahead=0)
-
-                disabled_count = 0
-                for subscription in expired_subscriptions:
-                    chat = await chats_service.get_chat(subscription.chat_id)
-                    if chat and chat.ai_content_check_enabled:
-                        print(f"Disabling AI content check for chat {chat.id} due to expired subscription")
-                        chat.ai_content_check_enabled = False
-                        disabled_count += 1
-
-                if disabled_count > 0:
-                    await db.commit()
-                    print(f"Disabled AI content check for {disabled_count} chats with expired subscriptions")
-
-        except Exception as e:
-            print(f"Error during cleanup tasks: {e}")
-
-        # Wait for next cleanup cycle
-        await asyncio.sleep(settings.CLEANUP_INTERVAL_MINUTES * 60)
-
-
-async def get_chats_service(db):
-    """Helper function to get ChatService instance"""
-    from app.services.chats import ChatService
-    return ChatService(db)
-
-
-async def scheduled_user_verification():
-    """Background task to run scheduled user verifications"""
-    while True:
-        try:
-            # Get database session
-            async with async_session() as db:
-                from app.services.user_verification_schedule import VerificationScheduleService
-                from app.services.user_verification import UserVerificationService
-                import app.routers.user_verification as verification_router
-                
-                schedule_service = VerificationScheduleService(db)
-                
-                # Get schedules that should run now
-                schedules_to_run = await schedule_service.get_schedules_to_run()
-                
-                if not schedules_to_run:
-                    continue
-                    
-                print(f"Found {len(schedules_to_run)} verification schedule(s) to run")
-                
-                # Get telegram bot
-                telegram_bot = get_telegram_bot()
-                if not telegram_bot or not telegram_bot.is_running:
-                    print("Telegram bot is not available for scheduled verification")
-                    continue
-                
-                # Run each schedule
-                for schedule in schedules_to_run:
-                    try:
-                        print(f"Running verification schedule {schedule.id}")
-                        
-                        # Use global verification service instance for progress tracking
-                        # This allows the /status endpoint to show real-time progress
-                        if verification_router._verification_service_instance is None or \
-                           not verification_router._verification_service_instance.is_running:
-                            verification_router._verification_service_instance = UserVerificationService(telegram_bot.bot, db)
-                        
-                        verification_service = verification_router._verification_service_instance
-                        
-                        # Run verification
-                        result = await verification_service.verify_all_active_users(
-                            chat_id=schedule.chat_id,
-                            auto_update=schedule.auto_update,
-                            delay_between_requests=0.5
-                        )
-                        
-                        print(f"Verification schedule {schedule.id} completed: "
-                              f"{result.total_checked} checked, "
-                              f"{result.total_updated} updated, "
-                              f"{result.total_errors} errors")
-                        
-                        # Update last run timestamp
-                        from datetime import datetime
-                        await schedule_service.update_last_run(
-                            schedule.id,
-                            datetime.now()  # Use local time instead of UTC
-                        )
-                        
-                    except Exception as e:
-                        print(f"Error running verification schedule {schedule.id}: {e}")
-                        
-        except Exception as e:
-            print(f"Error in scheduled verification task: {e}")
-        
-        # Wait 60 seconds before next check
-        await asyncio.sleep(60)
-
-
-async def process_chat_posts_scheduled_actions():
-    """Background task to process scheduled chat post actions (unpin/delete)"""
-    while True:
-        try:
-            # Get database session
-            async with async_session() as db:
-                from app.services.chat_posts import ChatPostService
-                
-                # Get telegram bot
-                telegram_bot = get_telegram_bot()
-                if not telegram_bot or not telegram_bot.is_running:
-                    print("Telegram bot is not available for chat posts processing")
-                    await asyncio.sleep(60)
-                    continue
-                
-                # Create service and process scheduled actions
-                chat_post_service = ChatPostService(db, telegram_bot.bot)
-                await chat_post_service.process_scheduled_actions()
-                
-        except Exception as e:
-            print(f"Error in chat posts scheduled actions task: {e}")
-        
-        # Wait 60 seconds before next check
-        await asyncio.sleep(60)
+    """Background job deleting messages older than the retention period"""
+    async with async_session() as db:
+        message_service = MessageService(db)
+        deleted_count = await message_service.delete_old_messages(settings.MESSAGE_RETENTION_HOURS)
+        if deleted_count > 0:
+            print(f"Cleaned up {deleted_count} messages older than {settings.MESSAGE_RETENTION_HOURS} hours")
+
+
+async def run_scheduled_user_verification():
+    """Background job running the verification schedules that are due"""
+    from app.services.user_verification_schedule import VerificationScheduleService
+    from app.services.user_verification import UserVerificationService
+    from app.services.verification_runs import VerificationRunService
+    import app.routers.user_verification as verification_router
+
+    async with async_session() as db:
+        # Runs of processes that died are never finished, fail them so they get pruned
+        await VerificationRunService(db).fail_stale_runs()
+
+        schedule_service = VerificationScheduleService(db)
+
+        # Get schedules that should run now
+        schedules_to_run = await schedule_service.get_schedules_to_run()
+        if not schedules_to_run:
+            return
+
+        print(f"Found {len(schedules_to_run)} verification schedule(s) to run")
+
+        telegram_bot = get_telegram_bot()
+        if not telegram_bot or not telegram_bot.is_running:
+            print("Telegram bot is not available for scheduled verification")
+            return
+
+        for schedule in schedules_to_run:
+            # Use global verification service instance for progress tracking
+            # This allows the /status endpoint to show real-time progress
+            verification_service = verification_router._verification_service_instance
+            if verification_service is not None and verification_service.is_running:
+                print(f"Verification already running, schedule {schedule.id} will run on a later check")
+                return
+
+            verification_service = UserVerificationService(telegram_bot.bot, db)
+            verification_router._verification_service_instance = verification_service
+
+            try:
+                print(f"Running verification schedule {schedule.id}")
+                result = await verification_service.verify_all_active_users(
+                    chat_id=schedule.chat_id,
+                    auto_update=schedule.auto_update,
+                    max_users=schedule.max_users_per_run
+                )
+
+                print(f"Verification schedule {schedule.id} completed: "
+                      f"{result.total_checked} checked, "
+                      f"{result.total_updated} updated, "
+                      f"{result.total_errors} errors")
+
+                # Update last run timestamp
+                await schedule_service.update_last_run(
+                    schedule.id,
+                    datetime.now()  # Use local time instead of UTC
+                )
+            except Exception as e:
+                print(f"Error running verification schedule {schedule.id}: {e}")
 
 
 async def reset_blocked_auth_attempts():
-    """Background task to reset blocked authentication attempts every 20 minutes"""
-    while True:
-        try:
-            # Get database session
-            async with async_session() as db:
-                from app.services.auth_attempts import AuthAttemptsService
-                
-                auth_service = AuthAttemptsService(db)
-                reset_count = await auth_service.reset_blocked_attempts(minutes=20)
-                
-                if reset_count > 0:
-                    print(f"[AUTH_RESET] Reset {reset_count} blocked authentication attempts")
-                
-        except Exception as e:
-            print(f"Error in auth attempts reset task: {e}")
-        
-        # Wait 20 minutes before next reset (1200 seconds)
-        await asyncio.sleep(1200)
-
-
-async def start_verification_task():
-    """Start the background verification task"""
-    global verification_task
-    verification_task = asyncio.create_task(scheduled_user_verification())
-    print("Started scheduled user verification task")
-
-
-async def stop_verification_task():
-    """Stop the background verification task"""
-    global verification_task
-    if verification_task:
-        verification_task.cancel()
-        try:
-            await verification_task
-        except asyncio.CancelledError:
-            pass
-        print("Stopped scheduled user verification task")
-
+    """Background job resetting authentication attempts blocked for more than 20 minutes"""
+    from app.services.auth_attempts import AuthAttemptsService
 
-async def start_chat_posts_task():
-    """Start the background chat posts processing task"""
-    global chat_posts_task
-    chat_posts_task = asyncio.create_task(process_chat_posts_scheduled_actions())
-    print("Started chat posts scheduled actions task")
+    async with async_session() as db:
+        auth_service = AuthAttemptsService(db)
+        reset_count = await auth_service.reset_blocked_attempts(minutes=20)
+        if reset_count > 0:
+            print(f"[AUTH_RESET] Reset {reset_count} blocked authentication attempts")
 
 
-async def stop_chat_posts_task():
-    """Stop the background chat posts processing task"""
-    global chat_posts_task
-    if chat_posts_task:
-        chat_posts_task.cancel()
-        try:
-            await chat_posts_task
-        except asyncio.CancelledError:
-            pass
-        print("Stopped chat posts scheduled actions task")
+async def process_chat_posts_scheduled_actions():
+    """Background worker firing scheduled chat post actions (send/unpin/delete) when they are due"""
+    from app.services.chat_post_scheduler import chat_post_scheduler
+    await chat_post_scheduler.run()
 
 
-async def start_cleanup_task():
-    """Start the background cleanup task"""
-    global cleanup_task
-    cleanup_task = asyncio.create_task(cleanup_old_messages())
-    print(f"Started message cleanup task (every {settings.CLEANUP_INTERVAL_MINUTES} minutes)")
+async def process_welcome_message_deletions():
+    """Background worker deleting queued welcome messages when their lifetime is over"""
+    from app.services.welcome_message_deletions import welcome_message_deletion_worker
+    await welcome_message_deletion_worker.run()
 
 
-async def stop_cleanup_task():
-    """Stop the background cleanup task"""
-    global cleanup_task
-    if cleanup_task:
-        cleanup_task.cancel()
-        try:
-            await cleanup_task
-        except asyncio.CancelledError:
-            pass
-        print("Stopped message cleanup task")
+async def enforce_subscription_expiry():
+    """Background worker disabling AI content check for chats when their subscription expires"""
+    from app.services.subscription_expiry import subscription_expiry_worker
+    await subscription_expiry_worker.run()
 
 
-async def start_auth_reset_task():
-    """Start the background auth attempts reset task"""
-    global auth_reset_task
-    auth_reset_task = asyncio.create_task(reset_blocked_auth_attempts())
-    print("Started auth attempts reset task (every 20 minutes)")
-
-
-async def stop_auth_reset_task():
-    """Stop the background auth attempts reset task"""
-    global auth_reset_task
-    if auth_reset_task:
-        auth_reset_task.cancel()
+def register_background_jobs():
+    """Register all background jobs with the job runner"""
+    if settings.CLEANUP_CRON:
+        cleanup_schedule = CronSchedule(settings.CLEANUP_CRON, jitter_seconds=60)
+    else:
+        cleanup_schedule = IntervalSchedule(settings.CLEANUP_INTERVAL_MINUTES * 60, jitter_seconds=60)
+    job_runner.add_job("message_cleanup", cleanup_old_messages, cleanup_schedule, timeout_seconds=3600)
+
+    job_runner.add_job(
+        "user_verification",
+        run_scheduled_user_verification,
+        IntervalSchedule(60, jitter_seconds=5),
+        timeout_seconds=6 * 3600,
+        max_retry_delay_seconds=900
+    )
+    job_runner.add_job(
+        "auth_attempts_reset",
+        reset_blocked_auth_attempts,
+        IntervalSchedule(1200, jitter_seconds=60),
+        timeout_seconds=300
+    )
+
+    job_runner.add_worker("chat_posts", process_chat_posts_scheduled_actions)
+    job_runner.add_worker("welcome_message_deletions", process_welcome_message_deletions)
+    job_runner.add_worker("subscription_expiry", enforce_subscription_expiry)
+
+
+register_background_jobs()
+
+
+async def start_leader_task():
+    """Start campaigning for leadership of background jobs"""
+    global leader_task
+    from app.core.leader_election import leader_election
+    leader_task = asyncio.create_task(leader_election.run(job_runner.start, job_runner.stop))
+    print("Started background jobs leader election task")
+
+
+async def stop_leader_task():
+    """Stop the leader election task, stopping background jobs if this process leads"""
+    global leader_task
+    if leader_task:
+        leader_task.cancel()
         try:
-            await auth_reset_task
+            await leader_task
         except asyncio.CancelledError:
             pass
-        print("Stopped auth attempts reset task")
+        print("Stopped background jobs leader election task")
 
 
 @asynccontextmanager
@@ -289,24 +194,12 @@ async def lifespan(app: FastAPI):
     # Set bot instance for webhook router
     set_telegram_bot(bot_instance)
 
-    # Start background cleanup task
-    await start_cleanup_task()
-    
-    # Start background verification task
-    await start_verification_task()
-    
-    # Start background chat posts task
-    await start_chat_posts_task()
-    
-    # Start background auth attempts reset task
-    await start_auth_reset_task()
+    # Background jobs run only in the process elected as leader
+    await start_leader_task()
 
     yield
     # Shutdown
-    await stop_cleanup_task()
-    await stop_verification_task()
-    await stop_chat_posts_task()
-    await stop_auth_reset_task()
+    await stop_leader_task()
     await bot_instance.stop()
 
 
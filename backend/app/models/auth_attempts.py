@@ -21,7 +21,7 @@ class AuthAttempt(Base):
     blocked_until = Column(DateTime(timezone=True), nullable=True)
     block_reason = Column(String(255), nullable=True)
     first_attempt_at = Column(DateTime(timezone=True), server_default=func.now())
-    last_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    last_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
 
     # Legacy fields (will be removed after migration)
     success = Column(Boolean, nullable=True)  # For backward compatibility
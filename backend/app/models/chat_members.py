@@ -2,7 +2,7 @@
 Chat members database model
 """
 
-from sqlalchemy import Column, Integer, BigInteger, String, DateTime, func, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, func, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -28,3 +28,7 @@ class ChatMember(Base):
     chat = relationship("Chat", backref="members", lazy='raise')
     telegram_user = relationship("TelegramUser", backref="chat_memberships", lazy='raise')
 
+    # Supports looking up all chats of a set of users (e.g. "other groups" of a members page)
+    __table_args__ = (
+        Index('ix_chat_members_telegram_user_id_chat_id', 'telegram_user_id', 'chat_id'),
+    )
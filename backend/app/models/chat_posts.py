@@ -33,11 +33,11 @@ class ChatPost(Base):
     # Pin settings
     is_pinned = Column(Boolean, default=False, nullable=False)
     pin_duration_minutes = Column(Integer, nullable=True)  # Duration to keep pinned
-    scheduled_unpin_at = Column(DateTime(timezone=True), nullable=True)  # When to unpin
+    scheduled_unpin_at = Column(DateTime(timezone=True), nullable=True, index=True)  # When to unpin
     
     # Delete settings
     delete_after_minutes = Column(Integer, nullable=True)  # Delete after N minutes
-    scheduled_delete_at = Column(DateTime(timezone=True), nullable=True)  # When to delete
+    scheduled_delete_at = Column(DateTime(timezone=True), nullable=True, index=True)  # When to delete
     
     # Inline keyboard
     reply_markup = Column(JSON, nullable=True)  # Inline keyboard markup as JSON
@@ -0,0 +1,16 @@
+"""
+Telegram user username trigram index model for fast substring search
+"""
+
+from sqlalchemy import Column, BigInteger, String
+
+# Import Base - this will work since we commented the circular import in database.py
+from app.core.database import Base
+
+
+class TelegramUserUsernameTrigram(Base):
+    """One row per distinct lowercase trigram of a telegram user's username"""
+    __tablename__ = "telegram_user_username_trigrams"
+
+    trigram = Column(String(3), primary_key=True)
+    telegram_user_id = Column(BigInteger, primary_key=True, index=True)
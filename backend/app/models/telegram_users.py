@@ -26,5 +26,6 @@ class TelegramUser(Base):
     can_connect_to_business = Column(Boolean, nullable=True)
     has_main_web_app = Column(Boolean, nullable=True)
     account_creation_date = Column(DateTime(timezone=True), nullable=True)
+    last_verified_at = Column(DateTime(timezone=True), index=True, nullable=True)  # Last getChatMember check
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
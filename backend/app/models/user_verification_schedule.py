@@ -21,6 +21,7 @@ class UserVerificationSchedule(Base):
     # Verification settings
     auto_update = Column(Boolean, default=True, nullable=False)  # Auto-update user data
     chat_id = Column(Integer, ForeignKey("chats.id"), nullable=True)  # Optional: filter by specific chat
+    max_users_per_run = Column(Integer, nullable=True)  # Optional: only verify this many least recently verified users
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,47 @@
+"""
+Verification run and per-user verification result database models
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Float, Text, ForeignKey, JSON, func
+
+# Import Base - this will work since we commented the circular import in database.py
+from app.core.database import Base
+
+
+class VerificationRun(Base):
+    """One bulk verification run with its summary"""
+    __tablename__ = "verification_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    chat_id = Column(Integer, ForeignKey("chats.id"), nullable=True)  # Optional chat filter of the run
+    auto_update = Column(Boolean, default=True, nullable=False)
+    status = Column(String(20), default='running', nullable=False)  # 'running', 'completed', 'failed'
+
+    # Summary
+    total_users = Column(Integer, default=0, nullable=False)
+    total_checked = Column(Integer, default=0, nullable=False)
+    total_updated = Column(Integer, default=0, nullable=False)
+    total_errors = Column(Integer, default=0, nullable=False)
+    total_with_changes = Column(Integer, default=0, nullable=False)
+
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Last progress write of a running run
+
+
+class VerificationResult(Base):
+    """Result of verifying one user within a run"""
+    __tablename__ = "verification_results"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(Integer, ForeignKey("verification_runs.id"), nullable=False, index=True)
+    telegram_user_id = Column(BigInteger, nullable=False)
+    chat_id = Column(BigInteger, nullable=False)  # Telegram chat ID the user was checked in
+    chat_title = Column(String(255), nullable=True)
+    is_updated = Column(Boolean, default=False, nullable=False)
+    has_changes = Column(Boolean, default=False, nullable=False)
+    changes = Column(JSON, nullable=True)  # {field: {"old_value": ..., "new_value": ...}}
+    current_status = Column(String(20), nullable=True)
+    checked_at = Column(DateTime(timezone=True), nullable=False)
+    error = Column(Text, nullable=True)
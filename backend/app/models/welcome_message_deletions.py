@@ -0,0 +1,20 @@
+"""
+Pending welcome message deletion database model
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, DateTime, func
+
+# Import Base - this will work since we commented the circular import in database.py
+from app.core.database import Base
+
+
+class WelcomeMessageDeletion(Base):
+    """Welcome message waiting to be deleted once its lifetime is over"""
+    __tablename__ = "welcome_message_deletions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chat_id = Column(BigInteger, nullable=False)  # Telegram chat ID
+    message_id = Column(BigInteger, nullable=False)  # Telegram message ID
+    delete_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)  # Failed deletion attempts
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -86,41 +86,28 @@ async def get_chat_members(
         # Get chat members with pagination and search
         members = await member_service.get_chat_members_with_search(actual_chat_id, skip, limit, search)
 
+        # Load other groups and history for the whole page in one query each
+        page_user_ids = [member.telegram_user_id for member in members]
+        groups_by_user = await member_service.get_other_groups_for_users(
+            page_user_ids,
+            exclude_chat_id=actual_chat_id,
+            limit_per_user=10  # Limit to prevent too much data
+        )
+        history_by_user = await history_service.get_users_history(page_user_ids, limit=20)
+
         # Get group memberships for each member
         members_data = []
         for member in members:
             try:
-                # Find other groups this user is in
-                user_groups_result = await db.execute(
-                    select(
-                        Chat.title,
-                        Chat.telegram_chat_id,
-                        Chat.chat_type
-                    )
-                    .select_from(ChatMember)
-                    .join(Chat, ChatMember.chat_id == Chat.id)
-                    .where(ChatMember.telegram_user_id == member.telegram_user_id)
-                    .where(Chat.is_active == True)
-                    .where(Chat.chat_type.in_(['group', 'supergroup']))
-                    .where(Chat.id != actual_chat_id)  # Exclude current chat
-                    .limit(10)  # Limit to prevent too much data
-                )
-
-                user_groups = []
-                for row in user_groups_result:
-                    user_groups.append({
-                        'title': row.title or f'Chat {row.telegram_chat_id}',
-                        'telegram_chat_id': row.telegram_chat_id,
-                        'chat_type': row.chat_type
-                    })
+                # Other groups this user is in (current chat excluded)
+                user_groups = groups_by_user.get(member.telegram_user_id, [])
 
                 # Get user data from the joined telegram_user
                 user = member.telegram_user
 
                 # Get user history
-                user_history = await history_service.get_user_history(member.telegram_user_id, limit=20)
                 history_data = []
-                for history_entry in user_history:
+                for history_entry in history_by_user.get(member.telegram_user_id, []):
                     history_data.append({
                         'id': history_entry.id,
                         'telegram_user_id': history_entry.telegram_user_id,
@@ -71,11 +71,8 @@ async def get_chat_moderators(
     if not chat:
         raise HTTPException(status_code=404, detail="Chat not found")
 
-    # Get all moderators and filter by chat_id
-    all_moderators = await moderator_service.get_all_moderators_with_chat_info()
-
-    # Filter moderators for this specific chat
-    moderators = [mod for mod in all_moderators if mod['chat_id'] == actual_chat_id]
+    # Get moderators of this specific chat
+    moderators = await moderator_service.get_all_moderators_with_chat_info(chat_id=actual_chat_id)
 
     return moderators
 
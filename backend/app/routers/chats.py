@@ -38,10 +38,10 @@ async def get_chats(
         access_service = ManagerChatAccessService(db)
         chat_ids = await access_service.get_manager_chat_ids(user_info["user_id"])
         
-        # Get full chat info for manager's chats
-        all_chats = await chat_service.get_chats_with_linked_channels_info(0, 10000, include_inactive)
-        # ChatWithLinkedChannelResponse is a Pydantic model, use .id instead of .get("id")
-        chats = [chat for chat in all_chats if chat.id in chat_ids]
+        # Get full chat info for manager's chats only
+        chats = await chat_service.get_chats_with_linked_channels_info(
+            skip, limit, include_inactive, chat_ids=list(chat_ids)
+        )
     else:
         chats = []
 
@@ -137,8 +137,7 @@ async def get_chat(
             )
 
     # Get moderators for this chat
-    all_moderators = await ChatModeratorService(db).get_all_moderators_with_chat_info()
-    moderators = [mod for mod in all_moderators if mod['chat_id'] == actual_chat_id]
+    moderators = await moderator_service.get_all_moderators_with_chat_info(chat_id=actual_chat_id)
 
     # Get channels linked to this chat (chats that have this chat as their linked_channel_id)
     linked_chats = await chat_service.get_chats_linked_to_channel(actual_chat_id)
@@ -154,25 +153,12 @@ async def get_chat(
         }
         channels.append(channel_info)
 
-    # Count linked channels for the chat info
-    channel_count_result = await db.execute(
-        select(func.count(Chat.id))
-        .where(Chat.linked_channel_id == actual_chat_id)
-        .where(Chat.is_active == True)
-    )
-    channel_count = channel_count_result.scalar() or 0
-
-    # Get linked channel if exists
+    # Get linked channel together with its admin if exists
     linked_channel_data = None
     if chat.linked_channel_id:
-        linked_channel = await chat_service.get_chat(chat.linked_channel_id)
-        if linked_channel:
-            # Get admin info for the linked channel
-            from app.models.users import User
-            admin_result = await db.execute(
-                select(User).where(User.id == linked_channel.added_by_user_id)
-            )
-            admin = admin_result.scalar_one_or_none()
+        linked_channel_row = await chat_service.get_chat_with_admin(chat.linked_channel_id)
+        if linked_channel_row:
+            linked_channel, admin = linked_channel_row
 
             linked_channel_data = {
                 "id": linked_channel.id,
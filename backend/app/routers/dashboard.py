@@ -6,7 +6,9 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.schemas.dashboard import DashboardStats
+from app.core.jobs import job_runner
+from app.core.leader_election import leader_election
+from app.schemas.dashboard import DashboardStats, BackgroundJobsStatus, BackgroundJobMetrics
 from app.services.dashboard import DashboardService
 
 router = APIRouter()
@@ -20,3 +22,12 @@ async def get_dashboard_stats(
     dashboard_service = DashboardService(db)
     stats = await dashboard_service.get_dashboard_stats()
     return stats
+
+
+@router.get("/jobs", response_model=BackgroundJobsStatus)
+async def get_background_jobs():
+    """Get background job metrics of the process that serves the request"""
+    return BackgroundJobsStatus(
+        is_leader=leader_election.is_leader,
+        jobs=[BackgroundJobMetrics(name=name, **metrics) for name, metrics in job_runner.get_metrics().items()]
+    )
@@ -20,6 +20,7 @@ from app.schemas.mini_app import (
 )
 from app.services.mini_app import MiniAppService
 from app.services.search_boost import SearchBoostService
+from app.services.search_quota import SearchQuotaService
 from aiogram import Bot
 from aiogram.types import LabeledPrice
 
@@ -74,15 +75,15 @@ async def search_users(
 
     service = MiniAppService(db)
     
-    # Check if user has reached limit
-    can_search, remaining = await service._check_search_limit(user.id)
-    if not can_search:
+    # Check the limit and reserve one search in a single decision
+    decision = await SearchQuotaService(db).try_consume(user.id)
+    if not decision.allowed:
         raise HTTPException(
             status_code=429,
             detail=f"Daily search limit reached. You can perform {MiniAppService.MAX_SEARCHES_PER_DAY} searches per day."
         )
     
-    return await service.search_users(request, user.id)
+    return await service.search_users(request, user.id, decision)
 
 
 @router.get("/search-limits/{telegram_user_id}", response_model=SearchLimitResponse)
@@ -113,7 +114,14 @@ async def get_user_photo(
     db: AsyncSession = Depends(get_db)
 ):
     """Get user profile photo URL"""
-    service = MiniAppService(db)
+    # Import bot here to avoid circular imports
+    from app.main import get_telegram_bot
+
+    telegram_bot = get_telegram_bot()
+    if not telegram_bot or not telegram_bot.is_running:
+        raise HTTPException(status_code=503, detail="Telegram bot is not available")
+
+    service = MiniAppService(db, telegram_bot.bot)
     file_path = await service.get_user_profile_photo(user_id)
     
     if not file_path:
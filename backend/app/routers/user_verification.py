@@ -2,19 +2,23 @@
 User verification API router
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Optional, List
 
-from app.core.database import get_db
+from app.core.database import get_db, async_session
 from app.schemas.user_verification import (
     UserVerificationRequest,
     UserVerificationResult,
     BulkVerificationRequest,
     BulkVerificationResponse,
-    ActiveUsersListResponse
+    ActiveUsersListResponse,
+    VerificationRunResponse,
+    VerificationResultsPage
 )
 from app.services.user_verification import UserVerificationService
+from app.services.verification_runs import VerificationRunService, RESULT_FILTERS
 from app.services.chats import ChatService
 
 router = APIRouter()
@@ -104,19 +108,110 @@ async def verify_active_users(
         request: BulkVerificationRequest with optional chat_id filter and auto_update flag
         
     Returns:
-        BulkVerificationResponse with statistics and detailed results for each user
+        BulkVerificationResponse with statistics; per-user results are read
+        from /runs/{run_id}/results or streamed from /runs/{run_id}/results.ndjson
     """
     # Verify users
     result = await verification_service.verify_all_active_users(
         chat_id=request.chat_id,
         telegram_user_ids=request.telegram_user_ids,
         auto_update=request.auto_update,
+        max_users=request.max_users,
         delay_between_requests=request.delay_between_requests
     )
 
     return result
 
 
+@router.get("/runs", response_model=List[VerificationRunResponse])
+async def get_verification_runs(
+    skip: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get recent bulk verification runs, newest first
+    """
+    return await VerificationRunService(db).get_runs(skip=skip, limit=limit)
+
+
+@router.get("/runs/{run_id}", response_model=VerificationRunResponse)
+async def get_verification_run(
+    run_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get summary of a bulk verification run
+    """
+    run = await VerificationRunService(db).get_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Verification run not found")
+    return run
+
+
+@router.get("/runs/{run_id}/results", response_model=VerificationResultsPage)
+async def get_verification_run_results(
+    run_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    filter: str = Query('all', description="all, changes or errors"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a page of results of a bulk verification run
+
+    Results are available while the run is still in progress.
+
+    Args:
+        run_id: Verification run ID
+        skip: Number of results to skip
+        limit: Maximum number of results to return
+        filter: Only results with changes ('changes') or errors ('errors')
+
+    Returns:
+        VerificationResultsPage with results and the total count for the filter
+    """
+    if filter not in RESULT_FILTERS:
+        raise HTTPException(status_code=400, detail=f"filter must be one of: {', '.join(RESULT_FILTERS)}")
+
+    run_service = VerificationRunService(db)
+    if not await run_service.get_run(run_id):
+        raise HTTPException(status_code=404, detail="Verification run not found")
+
+    return await run_service.get_results(run_id, skip=skip, limit=limit, result_filter=filter)
+
+
+@router.get("/runs/{run_id}/results.ndjson")
+async def stream_verification_run_results(
+    run_id: int,
+    filter: str = Query('all', description="all, changes or errors"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream all results of a bulk verification run as newline-delimited JSON
+
+    Results are read in batches, so large runs are exported without
+    building the whole response in memory.
+    """
+    if filter not in RESULT_FILTERS:
+        raise HTTPException(status_code=400, detail=f"filter must be one of: {', '.join(RESULT_FILTERS)}")
+
+    if not await VerificationRunService(db).get_run(run_id):
+        raise HTTPException(status_code=404, detail="Verification run not found")
+
+    async def generate():
+        # Own session: the request session may be closed before streaming ends
+        async with async_session() as stream_db:
+            async for result in VerificationRunService(stream_db).iter_results(run_id, result_filter=filter):
+                yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="verification_run_{run_id}.ndjson"'}
+    )
+
+
 @router.get("/active-users", response_model=ActiveUsersListResponse)
 async def get_active_users(
     skip: int = 0,
@@ -192,6 +287,8 @@ async def get_verification_status():
     - total_users: total number of users to check
     - progress_percentage: completion percentage
     - estimated_time_remaining: estimated seconds until completion
+    - users_per_second: live throughput over the last few seconds
+    - flood_waits: how many times Telegram asked to slow down
     
     This endpoint can be polled while verification is running to show progress.
     """
@@ -208,7 +305,10 @@ async def get_verification_status():
             "users_with_errors": 0,
             "progress_percentage": 0,
             "estimated_time_remaining": None,
-            "started_at": None
+            "started_at": None,
+            "run_id": None,
+            "users_per_second": 0,
+            "flood_waits": 0
         }
     
     return _verification_service_instance.get_status()
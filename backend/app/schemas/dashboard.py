@@ -2,6 +2,8 @@
 Dashboard Pydantic schemas
 """
 
+from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel
 
 
@@ -11,3 +13,27 @@ class DashboardStats(BaseModel):
     total_channels: int
     total_moderators: int
     total_users: int
+
+
+class BackgroundJobMetrics(BaseModel):
+    """Schema for run statistics of one background job"""
+    name: str
+    schedule: str
+    timeout_seconds: Optional[float] = None
+    runs: int
+    failures: int
+    consecutive_failures: int
+    overruns: int
+    is_running: bool
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_success_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+    next_run_at: Optional[datetime] = None
+
+
+class BackgroundJobsStatus(BaseModel):
+    """Schema for background jobs of the process that served the request"""
+    is_leader: bool  # Only the leader process runs background jobs
+    jobs: List[BackgroundJobMetrics]
@@ -27,6 +27,9 @@ class UserSearchRequest(BaseModel):
     limit: Optional[int] = 20
     offset: Optional[int] = 0
     telegram_user_id: int  # User performing the search
+    prefix_only: bool = False  # Match usernames starting with query instead of containing it
+    after_telegram_user_id: Optional[int] = None  # Keyset cursor (next_cursor of previous page), replaces offset
+    exact_count: bool = False  # Count all matches instead of stopping at the count cap
 
 
 class UserHistoryEntry(BaseModel):
@@ -60,6 +63,8 @@ class UserSearchResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    total_capped: bool = False  # True when total stopped at the count cap ("1000+")
+    next_cursor: Optional[int] = None  # Pass as after_telegram_user_id to get the next page
 
 
 class SearchLimitResponse(BaseModel):
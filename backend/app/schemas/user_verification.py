@@ -62,21 +62,51 @@ class BulkVerificationRequest(BaseModel):
     chat_id: Optional[int] = Field(None, description="Chat ID to filter users. If not provided, checks all active users")
     telegram_user_ids: Optional[List[int]] = Field(None, description="Specific user IDs to check. If not provided, checks all active users in chat(s)")
     auto_update: bool = Field(default=True, description="Automatically update user data if changes detected")
-    delay_between_requests: float = Field(default=0.5, description="Delay in seconds between API requests to avoid rate limiting")
+    max_users: Optional[int] = Field(None, ge=1, description="Only verify this many least recently verified users. If not provided, verifies all")
+    delay_between_requests: Optional[float] = Field(None, description="Minimum interval in seconds between API requests. Defaults to the configured verification rate limit")
 
 
 class BulkVerificationResponse(BaseModel):
     """Schema for bulk verification response"""
+    run_id: Optional[int] = Field(None, description="Verification run ID, results are read from /runs/{run_id}/results")
     total_checked: int = Field(description="Total number of users checked")
     total_updated: int = Field(description="Number of users with updated data")
     total_errors: int = Field(description="Number of errors encountered")
     total_with_changes: int = Field(description="Number of users with detected changes")
-    results: List[UserVerificationResult] = Field(default_factory=list)
+    results: List[UserVerificationResult] = Field(default_factory=list, description="Not filled for bulk runs, results are stored per run")
     started_at: datetime
     completed_at: datetime
     duration_seconds: float = Field(description="Total duration of the verification process")
 
 
+class VerificationRunResponse(BaseModel):
+    """Schema for a stored verification run summary"""
+    id: int
+    chat_id: Optional[int] = None
+    auto_update: bool
+    status: str = Field(description="running, completed or failed")
+    total_users: int
+    total_checked: int
+    total_updated: int
+    total_errors: int
+    total_with_changes: int
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class VerificationResultsPage(BaseModel):
+    """Schema for a page of stored verification results"""
+    run_id: int
+    results: List[UserVerificationResult] = Field(default_factory=list)
+    total: int = Field(description="Total number of results matching the filter")
+    skip: int
+    limit: int
+
+
 class ActiveUserInfo(BaseModel):
     """Schema for active user information"""
     telegram_user_id: int
@@ -14,6 +14,7 @@ class VerificationScheduleBase(BaseModel):
     interval_hours: int = Field(default=24, ge=1, le=168, description="Run every X hours (1-168)")
     auto_update: bool = Field(default=True, description="Auto-update user data if changes detected")
     chat_id: Optional[int] = Field(None, description="Optional: filter by specific chat ID")
+    max_users_per_run: Optional[int] = Field(None, ge=1, description="Optional: only verify this many least recently verified users per run")
 
 
 class VerificationScheduleCreate(VerificationScheduleBase):
@@ -28,6 +29,7 @@ class VerificationScheduleUpdate(BaseModel):
     interval_hours: Optional[int] = Field(None, ge=1, le=168)
     auto_update: Optional[bool] = None
     chat_id: Optional[int] = None
+    max_users_per_run: Optional[int] = Field(None, ge=1)
 
 
 class VerificationScheduleResponse(VerificationScheduleBase):
@@ -51,6 +53,7 @@ class VerificationScheduleResponse(VerificationScheduleBase):
                 "interval_hours": 24,
                 "auto_update": True,
                 "chat_id": None,
+                "max_users_per_run": 5000,
                 "created_at": "2024-01-01T00:00:00Z",
                 "updated_at": "2024-01-01T00:00:00Z",
                 "last_run_at": "2024-01-02T02:00:00Z",
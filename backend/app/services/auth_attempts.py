@@ -5,7 +5,7 @@ Auth attempts service for tracking and blocking login attempts by fingerprint
 from datetime import datetime, timedelta
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import select, update, delete, func, and_, desc
 from app.models.auth_attempts import AuthAttempt
 
 
@@ -162,16 +162,14 @@ class AuthAttemptsService:
         """Clean up old authentication attempts"""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        query = select(AuthAttempt).where(AuthAttempt.last_attempt_at < cutoff_date)
-        result = await self.db.execute(query)
-        old_attempts = result.scalars().all()
-
-        deleted_count = len(old_attempts)
-        for attempt in old_attempts:
-            await self.db.delete(attempt)
-
+        # Single DELETE on the indexed last_attempt_at column
+        result = await self.db.execute(
+            delete(AuthAttempt)
+            .where(AuthAttempt.last_attempt_at < cutoff_date)
+            .execution_options(synchronize_session=False)
+        )
         await self.db.commit()
-        return deleted_count
+        return result.rowcount
 
     async def reset_blocked_attempts(self, minutes: int = 20) -> int:
         """
@@ -185,31 +183,29 @@ class AuthAttemptsService:
             Number of records reset
         """
         cutoff_time = datetime.utcnow() - timedelta(minutes=minutes)
-        
-        # Find all blocked attempts older than cutoff time
-        query = select(AuthAttempt).where(
-            and_(
-                AuthAttempt.blocked == True,
-                AuthAttempt.last_attempt_at < cutoff_time
+
+        # Reset counters and blocked status of all expired blocks in one UPDATE
+        result = await self.db.execute(
+            update(AuthAttempt)
+            .where(
+                and_(
+                    AuthAttempt.blocked == True,
+                    AuthAttempt.last_attempt_at < cutoff_time
+                )
+            )
+            .values(
+                blocked=False,
+                failed_count=0,
+                attempt_count=0,
+                success_count=0,
+                block_reason=None,
+                blocked_until=None
             )
+            .execution_options(synchronize_session=False)
         )
-        
-        result = await self.db.execute(query)
-        blocked_attempts = result.scalars().all()
-        
-        reset_count = 0
-        for attempt in blocked_attempts:
-            # Reset the attempt counters and blocked status
-            attempt.blocked = False
-            attempt.failed_count = 0
-            attempt.attempt_count = 0
-            attempt.success_count = 0
-            attempt.block_reason = None
-            attempt.blocked_until = None
-            reset_count += 1
-        
         await self.db.commit()
-        
+
+        reset_count = result.rowcount
         if reset_count > 0:
             print(f"[AUTH] Reset {reset_count} blocked authentication attempts after {minutes} minutes cooldown")
         
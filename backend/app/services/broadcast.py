@@ -5,19 +5,35 @@ Broadcast service for sending messages to Telegram users
 import asyncio
 import base64
 import mimetypes
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Union
 from io import BytesIO
 from copy import deepcopy
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, BufferedInputFile
 
 from app.models.users import User
-from app.schemas.broadcast import BroadcastResult, BroadcastStatus, BroadcastMessageRequest
+from app.schemas.broadcast import (
+    BroadcastResult, BroadcastStatus, BroadcastMessageRequest, MediaFile,
+    InlineKeyboardMarkup as InlineKeyboardMarkupSchema
+)
 from app.services.openrouter import OpenRouterService
 from app.core.config import settings
+from app.core.database import async_session
+from app.utils.rate_limiter import AsyncRateLimiter
+
+
+@dataclass(frozen=True)
+class BroadcastPayload:
+    """Ready-to-send message for one language, shared by all its recipients"""
+    text: str
+    reply_markup: Optional[InlineKeyboardMarkup] = None
+    media_type: Optional[str] = None  # 'photo', 'video', 'document'
+    media: Optional[Union[str, BufferedInputFile]] = None
+    caption: Optional[str] = None
 
 
 class BroadcastService:
@@ -34,6 +50,8 @@ class BroadcastService:
         self.blocked_users = 0
         self.failed_sends = 0
         self.started_at = None
+        # Users that blocked the bot, waiting to be flushed in one UPDATE
+        self._blocked_user_ids: List[int] = []
 
     async def _translate_keyboard_markup(self, reply_markup, target_language: str):
         """
@@ -112,6 +130,8 @@ class BroadcastService:
         self.blocked_users = 0
         self.failed_sends = 0
         self.started_at = datetime.utcnow()
+        self._blocked_user_ids = []
+        flush_task = None
 
         try:
             # Get eligible users
@@ -166,59 +186,56 @@ class BroadcastService:
 
                 print(f"Keyboard translation completed for {len(translations_keyboard)} languages")
 
-            # Send messages with rate limiting (28 messages per second)
-            batch_size = 28
-            delay_between_batches = 1.0  # 1 second
+            # Compile the payload once per language: keyboard, decoded media
+            # and caption are shared by every recipient of that language
+            media = self._compile_media(request.media)
+            default_payload = self._compile_payload(request.message, request.reply_markup, request.media, media)
+            payloads: Dict[str, BroadcastPayload] = {}
+            for target_lang in all_languages:
+                payloads[target_lang] = self._compile_payload(
+                    translations.get(target_lang, request.message),
+                    translations_keyboard.get(target_lang, request.reply_markup),
+                    request.media,
+                    media
+                )
 
-            for i in range(0, len(users), batch_size):
-                batch = users[i:i + batch_size]
+            # Send messages through a continuous pipeline: sender tasks pull
+            # recipients from a queue and share one rate limiter, so a slow
+            # recipient only occupies its own task instead of stalling a batch
+            queue: asyncio.Queue = asyncio.Queue()
+            for user in users:
+                queue.put_nowait(user)
 
-                # Send batch concurrently with cached translations
-                tasks = []
-                for user in batch:
-                    # Get translated message from cache or use original
-                    if user.language_code and user.language_code in translations:
-                        user_message = translations[user.language_code]
-                    else:
-                        user_message = request.message
-
-                    # Get translated keyboard from cache or use original
-                    user_reply_markup = request.reply_markup
-                    if user.language_code and user.language_code in translations_keyboard:
-                        user_reply_markup = translations_keyboard[user.language_code]
-
-                    # Create user-specific request with original message preserved
-                    user_request = BroadcastMessageRequest(
-                        message=user_message,
-                        original_message=request.original_message or request.message,
-                        media=request.media,
-                        reply_markup=user_reply_markup
-                    )
+            rate_limiter = AsyncRateLimiter(settings.BROADCAST_MESSAGES_PER_SECOND)
+            sender_count = max(1, min(settings.BROADCAST_SENDER_TASKS, len(users)))
 
-                    tasks.append(self._send_to_user(user, user_request))
+            async def sender():
+                while True:
+                    try:
+                        user = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
 
-                # Wait for all tasks in batch to complete
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+                    payload = payloads.get(user.language_code, default_payload)
 
-                # Process results
-                for result in batch_results:
-                    if isinstance(result, Exception):
-                        self.failed_sends += 1
-                        print(f"Error in batch: {result}")
+                    await rate_limiter.acquire()
+                    try:
+                        success, was_blocked = await self._send_to_user(user, payload)
+                    except Exception as e:
+                        print(f"Error sending broadcast to user {user.telegram_id}: {e}")
+                        success, was_blocked = False, False
+
+                    if success:
+                        self.sent_successfully += 1
+                    elif was_blocked:
+                        self.blocked_users += 1
                     else:
-                        success, was_blocked = result
-                        if success:
-                            self.sent_successfully += 1
-                        elif was_blocked:
-                            self.blocked_users += 1
-                        else:
-                            self.failed_sends += 1
+                        self.failed_sends += 1
 
-                self.current_progress = min(i + batch_size, len(users))
+                    self.current_progress += 1
 
-                # Rate limiting delay (skip delay after last batch)
-                if i + batch_size < len(users):
-                    await asyncio.sleep(delay_between_batches)
+            flush_task = asyncio.create_task(self._flush_blocked_users_periodically())
+            await asyncio.gather(*(sender() for _ in range(sender_count)))
 
             completed_at = datetime.utcnow()
             duration = (completed_at - self.started_at).total_seconds()
@@ -237,9 +254,123 @@ class BroadcastService:
             return result
 
         finally:
+            if flush_task:
+                flush_task.cancel()
+                try:
+                    await flush_task
+                except asyncio.CancelledError:
+                    pass
+            await self._flush_blocked_users()
             self.is_running = False
 
-    async def _send_to_user(self, user: User, request: BroadcastMessageRequest) -> Tuple[bool, bool]:
+    async def _flush_blocked_users_periodically(self):
+        """Flush collected blocked users every few seconds while broadcasting"""
+        while True:
+            await asyncio.sleep(settings.BROADCAST_BLOCKED_FLUSH_SECONDS)
+            await self._flush_blocked_users()
+
+    async def _flush_blocked_users(self):
+        """
+        Mark all collected blocked users with a single UPDATE.
+        Uses its own session so sender tasks never share one.
+        """
+        if not self._blocked_user_ids:
+            return
+
+        user_ids, self._blocked_user_ids = self._blocked_user_ids, []
+        try:
+            async with async_session() as db:
+                await db.execute(
+                    update(User)
+                    .where(User.id.in_(user_ids))
+                    .values(can_send_messages=False, blocked_at=datetime.utcnow())
+                )
+                await db.commit()
+            print(f"Marked {len(user_ids)} users as blocked")
+        except Exception as e:
+            print(f"Failed to mark {len(user_ids)} blocked users: {e}")
+            # Keep them for the next flush attempt
+            self._blocked_user_ids.extend(user_ids)
+
+    def _build_reply_markup(self, reply_markup: Optional[InlineKeyboardMarkupSchema]) -> Optional[InlineKeyboardMarkup]:
+        """Convert request keyboard schema to aiogram markup, skipping invalid buttons"""
+        if not reply_markup:
+            return None
+
+        keyboard = []
+        for row in reply_markup.inline_keyboard:
+            keyboard_row = []
+            for button in row.buttons:
+                # Skip invalid buttons
+                if not button.url and not button.callback_data:
+                    print(f"Warning: Skipping button '{button.text}' - inline keyboard buttons must have url or callback_data")
+                    continue
+                if button.url and button.callback_data:
+                    print(f"Warning: Skipping button '{button.text}' - inline keyboard buttons cannot have both url and callback_data")
+                    continue
+
+                # Create button with only defined parameters
+                button_kwargs = {"text": button.text}
+                if button.url:
+                    button_kwargs["url"] = button.url
+                if button.callback_data:
+                    button_kwargs["callback_data"] = button.callback_data
+                keyboard_row.append(InlineKeyboardButton(**button_kwargs))
+
+            # Only add non-empty rows
+            if keyboard_row:
+                keyboard.append(keyboard_row)
+
+        # Only create markup if keyboard is not empty
+        if not keyboard:
+            return None
+        return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+    def _compile_media(self, media: Optional[MediaFile]) -> Optional[Union[str, BufferedInputFile]]:
+        """Resolve media reference once: decode data URLs, keep external URLs as is"""
+        if not media:
+            return None
+
+        if media.type.lower() not in ('photo', 'video', 'document'):
+            raise ValueError(f"Unsupported media type: {media.type.lower()}")
+
+        media_url = media.url
+        if not media_url.startswith('data:'):
+            # Use URL directly (for external URLs)
+            return media_url
+
+        # Extract base64 data from data URL
+        # Parse data URL: data:mimetype;base64,data
+        header, encoded_data = media_url.split(',', 1)
+        mime_type = header.split(':')[1].split(';')[0]
+
+        # Decode base64
+        try:
+            file_data = base64.b64decode(encoded_data)
+        except Exception as e:
+            raise ValueError(f"Invalid base64 data: {e}")
+
+        # Create BufferedInputFile for file (re-readable, so it is safe to share)
+        filename = f"media.{mimetypes.guess_extension(mime_type) or 'bin'}"
+        return BufferedInputFile(file_data, filename=filename)
+
+    def _compile_payload(
+        self,
+        message: str,
+        reply_markup: Optional[InlineKeyboardMarkupSchema],
+        media: Optional[MediaFile],
+        compiled_media: Optional[Union[str, BufferedInputFile]]
+    ) -> BroadcastPayload:
+        """Build the immutable payload sent to every recipient of one language"""
+        return BroadcastPayload(
+            text=message,
+            reply_markup=self._build_reply_markup(reply_markup),
+            media_type=media.type.lower() if media else None,
+            media=compiled_media,
+            caption=(media.caption or message) if media else None
+        )
+
+    async def _send_to_user(self, user: User, payload: BroadcastPayload) -> Tuple[bool, bool]:
         """
         Send message to individual user
         Returns: (success, was_blocked)
@@ -248,121 +379,38 @@ class BroadcastService:
             if not self.bot:
                 raise ValueError("Bot instance not provided")
 
-            # Prepare keyboard markup if provided
-            reply_markup = None
-            if request.reply_markup:
-                keyboard = []
-                for row in request.reply_markup.inline_keyboard:
-                    keyboard_row = []
-                    for button in row.buttons:
-                        # Skip invalid buttons
-                        if not button.url and not button.callback_data:
-                            print(f"Warning: Skipping button '{button.text}' - inline keyboard buttons must have url or callback_data")
-                            continue
-                        if button.url and button.callback_data:
-                            print(f"Warning: Skipping button '{button.text}' - inline keyboard buttons cannot have both url and callback_data")
-                            continue
-
-                        # Create button with only defined parameters
-                        button_kwargs = {"text": button.text}
-                        if button.url:
-                            button_kwargs["url"] = button.url
-                        if button.callback_data:
-                            button_kwargs["callback_data"] = button.callback_data
-                        keyboard_row.append(InlineKeyboardButton(**button_kwargs))
-
-                    # Only add non-empty rows
-                    if keyboard_row:
-                        keyboard.append(keyboard_row)
-
-                # Only create markup if keyboard is not empty
-                if keyboard:
-                    reply_markup = InlineKeyboardMarkup(inline_keyboard=keyboard)
-
             # Send media or text message
-            if request.media:
-                media_type = request.media.type.lower()
-                media_url = request.media.url
-                caption = request.media.caption or request.message
-
-                # Handle different URL types
-                if media_url.startswith('data:'):
-                    # Extract base64 data from data URL
-                    # Parse data URL: data:mimetype;base64,data
-                    header, encoded_data = media_url.split(',', 1)
-                    mime_type = header.split(':')[1].split(';')[0]
-
-                    # Decode base64
-                    try:
-                        file_data = base64.b64decode(encoded_data)
-                    except Exception as e:
-                        raise ValueError(f"Invalid base64 data: {e}")
-
-                    # Create BufferedInputFile for file
-                    filename = f"media.{mimetypes.guess_extension(mime_type) or 'bin'}"
-                    buffered_file = BufferedInputFile(file_data, filename=filename)
-
-                    if media_type == 'photo':
-                        await self.bot.bot.send_photo(
-                            chat_id=user.telegram_id,
-                            photo=buffered_file,
-                            caption=caption,
-                            parse_mode="HTML",
-                            reply_markup=reply_markup
-                        )
-                    elif media_type == 'video':
-                        await self.bot.bot.send_video(
-                            chat_id=user.telegram_id,
-                            video=buffered_file,
-                            caption=caption,
-                            parse_mode="HTML",
-                            reply_markup=reply_markup
-                        )
-                    elif media_type == 'document':
-                        await self.bot.bot.send_document(
-                            chat_id=user.telegram_id,
-                            document=buffered_file,
-                            caption=caption,
-                            parse_mode="HTML",
-                            reply_markup=reply_markup
-                        )
-                    else:
-                        raise ValueError(f"Unsupported media type: {media_type}")
-                else:
-                    # Use URL directly (for external URLs)
-                    if media_type == 'photo':
-                        await self.bot.bot.send_photo(
-                            chat_id=user.telegram_id,
-                            photo=media_url,
-                            caption=caption,
-                            parse_mode="HTML",
-                            reply_markup=reply_markup
-                        )
-                    elif media_type == 'video':
-                        await self.bot.bot.send_video(
-                            chat_id=user.telegram_id,
-                            video=media_url,
-                            caption=caption,
-                            parse_mode="HTML",
-                            reply_markup=reply_markup
-                        )
-                    elif media_type == 'document':
-                        await self.bot.bot.send_document(
-                            chat_id=user.telegram_id,
-                            document=media_url,
-                            caption=caption,
-                            parse_mode="HTML",
-                            reply_markup=reply_markup
-                        )
-                    else:
-                        raise ValueError(f"Unsupported media type: {media_type}")
+            if payload.media_type == 'photo':
+                await self.bot.bot.send_photo(
+                    chat_id=user.telegram_id,
+                    photo=payload.media,
+                    caption=payload.caption,
+                    parse_mode="HTML",
+                    reply_markup=payload.reply_markup
+                )
+            elif payload.media_type == 'video':
+                await self.bot.bot.send_video(
+                    chat_id=user.telegram_id,
+                    video=payload.media,
+                    caption=payload.caption,
+                    parse_mode="HTML",
+                    reply_markup=payload.reply_markup
+                )
+            elif payload.media_type == 'document':
+                await self.bot.bot.send_document(
+                    chat_id=user.telegram_id,
+                    document=payload.media,
+                    caption=payload.caption,
+                    parse_mode="HTML",
+                    reply_markup=payload.reply_markup
+                )
             else:
                 # Send text message
                 await self.bot.bot.send_message(
                     chat_id=user.telegram_id,
-                    text=request.message,
+                    text=payload.text,
                     parse_mode="HTML",
-                    reply_markup=reply_markup
+                    reply_markup=payload.reply_markup
                 )
 
             return True, False
@@ -370,9 +418,7 @@ class BroadcastService:
         except TelegramForbiddenError as e:
             # User blocked the bot
             print(f"User {user.telegram_id} blocked the bot: {e}")
-            user.can_send_messages = False
-            user.blocked_at = datetime.utcnow()
-            await self.db.commit()
+            self._blocked_user_ids.append(user.id)
             return False, True
 
         except TelegramBadRequest as e:
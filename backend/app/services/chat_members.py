@@ -5,9 +5,10 @@ Chat members service with business logic
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, func, or_
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from app.models.chat_members import ChatMember
+from app.models.chats import Chat
 from app.schemas.chat_members import ChatMemberCreate, ChatMemberUpdate
 from app.schemas.telegram_users import TelegramUserData
 from app.services.telegram_users import TelegramUserService
@@ -75,6 +76,46 @@ class ChatMemberService:
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def get_other_groups_for_users(
+        self,
+        telegram_user_ids: List[int],
+        exclude_chat_id: int,
+        limit_per_user: int = 10
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Get active groups of many users in one query, excluding one chat.
+        At most `limit_per_user` groups are kept per user.
+        """
+        groups: Dict[int, List[Dict[str, Any]]] = {user_id: [] for user_id in telegram_user_ids}
+        if not telegram_user_ids:
+            return groups
+
+        result = await self.db.execute(
+            select(
+                ChatMember.telegram_user_id,
+                Chat.title,
+                Chat.telegram_chat_id,
+                Chat.chat_type
+            )
+            .select_from(ChatMember)
+            .join(Chat, ChatMember.chat_id == Chat.id)
+            .where(ChatMember.telegram_user_id.in_(set(telegram_user_ids)))
+            .where(Chat.is_active == True)
+            .where(Chat.chat_type.in_(['group', 'supergroup']))
+            .where(Chat.id != exclude_chat_id)
+            .order_by(ChatMember.telegram_user_id, ChatMember.chat_id)
+        )
+
+        for row in result:
+            user_groups = groups[row.telegram_user_id]
+            if len(user_groups) < limit_per_user:
+                user_groups.append({
+                    'title': row.title or f'Chat {row.telegram_chat_id}',
+                    'telegram_chat_id': row.telegram_chat_id,
+                    'chat_type': row.chat_type
+                })
+        return groups
+
     async def update_chat_member(self, member_id: int, member_data: ChatMemberUpdate) -> Optional[ChatMember]:
         """Update chat member"""
         db_member = await self.get_chat_member(member_id)
@@ -61,9 +61,9 @@ class ChatModeratorService:
         )
         return result.scalars().all()
 
-    async def get_all_moderators_with_chat_info(self) -> List[Dict[str, Any]]:
-        """Get all moderators with chat information for frontend"""
-        result = await self.db.execute(
+    async def get_all_moderators_with_chat_info(self, chat_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get all moderators with chat information for frontend, optionally only those of one chat"""
+        query = (
             select(
                 ChatModerator.id,
                 ChatModerator.chat_id,
@@ -82,6 +82,10 @@ class ChatModeratorService:
             .join(User, ChatModerator.added_by_user_id == User.id)
             .order_by(ChatModerator.created_at.desc())
         )
+        if chat_id is not None:
+            query = query.where(ChatModerator.chat_id == chat_id)
+
+        result = await self.db.execute(query)
 
         moderators = []
         for row in result:
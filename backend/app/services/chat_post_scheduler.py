@@ -0,0 +1,164 @@
+"""
+In-process scheduler firing chat post send/unpin/delete actions when due
+"""
+
+import asyncio
+import heapq
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.core.database import async_session
+
+
+RELOAD_INTERVAL_SECONDS = 60  # Re-read due posts from the database (picks up changes made by other API workers)
+LOAD_HORIZON_SECONDS = 900  # Only posts due within this window are kept in memory; must exceed the reload interval
+RETRY_DELAY_SECONDS = 60  # Retry delay after a failed action or while the bot is unavailable
+
+
+def to_timestamp(moment: datetime) -> float:
+    """Convert a stored datetime (naive values are UTC) to a POSIX timestamp"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def get_next_due_at(post) -> Optional[float]:
+    """Earliest pending send/unpin/delete time of a post, or None if nothing is pending"""
+    if post.is_deleted:
+        return None
+
+    due_times = []
+    if not post.is_sent and post.scheduled_send_at:
+        due_times.append(to_timestamp(post.scheduled_send_at))
+    if post.is_pinned and post.scheduled_unpin_at:
+        due_times.append(to_timestamp(post.scheduled_unpin_at))
+    if post.scheduled_delete_at:
+        due_times.append(to_timestamp(post.scheduled_delete_at))
+
+    return min(due_times) if due_times else None
+
+
+class ChatPostScheduler:
+    """
+    Priority queue of chat posts keyed on their next due time.
+    Only filled while run() is active, i.e. in the background jobs leader.
+
+    A single task sleeps until the earliest entry is due and processes that
+    post. ChatPostService pushes every change of a post's schedule, so
+    actions fire on time without polling. The database is only read at
+    startup and every RELOAD_INTERVAL_SECONDS, through the indexed
+    scheduled_* columns, for posts due within LOAD_HORIZON_SECONDS.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int]] = []
+        # post_id -> due time of its live heap entry; other heap entries for the post are stale
+        self._due_at: Dict[int, float] = {}
+        self._wakeup = asyncio.Event()
+        self._running = False
+
+    def update(self, post) -> None:
+        """(Re)schedule a post after its schedule or state changed"""
+        due_at = get_next_due_at(post)
+        if due_at is None:
+            self.remove(post.id)
+        elif due_at <= time.time() + LOAD_HORIZON_SECONDS:
+            self._push(post.id, due_at)
+        else:
+            # Beyond the horizon, a reload picks it up before it is due
+            self.remove(post.id)
+
+    def remove(self, post_id: int) -> None:
+        """Forget a post; its heap entry is skipped when popped"""
+        self._due_at.pop(post_id, None)
+
+    def _push(self, post_id: int, due_at: float) -> None:
+        if not self._running:
+            return  # Not the leader process, the leader picks the post up on its next reload
+        if self._due_at.get(post_id) == due_at:
+            return
+        self._due_at[post_id] = due_at
+        heapq.heappush(self._heap, (due_at, post_id))
+        if self._heap[0] == (due_at, post_id):
+            # New earliest entry, shorten the current sleep
+            self._wakeup.set()
+
+    async def _reload(self) -> None:
+        """Load posts due within the horizon from the database"""
+        from app.services.chat_posts import ChatPostService
+
+        until = datetime.now(timezone.utc) + timedelta(seconds=LOAD_HORIZON_SECONDS)
+        async with async_session() as db:
+            due_posts = await ChatPostService(db).get_posts_due_before(until)
+
+        for post in due_posts:
+            self.update(post)
+
+        # Drop stale heap entries so the heap doesn't grow with rescheduled posts
+        self._heap = [(due_at, post_id) for due_at, post_id in self._heap if self._due_at.get(post_id) == due_at]
+        heapq.heapify(self._heap)
+
+    async def _fire(self, post_id: int) -> None:
+        """Process due actions of one post"""
+        from app.main import get_telegram_bot
+        from app.services.chat_posts import ChatPostService
+
+        telegram_bot = get_telegram_bot()
+        if not telegram_bot or not telegram_bot.is_running:
+            print(f"[ChatPosts] Telegram bot is not available, retrying post {post_id} later")
+            self._push(post_id, time.time() + RETRY_DELAY_SECONDS)
+            return
+
+        async with async_session() as db:
+            post = await ChatPostService(db, telegram_bot.bot).process_due_post(post_id)
+            if post is None:
+                self.remove(post_id)
+                return
+
+            due_at = get_next_due_at(post)
+            if due_at is not None and due_at <= time.time():
+                # The action failed, don't spin on it
+                self._push(post_id, time.time() + RETRY_DELAY_SECONDS)
+            else:
+                self.update(post)
+
+    async def run(self) -> None:
+        """Scheduler loop, runs until cancelled"""
+        self._running = True
+        next_reload = 0.0
+        try:
+            while True:
+                if time.time() >= next_reload:
+                    try:
+                        await self._reload()
+                        next_reload = time.time() + RELOAD_INTERVAL_SECONDS
+                    except Exception as e:
+                        print(f"[ChatPosts] Error loading scheduled posts: {e}")
+                        next_reload = time.time() + RETRY_DELAY_SECONDS
+
+                while self._heap and self._heap[0][0] <= time.time():
+                    due_at, post_id = heapq.heappop(self._heap)
+                    if self._due_at.get(post_id) != due_at:
+                        continue  # Stale entry
+                    del self._due_at[post_id]
+                    try:
+                        await self._fire(post_id)
+                    except Exception as e:
+                        print(f"[ChatPosts] Error processing scheduled post {post_id}: {e}")
+                        self._push(post_id, time.time() + RETRY_DELAY_SECONDS)
+
+                wake_at = min(next_reload, self._heap[0][0]) if self._heap else next_reload
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, wake_at - time.time()))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._running = False
+            self._heap = []
+            self._due_at = {}
+
+
+# Global scheduler instance of this process
+chat_post_scheduler = ChatPostScheduler()
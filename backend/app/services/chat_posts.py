@@ -11,6 +11,7 @@ from fastapi import HTTPException
 from app.models.chat_posts import ChatPost
 from app.models.chats import Chat
 from app.schemas.chat_posts import ChatPostCreate, ChatPostUpdate, ChatPostResponse
+from app.services.chat_post_scheduler import chat_post_scheduler
 from aiogram import Bot
 from aiogram.types import InputFile, FSInputFile, URLInputFile, BufferedInputFile, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
@@ -125,6 +126,7 @@ class ChatPostService:
         self.db.add(db_post)
         await self.db.commit()
         await self.db.refresh(db_post)
+        chat_post_scheduler.update(db_post)
         
         return db_post
 
@@ -309,6 +311,7 @@ class ChatPostService:
                     db_post.is_pinned = False
                     await self.db.commit()
 
+            chat_post_scheduler.update(db_post)
             return db_post
 
         except TelegramForbiddenError:
@@ -507,6 +510,7 @@ class ChatPostService:
             db_post.updated_at = datetime.now(timezone.utc)
             await self.db.commit()
             await self.db.refresh(db_post)
+            chat_post_scheduler.update(db_post)
 
             return db_post
 
@@ -548,6 +552,7 @@ class ChatPostService:
             db_post.is_deleted = True
             db_post.updated_at = datetime.now(timezone.utc)
             await self.db.commit()
+            chat_post_scheduler.remove(db_post.id)
 
             return True
 
@@ -556,6 +561,7 @@ class ChatPostService:
             print(f"Telegram error when deleting: {e}")
             db_post.is_deleted = True
             await self.db.commit()
+            chat_post_scheduler.remove(db_post.id)
             return True
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to delete post: {str(e)}")
@@ -599,6 +605,7 @@ class ChatPostService:
             db_post.updated_at = datetime.now(timezone.utc)
             await self.db.commit()
             await self.db.refresh(db_post)
+            chat_post_scheduler.update(db_post)
 
             return db_post
 
@@ -639,6 +646,7 @@ class ChatPostService:
             db_post.updated_at = datetime.now(timezone.utc)
             await self.db.commit()
             await self.db.refresh(db_post)
+            chat_post_scheduler.update(db_post)
 
             return db_post
 
@@ -649,6 +657,7 @@ class ChatPostService:
             db_post.scheduled_unpin_at = None
             await self.db.commit()
             await self.db.refresh(db_post)
+            chat_post_scheduler.update(db_post)
             return db_post
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to unpin post: {str(e)}")
@@ -693,63 +702,64 @@ class ChatPostService:
         )
         return result.scalar_one_or_none()
 
-    async def process_scheduled_actions(self):
-        """Process scheduled unpin, delete, and send actions"""
+    async def get_posts_due_before(self, until: datetime) -> List[ChatPost]:
+        """
+        Get posts with a send, unpin or delete action due before `until`.
+        Each query filters on one indexed scheduled_* column.
+        """
+        queries = [
+            select(ChatPost).where(
+                and_(
+                    ChatPost.scheduled_send_at <= until,
+                    ChatPost.is_sent == False,
+                    ChatPost.is_deleted == False
+                )
+            ),
+            select(ChatPost).where(
+                and_(
+                    ChatPost.scheduled_unpin_at <= until,
+                    ChatPost.is_pinned == True,
+                    ChatPost.is_deleted == False
+                )
+            ),
+            select(ChatPost).where(
+                and_(
+                    ChatPost.scheduled_delete_at <= until,
+                    ChatPost.is_deleted == False
+                )
+            ),
+        ]
+
+        posts = {}
+        for query in queries:
+            result = await self.db.execute(query)
+            for post in result.scalars().all():
+                posts[post.id] = post
+        return list(posts.values())
+
+    async def process_due_post(self, post_id: int) -> Optional[ChatPost]:
+        """
+        Run the send, unpin and delete actions of a post that are due now.
+        Returns the post afterwards, or None if it no longer exists.
+        """
         if not self.bot:
-            return
+            return None
+
+        post = await self.get_post_by_id(post_id)
+        if not post or post.is_deleted:
+            return None
 
         now = datetime.now(timezone.utc)
-        # Debug logging enabled:
-        print(f"[ChatPosts] Checking scheduled actions at {now}")
-        
-        # Debug: Check all unsent posts
-        debug_query = select(ChatPost).where(
-            and_(
-                ChatPost.is_sent == False,
-                ChatPost.is_deleted == False
-            )
-        )
-        debug_result = await self.db.execute(debug_query)
-        all_unsent = debug_result.scalars().all()
-        if all_unsent:
-            print(f"[ChatPosts] Total unsent posts in DB: {len(all_unsent)}")
-            for post in all_unsent:
-                print(f"[ChatPosts] Unsent post {post.id}: scheduled_send_at={post.scheduled_send_at}, is_sent={post.is_sent}, is_deleted={post.is_deleted}")
-
-        # Process scheduled sends
-        # First, get all unsent scheduled posts
-        send_query = select(ChatPost).where(
-            and_(
-                ChatPost.is_sent == False,
-                ChatPost.scheduled_send_at.isnot(None),
-                ChatPost.is_deleted == False
-            )
-        )
-        send_result = await self.db.execute(send_query)
-        all_scheduled = send_result.scalars().all()
-        
-        # Filter posts that should be sent (handling timezone-naive datetimes)
-        posts_to_send = []
-        for post in all_scheduled:
-            scheduled_time = post.scheduled_send_at
+
+        def is_due(moment: Optional[datetime]) -> bool:
+            if moment is None:
+                return False
             # Make timezone-aware if needed
-            if scheduled_time.tzinfo is None:
-                scheduled_time = scheduled_time.replace(tzinfo=timezone.utc)
-            
-            if scheduled_time <= now:
-                posts_to_send.append(post)
-        
-        if posts_to_send:
-            print(f"[ChatPosts] Found {len(posts_to_send)} scheduled post(s) to send")
-            for post in posts_to_send:
-                scheduled_time = post.scheduled_send_at
-                if scheduled_time.tzinfo is None:
-                    scheduled_time = scheduled_time.replace(tzinfo=timezone.utc)
-                print(f"[ChatPosts] Post {post.id}: scheduled for {scheduled_time}, is_sent={post.is_sent}, is_deleted={post.is_deleted}")
-        else:
-            print(f"[ChatPosts] No scheduled posts found to send")
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+            return moment <= now
 
-        for post in posts_to_send:
+        if not post.is_sent and is_due(post.scheduled_send_at):
             try:
                 await self._send_scheduled_post(post)
                 print(f"Sent scheduled post {post.id}")
@@ -759,48 +769,25 @@ class ChatPostService:
                 post.is_deleted = True  # Mark as deleted so it won't be retried
                 await self.db.commit()
                 print(f"Failed to send scheduled post {post.id}: {e}")
+                return post
 
-        # Process scheduled unpins
-        unpin_query = select(ChatPost).where(
-            and_(
-                ChatPost.is_pinned == True,
-                ChatPost.scheduled_unpin_at <= now,
-                ChatPost.scheduled_unpin_at.isnot(None),
-                ChatPost.is_deleted == False
-            )
-        )
-        unpin_result = await self.db.execute(unpin_query)
-        posts_to_unpin = unpin_result.scalars().all()
-
-        if posts_to_unpin:
-            print(f"Found {len(posts_to_unpin)} post(s) to unpin")
-
-        for post in posts_to_unpin:
+        if post.is_pinned and is_due(post.scheduled_unpin_at):
             try:
                 print(f"Unpinning post {post.id} (scheduled for {post.scheduled_unpin_at}, now is {now})")
-                await self.unpin_post(post.id)
+                post = await self.unpin_post(post.id)
                 print(f"Auto-unpinned post {post.id}")
             except Exception as e:
                 print(f"Failed to auto-unpin post {post.id}: {e}")
 
-        # Process scheduled deletes
-        delete_query = select(ChatPost).where(
-            and_(
-                ChatPost.scheduled_delete_at <= now,
-                ChatPost.scheduled_delete_at.isnot(None),
-                ChatPost.is_deleted == False
-            )
-        )
-        delete_result = await self.db.execute(delete_query)
-        posts_to_delete = delete_result.scalars().all()
-
-        for post in posts_to_delete:
+        if is_due(post.scheduled_delete_at):
             try:
                 await self.delete_post(post.id)
                 print(f"Auto-deleted post {post.id}")
             except Exception as e:
                 print(f"Failed to auto-delete post {post.id}: {e}")
 
+        return post
+
     async def _send_scheduled_post(self, post: ChatPost):
         """Send a previously scheduled post to Telegram"""
         if not self.bot:
@@ -937,6 +924,7 @@ class ChatPostService:
                     print(f"Failed to pin scheduled post {post.id}: {e}")
 
             await self.db.commit()
+            chat_post_scheduler.update(post)
 
         except Exception as e:
             print(f"Error sending scheduled post {post.id}: {e}")
@@ -3,12 +3,13 @@ Chat subscriptions service with business logic
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
-from typing import List, Optional
+from sqlalchemy import select, update, and_, or_, func
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
 from app.models.chat_subscriptions import ChatSubscription
 from app.models.chats import Chat
+from app.services.subscription_expiry import subscription_expiry_worker
 from app.schemas.chat_subscriptions import ChatSubscriptionCreate, ChatSubscriptionUpdate, ChatSubscriptionResponse, ChatSubscriptionWithChatInfo
 
 
@@ -34,6 +35,28 @@ class ChatSubscriptionsService:
         )
         return result.scalar_one_or_none()
 
+    async def get_active_subscriptions_for_chats(self, chat_ids: List[int]) -> Dict[int, ChatSubscription]:
+        """Get the active subscription of each chat (the one ending last) in one query"""
+        if not chat_ids:
+            return {}
+
+        current_time = datetime.now()
+        result = await self.db.execute(
+            select(ChatSubscription)
+            .where(and_(
+                ChatSubscription.chat_id.in_(chat_ids),
+                ChatSubscription.is_active == True,
+                ChatSubscription.start_date <= current_time,
+                ChatSubscription.end_date > current_time
+            ))
+            .order_by(ChatSubscription.end_date.desc())
+        )
+
+        subscriptions = {}
+        for subscription in result.scalars().all():
+            subscriptions.setdefault(subscription.chat_id, subscription)
+        return subscriptions
+
     async def has_active_subscription(self, chat_id: int) -> bool:
         """Check if chat has active subscription"""
         subscription = await self.get_active_subscription_for_chat(chat_id)
@@ -45,6 +68,7 @@ class ChatSubscriptionsService:
         self.db.add(db_subscription)
         await self.db.commit()
         await self.db.refresh(db_subscription)
+        subscription_expiry_worker.notify()
         return db_subscription
 
     async def create_subscription_from_payment(
@@ -148,6 +172,7 @@ class ChatSubscriptionsService:
 
         await self.db.commit()
         await self.db.refresh(db_subscription)
+        subscription_expiry_worker.notify()
         return db_subscription
 
     async def deactivate_subscription(self, subscription_id: int) -> bool:
@@ -158,8 +183,44 @@ class ChatSubscriptionsService:
 
         db_subscription.is_active = False
         await self.db.commit()
+        subscription_expiry_worker.notify()
         return True
 
+    async def disable_ai_check_for_expired_chats(self) -> int:
+        """
+        Disable AI content check for every chat without an active subscription
+        in a single UPDATE. Returns the number of chats changed.
+        """
+        current_time = datetime.now()
+        active_subscription = select(ChatSubscription.id).where(and_(
+            ChatSubscription.chat_id == Chat.id,
+            ChatSubscription.is_active == True,
+            ChatSubscription.start_date <= current_time,
+            ChatSubscription.end_date > current_time
+        ))
+
+        result = await self.db.execute(
+            update(Chat)
+            .where(Chat.ai_content_check_enabled == True)
+            .where(~active_subscription.exists())
+            .values(ai_content_check_enabled=False)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def get_next_expiry(self) -> Optional[datetime]:
+        """End date of the next active subscription to expire"""
+        current_time = datetime.now()
+        result = await self.db.execute(
+            select(func.min(ChatSubscription.end_date))
+            .where(and_(
+                ChatSubscription.is_active == True,
+                ChatSubscription.end_date > current_time
+            ))
+        )
+        return result.scalar()
+
     async def get_expiring_subscriptions(self, days_ahead: int = 7) -> List[ChatSubscriptionWithChatInfo]:
         """Get subscriptions expiring within specified days"""
         current_time = datetime.now()
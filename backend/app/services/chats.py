@@ -4,7 +4,7 @@ Chat service with business logic
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.models.chats import Chat
 from app.models.users import User
 from app.models.chat_moderators import ChatModerator
@@ -31,6 +31,16 @@ class ChatService:
         result = await self.db.execute(select(Chat).where(Chat.id == chat_id))
         return result.scalar_one_or_none()
 
+    async def get_chat_with_admin(self, chat_id: int) -> Optional[Tuple[Chat, Optional[User]]]:
+        """Get chat by ID together with the user who added it, in one query"""
+        result = await self.db.execute(
+            select(Chat, User)
+            .outerjoin(User, User.id == Chat.added_by_user_id)
+            .where(Chat.id == chat_id)
+        )
+        row = result.first()
+        return (row[0], row[1]) if row else None
+
     async def get_chat_by_telegram_id(self, telegram_chat_id: int) -> Optional[Chat]:
         """Get chat by Telegram chat ID"""
         result = await self.db.execute(select(Chat).where(Chat.telegram_chat_id == telegram_chat_id))
@@ -167,8 +177,20 @@ class ChatService:
         )
         return result.scalars().all()
 
-    async def get_chats_with_linked_channels_info(self, skip: int = 0, limit: int = 100, include_inactive: bool = False) -> List[ChatWithLinkedChannelResponse]:
-        """Get all chats (groups and supergroups) with linked channel information including admin and moderators"""
+    async def get_chats_with_linked_channels_info(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        include_inactive: bool = False,
+        chat_ids: Optional[List[int]] = None
+    ) -> List[ChatWithLinkedChannelResponse]:
+        """
+        Get all chats (groups and supergroups) with linked channel information including admin and moderators.
+        If chat_ids is given, only those chats are returned; skip/limit apply after that filter.
+        """
+        if chat_ids is not None and not chat_ids:
+            return []
+
         # Get all chats that are groups or supergroups
         query = select(Chat).where(Chat.chat_type.in_(['group', 'supergroup']))
 
@@ -176,26 +198,51 @@ class ChatService:
         if not include_inactive:
             query = query.where(Chat.is_active == True)
 
+        if chat_ids is not None:
+            query = query.where(Chat.id.in_(chat_ids))
+
         chats_result = await self.db.execute(
             query
+            .order_by(Chat.id)
             .offset(skip)
             .limit(limit)
         )
         chats = chats_result.scalars().all()
+        if not chats:
+            return []
+
+        # Load everything the page needs with one batched query per relation
+        chat_ids = [chat.id for chat in chats]
+
+        chat_moderators_result = await self.db.execute(
+            select(ChatModerator)
+            .where(ChatModerator.chat_id.in_(chat_ids))
+            .order_by(ChatModerator.id)
+        )
+        chat_moderators_by_chat = {}
+        for mod in chat_moderators_result.scalars().all():
+            chat_moderators_by_chat.setdefault(mod.chat_id, []).append(mod)
+
+        subscriptions_service = ChatSubscriptionsService(self.db)
+        active_subscriptions = await subscriptions_service.get_active_subscriptions_for_chats(chat_ids)
+
+        linked_channel_ids = {chat.linked_channel_id for chat in chats if chat.linked_channel_id}
+        linked_channels = {}
+        if linked_channel_ids:
+            linked_channels_result = await self.db.execute(
+                select(Chat, User)
+                .outerjoin(User, User.id == Chat.added_by_user_id)
+                .where(Chat.id.in_(linked_channel_ids))
+            )
+            linked_channels = {channel.id: (channel, admin) for channel, admin in linked_channels_result.all()}
 
         result = []
         for chat in chats:
             chat_data = ChatWithLinkedChannelResponse.model_validate(chat)
 
-            # Get moderators for the chat
-            chat_moderators_result = await self.db.execute(
-                select(ChatModerator).where(ChatModerator.chat_id == chat.id)
-            )
-            chat_moderators = chat_moderators_result.scalars().all()
-
             # Prepare chat moderator info
             chat_moderators_info = []
-            for mod in chat_moderators:
+            for mod in chat_moderators_by_chat.get(chat.id, []):
                 mod_info = {
                     'id': mod.id,
                     'moderator_user_id': mod.moderator_user_id,
@@ -208,9 +255,8 @@ class ChatService:
 
             chat_data.chat_moderators = chat_moderators_info
 
-            # Get active subscription for the chat
-            subscriptions_service = ChatSubscriptionsService(self.db)
-            active_subscription = await subscriptions_service.get_active_subscription_for_chat(chat.id)
+            # Active subscription for the chat
+            active_subscription = active_subscriptions.get(chat.id)
             if active_subscription:
                 subscription_info = ChatSubscriptionInfo(
                     id=active_subscription.id,
@@ -225,28 +271,21 @@ class ChatService:
                 )
                 chat_data.active_subscription = subscription_info
 
-            if chat.linked_channel_id:
-                # Get linked channel information
-                linked_channel = await self.get_chat(chat.linked_channel_id)
-                if linked_channel:
-                    # Get admin information for the channel
-                    admin_result = await self.db.execute(
-                        select(User).where(User.id == linked_channel.added_by_user_id)
-                    )
-                    admin = admin_result.scalar_one_or_none()
-
-                    # Create channel info with admin
-                    channel_info = ChannelWithAdmin(
-                        id=linked_channel.id,
-                        telegram_chat_id=linked_channel.telegram_chat_id,
-                        title=linked_channel.title,
-                        username=linked_channel.username,
-                        admin_user_id=linked_channel.added_by_user_id,
-                        admin_username=admin.username if admin else None,
-                        admin_name=f"{admin.first_name or ''} {admin.last_name or ''}".strip() if admin else None
-                    )
-
-                    chat_data.linked_channel_info = channel_info
+            if chat.linked_channel_id in linked_channels:
+                linked_channel, admin = linked_channels[chat.linked_channel_id]
+
+                # Create channel info with admin
+                channel_info = ChannelWithAdmin(
+                    id=linked_channel.id,
+                    telegram_chat_id=linked_channel.telegram_chat_id,
+                    title=linked_channel.title,
+                    username=linked_channel.username,
+                    admin_user_id=linked_channel.added_by_user_id,
+                    admin_username=admin.username if admin else None,
+                    admin_name=f"{admin.first_name or ''} {admin.last_name or ''}".strip() if admin else None
+                )
+
+                chat_data.linked_channel_info = channel_info
 
             # Add welcome message settings
             if chat.welcome_message_enabled or chat.welcome_message_text:
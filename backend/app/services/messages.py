@@ -2,10 +2,12 @@
 Messages service with business logic
 """
 
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, func, and_
 from typing import List, Optional
 from datetime import datetime, timedelta
+from app.core.config import settings
 from app.models.messages import Message
 from app.schemas.messages import MessageCreate, MessageUpdate
 
@@ -74,15 +76,54 @@ class MessageService:
         await self.db.refresh(db_message)
         return db_message
 
-    async def delete_old_messages(self, hours: int = 50) -> int:
-        """Delete messages older than specified hours. Returns count of deleted messages."""
+    async def delete_old_messages(
+        self,
+        hours: int = 50,
+        batch_size: Optional[int] = None,
+        pause_seconds: Optional[float] = None
+    ) -> int:
+        """
+        Delete messages older than specified hours. Returns count of deleted messages.
+
+        Rows are deleted in primary key batches of `batch_size`, each in its
+        own short transaction with a pause in between, so concurrent message
+        inserts are not blocked behind one long-running DELETE.
+        """
+        batch_size = batch_size or settings.MESSAGE_CLEANUP_BATCH_SIZE
+        if pause_seconds is None:
+            pause_seconds = settings.MESSAGE_CLEANUP_BATCH_PAUSE_SECONDS
+
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        result = await self.db.execute(
-            delete(Message)
-            .where(Message.created_at < cutoff_time)
-        )
-        await self.db.commit()
-        return result.rowcount
+        deleted_total = 0
+        last_id = 0
+        while True:
+            result = await self.db.execute(
+                select(Message.id)
+                .where(Message.created_at < cutoff_time)
+                .where(Message.id > last_id)
+                .order_by(Message.id)
+                .limit(batch_size)
+            )
+            message_ids = list(result.scalars().all())
+            if not message_ids:
+                break
+
+            result = await self.db.execute(
+                delete(Message)
+                .where(Message.id.in_(message_ids))
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+
+            deleted_total += result.rowcount
+            last_id = message_ids[-1]
+            print(f"[Cleanup] Deleted {deleted_total} messages older than {hours} hours so far")
+
+            if len(message_ids) < batch_size:
+                break
+            await asyncio.sleep(pause_seconds)
+
+        return deleted_total
 
     async def get_message_count(self, chat_id: int) -> int:
         """Get count of messages in a chat"""
@@ -2,14 +2,17 @@
 Mini app service with business logic
 """
 
+import asyncio
 import hashlib
 import hmac
 import json
 import secrets
+import time
+from collections import OrderedDict
 from urllib.parse import unquote, parse_qs
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_, func, and_
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from aiogram import Bot
 from app.models.users import User
@@ -27,114 +30,60 @@ from app.schemas.mini_app import (
 )
 from app.core.config import settings
 from app.services.search_boost import SearchBoostService
+from app.services.search_quota import SearchQuotaService, SearchQuotaDecision
+from app.services.search_cache import search_result_cache
+from app.services.username_search import UsernameSearchService
+from app.services.telegram_user_history import TelegramUserHistoryService
+
+
+# Web App data secret key, derived once from the bot token
+# https://core.telegram.org/bots/webapps#validating-data-received-via-the-mini-app
+_WEB_APP_SECRET_KEY = hmac.new(
+    key='WebAppData'.encode(),
+    msg=settings.TELEGRAM_BOT_TOKEN.encode(),
+    digestmod=hashlib.sha256
+).digest()
+
+# Recently verified initData strings: init_data -> (expires_at, user_data), in LRU order
+_verified_init_data: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+
+# Profile photo file paths per Telegram user: user_id -> (expires_at, file_path)
+_profile_photo_cache: Dict[int, Tuple[float, Optional[str]]] = {}
+# In-flight profile photo lookups, so concurrent requests share one Bot API call
+_profile_photo_requests: Dict[int, "asyncio.Future[Optional[str]]"] = {}
 
 
 class MiniAppService:
     """Service class for mini app operations"""
 
     # Constants
-    MAX_SEARCHES_PER_DAY = 10
-
-    def __init__(self, db: AsyncSession):
+    MAX_SEARCHES_PER_DAY = SearchQuotaService.MAX_SEARCHES_PER_DAY
+    MAX_HISTORY_ENTRIES = 50  # History entries returned per search result
+    SEARCH_COUNT_CAP = 1000  # Stop counting matches here and report "1000+"
+    PROFILE_PHOTO_CACHE_TTL_SECONDS = 30 * 60  # Telegram keeps file paths valid for at least an hour
+    PROFILE_PHOTO_MISS_TTL_SECONDS = 5 * 60  # Users without a photo are re-checked sooner
+    PROFILE_PHOTO_CACHE_MAX_ENTRIES = 10000
+    INIT_DATA_CACHE_MAX_AGE_SECONDS = 24 * 60 * 60  # Cached verification lives until auth_date + this
+    INIT_DATA_CACHE_MAX_ENTRIES = 5000
+
+    def __init__(self, db: AsyncSession, bot: Optional[Bot] = None):
         self.db = db
-
-    async def _check_search_limit(self, user_id: int) -> tuple[bool, int]:
-        """
-        Check if user has reached daily search limit.
-        Returns (can_search: bool, remaining_searches: int)
-        Now considers purchased boost searches.
-        """
-        # Calculate 24 hours ago
-        twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-        
-        # Count searches in last 24 hours
-        count_query = select(func.count()).select_from(UserSearchLog).where(
-            and_(
-                UserSearchLog.user_id == user_id,
-                UserSearchLog.searched_at >= twenty_four_hours_ago
-            )
-        )
-        result = await self.db.execute(count_query)
-        searches_count = result.scalar() or 0
-        
-        # Calculate remaining from daily limit
-        remaining_daily = max(0, self.MAX_SEARCHES_PER_DAY - searches_count)
-        
-        # Check boost searches
-        boost_service = SearchBoostService(self.db)
-        boost_searches = await boost_service.get_available_boost_searches(user_id)
-        
-        # Can search if either daily limit not reached OR has boost searches
-        can_search = remaining_daily > 0 or boost_searches > 0
-        total_remaining = remaining_daily + boost_searches
-        
-        return can_search, total_remaining
-
-    async def _log_search(self, user_id: int, telegram_user_id: int, query: str, results_count: int):
-        """
-        Log a search operation and use boost if daily limit reached.
-        """
-        # Check if we need to use a boost search
-        twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-        count_query = select(func.count()).select_from(UserSearchLog).where(
-            and_(
-                UserSearchLog.user_id == user_id,
-                UserSearchLog.searched_at >= twenty_four_hours_ago
-            )
-        )
-        result = await self.db.execute(count_query)
-        searches_count = result.scalar() or 0
-        
-        # If daily limit reached, use boost search
-        if searches_count >= self.MAX_SEARCHES_PER_DAY:
-            boost_service = SearchBoostService(self.db)
-            await boost_service.use_boost_search(user_id)
-        
-        # Log the search
-        search_log = UserSearchLog(
-            user_id=user_id,
-            telegram_user_id=telegram_user_id,
-            search_query=query,
-            results_count=results_count
-        )
-        self.db.add(search_log)
-        await self.db.commit()
+        self.bot = bot  # Application's running bot, needed for profile photos
 
     async def get_search_limits(self, user_id: int) -> SearchLimitResponse:
         """Get current search limits for a user including boost searches"""
-        twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-        
-        # Count searches in last 24 hours
-        count_query = select(func.count()).select_from(UserSearchLog).where(
-            and_(
-                UserSearchLog.user_id == user_id,
-                UserSearchLog.searched_at >= twenty_four_hours_ago
-            )
-        )
-        result = await self.db.execute(count_query)
-        searches_count = result.scalar() or 0
-        
-        # Get oldest search timestamp to calculate reset time
-        oldest_search_query = select(UserSearchLog.searched_at).where(
-            and_(
-                UserSearchLog.user_id == user_id,
-                UserSearchLog.searched_at >= twenty_four_hours_ago
-            )
-        ).order_by(UserSearchLog.searched_at.asc()).limit(1)
-        
-        oldest_result = await self.db.execute(oldest_search_query)
-        oldest_search = oldest_result.scalar_one_or_none()
-        
+        searches_count, reset_time, boost_searches = await SearchQuotaService(self.db).get_usage(user_id)
+
         # Reset time is 24 hours from the oldest search, or now if no searches
-        reset_time = (oldest_search + timedelta(hours=24)) if oldest_search else datetime.utcnow()
-        
+        if reset_time is None:
+            reset_time = datetime.utcnow()
+
         remaining_daily = max(0, self.MAX_SEARCHES_PER_DAY - searches_count)
-        
-        # Get boost searches and purchase availability
+
+        # Get purchase availability
         boost_service = SearchBoostService(self.db)
-        boost_searches = await boost_service.get_available_boost_searches(user_id)
         availability = await boost_service.check_purchase_availability(user_id)
-        
+
         return SearchLimitResponse(
             total_searches_today=searches_count,
             max_searches_per_day=self.MAX_SEARCHES_PER_DAY,
@@ -155,7 +104,18 @@ class MiniAppService:
         """
         Verify Telegram Web App initData and extract user information.
         Returns user data if verification successful, None otherwise.
+        Successfully verified initData is remembered until it expires, so the
+        repeated calls of one mini app session skip parsing and HMAC work.
         """
+        now = time.time()
+        cached = _verified_init_data.get(init_data)
+        if cached:
+            expires_at, cached_user_data = cached
+            if expires_at > now:
+                _verified_init_data.move_to_end(init_data)
+                return dict(cached_user_data) if cached_user_data is not None else None
+            del _verified_init_data[init_data]
+
         try:
             # Parse initData (URL-encoded string)
             params = parse_qs(init_data, keep_blank_values=True)
@@ -176,15 +136,9 @@ class MiniAppService:
 
             data_check_string = '\n'.join(data_check_arr)
 
-            # Calculate HMAC-SHA256
-            secret_key = hmac.new(
-                key='WebAppData'.encode(),
-                msg=settings.TELEGRAM_BOT_TOKEN.encode(),
-                digestmod=hashlib.sha256
-            ).digest()
-
+            # Calculate HMAC-SHA256 with the secret derived once from the bot token
             calculated_hash = hmac.new(
-                key=secret_key,
+                key=_WEB_APP_SECRET_KEY,
                 msg=data_check_string.encode(),
                 digestmod=hashlib.sha256
             ).hexdigest()
@@ -201,7 +155,18 @@ class MiniAppService:
                 except (json.JSONDecodeError, KeyError):
                     pass
 
-            return user_data
+            # Remember verified initData until it is INIT_DATA_CACHE_MAX_AGE_SECONDS old
+            try:
+                auth_date = int(params.get('auth_date', [now])[0])
+            except (TypeError, ValueError):
+                auth_date = int(now)
+            expires_at = auth_date + self.INIT_DATA_CACHE_MAX_AGE_SECONDS
+            if expires_at > now:
+                _verified_init_data[init_data] = (expires_at, user_data)
+                while len(_verified_init_data) > self.INIT_DATA_CACHE_MAX_ENTRIES:
+                    _verified_init_data.popitem(last=False)
+
+            return dict(user_data) if user_data is not None else None
 
         except Exception as e:
             print(f"Error verifying Telegram initData: {e}")
@@ -356,68 +321,93 @@ class MiniAppService:
                 message=f"Verification failed: {str(e)}"
             )
 
-    async def search_users(self, request: UserSearchRequest, user_id: int) -> UserSearchResponse:
-        """Search users by ID or username only with rate limiting"""
-        try:
-            # Check search limit
-            can_search, remaining = await self._check_search_limit(user_id)
-            
-            if not can_search:
-                # Return empty results with total 0 to indicate limit reached
-                return UserSearchResponse(
-                    results=[],
-                    total=0,
-                    limit=request.limit,
-                    offset=request.offset
-                )
-
-            query_lower = request.query.lower().strip()
+    async def search_users(
+        self,
+        request: UserSearchRequest,
+        user_id: int,
+        decision: Optional[SearchQuotaDecision] = None
+    ) -> UserSearchResponse:
+        """
+        Search users by ID or username only with rate limiting.
+        `decision` is a search already reserved with SearchQuotaService.try_consume;
+        when omitted, one is reserved here.
+        """
+        quota_service = SearchQuotaService(self.db)
+        if decision is None:
+            decision = await quota_service.try_consume(user_id)
 
-            # Build search conditions for TelegramUser (only ID and username)
-            search_conditions = []
+        if not decision.allowed:
+            # Return empty results with total 0 to indicate limit reached
+            return self._empty_search_response(request)
 
-            # Check if query is a number (searching by ID)
-            if query_lower.isdigit():
-                telegram_id = int(query_lower)
-                search_conditions.append(TelegramUser.telegram_user_id == telegram_id)
-            
-            # Always search by username
-            search_conditions.append(func.lower(TelegramUser.username).contains(query_lower))
+        try:
+            # Repeated searches are served from the short-lived result cache.
+            # A cache hit still calls record() on purpose: the quota limits
+            # searches a user performs, not database work, so a cached answer
+            # costs a search (and a boost) like any other.
+            normalized_query = search_result_cache.normalize_query(request.query)
+            cache_key = (
+                normalized_query,
+                request.prefix_only,
+                request.after_telegram_user_id,
+                request.offset,
+                request.limit,
+                request.exact_count
+            )
+            cached_response = search_result_cache.get(cache_key)
+            if cached_response is not None:
+                if not await quota_service.record(decision, request.telegram_user_id, request.query, cached_response.total):
+                    return self._empty_search_response(request)
+                return cached_response
+
+            # Search by ID or username through the username trigram index
+            search_query = UsernameSearchService(self.db).build_search_query(
+                request.query, prefix_only=request.prefix_only
+            )
 
-            # Execute search query on TelegramUser
-            search_query = select(TelegramUser).where(
-                or_(*search_conditions)
-            ).limit(request.limit).offset(request.offset)
+            # Keyset pagination on the primary key; offset is kept for old clients
+            page_query = search_query.order_by(TelegramUser.telegram_user_id)
+            if request.after_telegram_user_id is not None:
+                page_query = page_query.where(TelegramUser.telegram_user_id > request.after_telegram_user_id)
+            elif request.offset:
+                page_query = page_query.offset(request.offset)
 
-            result = await self.db.execute(search_query)
+            # Execute search query on TelegramUser, one extra row tells if there is a next page
+            page_size = request.limit or 20
+            result = await self.db.execute(page_query.limit(page_size + 1))
             users = result.scalars().all()
+            has_more = len(users) > page_size
+            users = users[:page_size]
+            next_cursor = users[-1].telegram_user_id if has_more else None
 
-            # Get total count
-            count_query = select(func.count()).select_from(TelegramUser).where(
-                or_(*search_conditions)
-            )
+            # Get total count, capped unless an exact count was requested
+            count_source = search_query if request.exact_count else search_query.limit(self.SEARCH_COUNT_CAP + 1)
+            count_query = select(func.count()).select_from(count_source.subquery())
             total_result = await self.db.execute(count_query)
             total = total_result.scalar()
+            total_capped = total > self.SEARCH_COUNT_CAP and not request.exact_count
+            if total_capped:
+                total = self.SEARCH_COUNT_CAP
 
-            # Log this search
-            await self._log_search(user_id, request.telegram_user_id, request.query, total)
+            # Log this search; the reserved boost search may have been spent by another worker
+            if not await quota_service.record(decision, request.telegram_user_id, request.query, total):
+                return self._empty_search_response(request)
 
             # Group similar users and mask duplicates
             user_data_list = self._group_similar_users(list(users))
 
+            # Load history for the whole page in one query
+            history_by_user = await TelegramUserHistoryService(self.db).get_users_history(
+                [user.telegram_user_id for user in users],
+                limit=self.MAX_HISTORY_ENTRIES
+            )
+
             # Convert to response format with history
             results = []
             for user_data in user_data_list:
                 user = user_data['user']
                 is_masked = user_data['masked']
-                
-                # Get history for this user
-                history_query = select(TelegramUserHistory).where(
-                    TelegramUserHistory.telegram_user_id == user.telegram_user_id
-                ).order_by(TelegramUserHistory.changed_at.desc())
-                
-                history_result = await self.db.execute(history_query)
-                history_records = history_result.scalars().all()
+                history_records = history_by_user.get(user.telegram_user_id, [])
 
                 # Convert history to schema format
                 history_entries = [
@@ -464,35 +454,72 @@ class MiniAppService:
                     history=history_entries
                 ))
 
-            return UserSearchResponse(
+            response = UserSearchResponse(
                 results=results,
                 total=total,
                 limit=request.limit,
-                offset=request.offset
+                offset=request.offset,
+                total_capped=total_capped,
+                next_cursor=next_cursor
+            )
+            search_result_cache.set(
+                cache_key,
+                response,
+                query=normalized_query,
+                prefix_only=request.prefix_only,
+                telegram_user_ids=tuple(user.telegram_user_id for user in users)
             )
+            return response
 
         except Exception as e:
             print(f"Search users error: {e}")
+            # Search was not performed, so it should not count against the quota
+            quota_service.release(decision)
             # Return empty results on error
-            return UserSearchResponse(
-                results=[],
-                total=0,
-                limit=request.limit,
-                offset=request.offset
-            )
+            return self._empty_search_response(request)
+
+    @staticmethod
+    def _empty_search_response(request: UserSearchRequest) -> UserSearchResponse:
+        """Empty page returned when a search is rejected or fails"""
+        return UserSearchResponse(
+            results=[],
+            total=0,
+            limit=request.limit,
+            offset=request.offset
+        )
 
     async def get_user_profile_photo(self, user_id: int) -> Optional[str]:
         """
         Get user profile photo URL from Telegram.
-        Returns the file_id of the profile photo or None if not available.
+        Returns the file_path of the profile photo or None if not available.
+        Results are cached per user and concurrent lookups share one Bot API call.
         """
+        now = time.monotonic()
+        cached = _profile_photo_cache.get(user_id)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        task = _profile_photo_requests.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_profile_photo_path(user_id))
+            _profile_photo_requests[user_id] = task
+            task.add_done_callback(lambda _: _profile_photo_requests.pop(user_id, None))
+
+        # Shield so a cancelled request does not cancel the lookup others wait on
+        return await asyncio.shield(task)
+
+    async def _fetch_profile_photo_path(self, user_id: int) -> Optional[str]:
+        """Resolve profile photo file_path through the application's bot session"""
+        if not self.bot:
+            print("Error getting user profile photo: bot instance not provided")
+            return None
+
         try:
-            from aiogram import Bot
-            bot = Bot(token=settings.TELEGRAM_BOT_TOKEN)
-            
+            file_path = None
+
             # Get user profile photos
-            photos = await bot.get_user_profile_photos(user_id=user_id, limit=1)
-            
+            photos = await self.bot.get_user_profile_photos(user_id=user_id, limit=1)
+
             if photos.total_count > 0 and photos.photos:
                 # Get the first (most recent) photo
                 photo_sizes = photos.photos[0]
@@ -500,17 +527,19 @@ class MiniAppService:
                     # Get the largest photo size
                     largest_photo = max(photo_sizes, key=lambda p: p.width * p.height)
                     # Get file info to get the file_path
-                    file_info = await bot.get_file(largest_photo.file_id)
-                    
-                    await bot.session.close()
-                    
+                    file_info = await self.bot.get_file(largest_photo.file_id)
                     # Return the file_path which can be used to construct download URL
                     # Format: https://api.telegram.org/file/bot<token>/<file_path>
-                    return file_info.file_path
-            
-            await bot.session.close()
-            return None
-            
+                    file_path = file_info.file_path
+
+            ttl = self.PROFILE_PHOTO_CACHE_TTL_SECONDS if file_path else self.PROFILE_PHOTO_MISS_TTL_SECONDS
+            now = time.monotonic()
+            if len(_profile_photo_cache) >= self.PROFILE_PHOTO_CACHE_MAX_ENTRIES:
+                for cached_user_id in [uid for uid, (expires_at, _) in _profile_photo_cache.items() if expires_at <= now]:
+                    del _profile_photo_cache[cached_user_id]
+            _profile_photo_cache[user_id] = (now + ttl, file_path)
+            return file_path
+
         except Exception as e:
             print(f"Error getting user profile photo: {e}")
             return None
@@ -5,7 +5,7 @@ Search boost service for managing additional search purchases
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import select, update, func, and_, desc
 from app.models.search_boost_purchases import SearchBoostPurchase, SearchBoostPrice
 from app.schemas.mini_app import (
     SearchBoostAvailabilityResponse,
@@ -59,56 +59,60 @@ class SearchBoostService:
     async def get_available_boost_searches(self, user_id: int) -> int:
         """
         Get total number of unused boost searches available for user.
-        This counts all active purchases with remaining searches.
+        This sums all active purchases with remaining searches in SQL.
         """
-        query = select(SearchBoostPurchase).where(
+        query = select(
+            func.coalesce(func.sum(SearchBoostPurchase.boost_amount - SearchBoostPurchase.used_searches), 0)
+        ).where(
             and_(
                 SearchBoostPurchase.user_id == user_id,
-                SearchBoostPurchase.is_active == True
+                SearchBoostPurchase.is_active == True,
+                SearchBoostPurchase.used_searches < SearchBoostPurchase.boost_amount
             )
-        ).order_by(SearchBoostPurchase.purchased_at.asc())
-        
+        )
+
         result = await self.db.execute(query)
-        purchases = result.scalars().all()
-        
-        total_available = 0
-        for purchase in purchases:
-            remaining = purchase.boost_amount - purchase.used_searches
-            if remaining > 0:
-                total_available += remaining
-            else:
-                # Mark as inactive if fully used
-                purchase.is_active = False
-        
-        await self.db.commit()
-        return total_available
-    
+        return int(result.scalar() or 0)
+
     async def use_boost_search(self, user_id: int) -> bool:
         """
         Use one search from available boosts (oldest first).
         Returns True if a boost search was used, False if no boosts available.
         """
-        query = select(SearchBoostPurchase).where(
+        query = select(SearchBoostPurchase.id).where(
             and_(
                 SearchBoostPurchase.user_id == user_id,
-                SearchBoostPurchase.is_active == True
+                SearchBoostPurchase.is_active == True,
+                SearchBoostPurchase.used_searches < SearchBoostPurchase.boost_amount
             )
-        ).order_by(SearchBoostPurchase.purchased_at.asc())
-        
+        ).order_by(SearchBoostPurchase.purchased_at.asc()).limit(1)
+
         result = await self.db.execute(query)
-        purchases = result.scalars().all()
-        
-        for purchase in purchases:
-            remaining = purchase.boost_amount - purchase.used_searches
-            if remaining > 0:
-                purchase.used_searches += 1
-                if purchase.used_searches >= purchase.boost_amount:
-                    purchase.is_active = False
-                await self.db.commit()
-                return True
-        
-        return False
-    
+        purchase_id = result.scalar_one_or_none()
+        if purchase_id is None:
+            return False
+
+        # Guarded increment, so concurrent consumers cannot overdraw a purchase
+        update_result = await self.db.execute(
+            update(SearchBoostPurchase)
+            .where(
+                and_(
+                    SearchBoostPurchase.id == purchase_id,
+                    SearchBoostPurchase.used_searches < SearchBoostPurchase.boost_amount
+                )
+            )
+            # is_active goes first: MySQL applies SET assignments left to right
+            .ordered_values(
+                (SearchBoostPurchase.is_active, SearchBoostPurchase.used_searches + 1 < SearchBoostPurchase.boost_amount),
+                (SearchBoostPurchase.used_searches, SearchBoostPurchase.used_searches + 1)
+            )
+        )
+        if update_result.rowcount == 0:
+            return False
+
+        await self.db.commit()
+        return True
+
     async def create_purchase(
         self,
         user_id: int,
@@ -0,0 +1,90 @@
+"""
+Short-lived cache of mini-app user search results
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, FrozenSet, Hashable, Optional, Tuple
+from app.core.config import settings
+
+
+class _CacheEntry:
+    """Cached search response with what is needed to invalidate it"""
+
+    __slots__ = ("value", "expires_at", "query", "prefix_only", "telegram_user_ids")
+
+    def __init__(self, value: Any, expires_at: float, query: str, prefix_only: bool, telegram_user_ids: FrozenSet[int]):
+        self.value = value
+        self.expires_at = expires_at
+        self.query = query
+        self.prefix_only = prefix_only
+        self.telegram_user_ids = telegram_user_ids
+
+    def matches_user(self, telegram_user_id: int, username: Optional[str]) -> bool:
+        """Whether a change of this user could alter the cached result"""
+        if telegram_user_id in self.telegram_user_ids:
+            return True
+        if self.query == str(telegram_user_id):
+            return True
+        if not username:
+            return False
+        username = username.lower()
+        if self.prefix_only:
+            return username.startswith(self.query)
+        return self.query in username
+
+
+class SearchResultCache:
+    """
+    LRU cache of search responses keyed by normalized query and page.
+    Entries expire after `ttl_seconds` and are dropped early when a user
+    they contain, or a user that would now match them, changes username.
+    """
+
+    def __init__(self, ttl_seconds: float = 120, max_entries: int = 2000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return query.lower().strip()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, query: str, prefix_only: bool, telegram_user_ids: Tuple[int, ...]) -> None:
+        self._entries[key] = _CacheEntry(
+            value=value,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            query=self.normalize_query(query),
+            prefix_only=prefix_only,
+            telegram_user_ids=frozenset(telegram_user_ids)
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, telegram_user_id: int, username: Optional[str]) -> int:
+        """Drop entries affected by a user's username change; returns how many"""
+        stale_keys = [
+            key for key, entry in self._entries.items()
+            if entry.matches_user(telegram_user_id, username)
+        ]
+        for key in stale_keys:
+            del self._entries[key]
+        return len(stale_keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global cache instance shared by all search requests of this process
+search_result_cache = SearchResultCache(ttl_seconds=settings.MINI_APP_SEARCH_CACHE_TTL_SECONDS)
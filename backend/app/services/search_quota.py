@@ -0,0 +1,222 @@
+"""
+Search quota service with rolling-window counters for mini-app searches
+"""
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
+from app.models.user_search_logs import UserSearchLog
+from app.services.search_boost import SearchBoostService
+
+
+WINDOW_MINUTES = 24 * 60  # Rolling 24 hour window
+STATE_TTL_SECONDS = 60  # Reload from the database so other workers' searches are picked up
+MAX_CACHED_USERS = 10000
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_minute(moment: datetime) -> int:
+    """Convert a (naive UTC or aware) datetime to a minute bucket index"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((moment - _EPOCH) // timedelta(minutes=1))
+
+
+class _QuotaState:
+    """In-memory quota state of one user"""
+
+    __slots__ = ("buckets", "boost_available", "loaded_at")
+
+    def __init__(self, buckets: Dict[int, int], boost_available: int, loaded_at: datetime):
+        self.buckets = buckets  # minute index -> searches in that minute
+        self.boost_available = boost_available
+        self.loaded_at = loaded_at
+
+    def prune(self, now_minute: int) -> None:
+        """Drop buckets that slid out of the window"""
+        oldest_minute = now_minute - WINDOW_MINUTES
+        for minute in [m for m in self.buckets if m <= oldest_minute]:
+            del self.buckets[minute]
+
+    @property
+    def searches_count(self) -> int:
+        return sum(self.buckets.values())
+
+
+@dataclass(frozen=True)
+class SearchQuotaDecision:
+    """Result of atomically checking and consuming one search"""
+    user_id: int
+    allowed: bool
+    used_boost: bool
+    minute: int
+    searches_count: int  # Searches in the window including this one
+    boost_available: int  # Boost searches left after this one
+
+
+# Per-process quota state shared by all requests
+_states: Dict[int, _QuotaState] = {}
+_locks: Dict[int, asyncio.Lock] = {}
+
+
+class SearchQuotaService:
+    """
+    Service for mini-app search quotas.
+    Keeps per-user minute buckets of the last 24 hours and the boost balance
+    in memory; search logs and boost purchases stay the source of truth and
+    are only read when a user's state is cold or stale.
+
+    The daily limit is enforced per process: with several API workers, each
+    one only sees the other workers' searches after its state is reloaded,
+    so within STATE_TTL_SECONDS a user can get up to MAX_SEARCHES_PER_DAY
+    searches from every worker. Boost searches are enforced in the database
+    by a guarded UPDATE and cannot be overdrawn.
+    """
+
+    MAX_SEARCHES_PER_DAY = 10
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def invalidate(user_id: int) -> None:
+        """Forget cached state, e.g. after a boost purchase"""
+        _states.pop(user_id, None)
+
+    def _get_lock(self, user_id: int) -> asyncio.Lock:
+        lock = _locks.get(user_id)
+        if lock is None:
+            lock = _locks[user_id] = asyncio.Lock()
+        return lock
+
+    def _evict_stale_states(self, now: datetime) -> None:
+        """Keep the in-memory store bounded"""
+        if len(_states) < MAX_CACHED_USERS:
+            return
+        stale_before = now - timedelta(seconds=STATE_TTL_SECONDS)
+        for user_id in [uid for uid, state in _states.items() if state.loaded_at < stale_before]:
+            del _states[user_id]
+            lock = _locks.get(user_id)
+            if lock is not None and not lock.locked():
+                del _locks[user_id]
+
+    async def _get_state(self, user_id: int) -> _QuotaState:
+        """Get cached state or load it from the database (caller holds the user lock)"""
+        now = datetime.utcnow()
+        state = _states.get(user_id)
+        if state and (now - state.loaded_at).total_seconds() < STATE_TTL_SECONDS:
+            return state
+
+        window_start = now - timedelta(minutes=WINDOW_MINUTES)
+        result = await self.db.execute(
+            select(UserSearchLog.searched_at).where(
+                and_(
+                    UserSearchLog.user_id == user_id,
+                    UserSearchLog.searched_at >= window_start
+                )
+            )
+        )
+        buckets: Dict[int, int] = defaultdict(int)
+        for searched_at in result.scalars():
+            buckets[_to_minute(searched_at)] += 1
+
+        boost_available = await SearchBoostService(self.db).get_available_boost_searches(user_id)
+
+        self._evict_stale_states(now)
+        state = _QuotaState(buckets, boost_available, now)
+        _states[user_id] = state
+        return state
+
+    async def try_consume(self, user_id: int) -> SearchQuotaDecision:
+        """
+        Atomically check the quota and reserve one search.
+        Daily searches are used first, then boost searches.
+        """
+        async with self._get_lock(user_id):
+            state = await self._get_state(user_id)
+            now_minute = _to_minute(datetime.utcnow())
+            state.prune(now_minute)
+
+            searches_count = state.searches_count
+            if searches_count < self.MAX_SEARCHES_PER_DAY:
+                used_boost = False
+            elif state.boost_available > 0:
+                used_boost = True
+                state.boost_available -= 1
+            else:
+                return SearchQuotaDecision(
+                    user_id=user_id,
+                    allowed=False,
+                    used_boost=False,
+                    minute=now_minute,
+                    searches_count=searches_count,
+                    boost_available=state.boost_available
+                )
+
+            state.buckets[now_minute] += 1
+            return SearchQuotaDecision(
+                user_id=user_id,
+                allowed=True,
+                used_boost=used_boost,
+                minute=now_minute,
+                searches_count=searches_count + 1,
+                boost_available=state.boost_available
+            )
+
+    def release(self, decision: SearchQuotaDecision) -> None:
+        """Give back a reserved search that was not performed"""
+        if not decision.allowed:
+            return
+        state = _states.get(decision.user_id)
+        if not state:
+            return
+        if state.buckets.get(decision.minute):
+            state.buckets[decision.minute] -= 1
+        if decision.used_boost:
+            state.boost_available += 1
+
+    async def record(self, decision: SearchQuotaDecision, telegram_user_id: int, query: str, results_count: int) -> bool:
+        """
+        Persist a performed search (and the boost it used) in one commit.
+        Returns False and stores nothing if the boost search it reserved
+        was already spent elsewhere (e.g. by another worker).
+        """
+        self.db.add(UserSearchLog(
+            user_id=decision.user_id,
+            telegram_user_id=telegram_user_id,
+            search_query=query,
+            results_count=results_count
+        ))
+
+        if decision.used_boost:
+            # use_boost_search commits the search log together with the boost
+            used = await SearchBoostService(self.db).use_boost_search(decision.user_id)
+            if not used:
+                # The balance is stale, drop the log and reload the state next time
+                await self.db.rollback()
+                self.invalidate(decision.user_id)
+                return False
+        else:
+            await self.db.commit()
+        return True
+
+    async def get_usage(self, user_id: int) -> Tuple[int, Optional[datetime], int]:
+        """
+        Get (searches in window, time the oldest search leaves the window,
+        boost searches available) without consuming anything.
+        """
+        async with self._get_lock(user_id):
+            state = await self._get_state(user_id)
+            state.prune(_to_minute(datetime.utcnow()))
+
+            reset_time = None
+            if state.buckets:
+                oldest_minute = min(state.buckets)
+                reset_time = _EPOCH + timedelta(minutes=oldest_minute + WINDOW_MINUTES)
+
+            return state.searches_count, reset_time, state.boost_available
@@ -0,0 +1,64 @@
+"""
+Worker disabling AI content check for chats as soon as their subscription expires
+"""
+
+import asyncio
+from datetime import datetime
+
+from app.core.database import async_session
+
+
+RECHECK_INTERVAL_SECONDS = 3600  # Longest sleep, also covers subscriptions changed by other API workers
+RETRY_DELAY_SECONDS = 60  # Retry delay after a failed run
+
+
+class SubscriptionExpiryWorker:
+    """
+    Single task that sleeps until the next subscription end date and then
+    disables AI content check for all chats left without an active
+    subscription in one statement. ChatSubscriptionsService calls notify()
+    whenever a subscription changes, so the next end date is recomputed.
+    """
+
+    def __init__(self):
+        self._wakeup = asyncio.Event()
+
+    def notify(self) -> None:
+        """Recompute the next expiry after subscriptions changed"""
+        self._wakeup.set()
+
+    async def _process(self) -> float:
+        """Disable expired chats, returns the seconds until the next expiry"""
+        from app.services.chat_subscriptions import ChatSubscriptionsService
+
+        async with async_session() as db:
+            subscriptions_service = ChatSubscriptionsService(db)
+            disabled_count = await subscriptions_service.disable_ai_check_for_expired_chats()
+            if disabled_count > 0:
+                print(f"Disabled AI content check for {disabled_count} chats with expired subscriptions")
+
+            next_expiry = await subscriptions_service.get_next_expiry()
+
+        if next_expiry is None:
+            return RECHECK_INTERVAL_SECONDS
+        seconds_left = (next_expiry - datetime.now(next_expiry.tzinfo)).total_seconds()
+        return min(max(seconds_left, 0.0), RECHECK_INTERVAL_SECONDS)
+
+    async def run(self) -> None:
+        """Worker loop, runs until cancelled"""
+        while True:
+            self._wakeup.clear()
+            try:
+                delay = await self._process()
+            except Exception as e:
+                print(f"Error disabling AI content check for expired subscriptions: {e}")
+                delay = RETRY_DELAY_SECONDS
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+# Global worker instance of this process
+subscription_expiry_worker = SubscriptionExpiryWorker()
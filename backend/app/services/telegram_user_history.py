@@ -3,8 +3,8 @@ Telegram user history service
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from typing import List, Optional
+from sqlalchemy import select, desc, func
+from typing import Dict, List, Optional
 from app.models.telegram_user_history import TelegramUserHistory
 from app.schemas.telegram_user_history import TelegramUserHistoryCreate, TelegramUserHistoryResponse
 
@@ -26,6 +26,38 @@ class TelegramUserHistoryService:
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def get_users_history(self, telegram_user_ids: List[int], limit: int = 50) -> Dict[int, List[TelegramUserHistory]]:
+        """
+        Get history of changes for many users in one query, newest first,
+        at most `limit` entries per user. Users without history map to [].
+        """
+        history: Dict[int, List[TelegramUserHistory]] = {user_id: [] for user_id in telegram_user_ids}
+        if not telegram_user_ids:
+            return history
+
+        # Rank each user's entries so the per-user limit is applied in SQL
+        ranked = (
+            select(
+                TelegramUserHistory.id,
+                func.row_number().over(
+                    partition_by=TelegramUserHistory.telegram_user_id,
+                    order_by=(desc(TelegramUserHistory.changed_at), desc(TelegramUserHistory.id))
+                ).label('row_number')
+            )
+            .where(TelegramUserHistory.telegram_user_id.in_(set(telegram_user_ids)))
+            .subquery()
+        )
+        query = (
+            select(TelegramUserHistory)
+            .join(ranked, TelegramUserHistory.id == ranked.c.id)
+            .where(ranked.c.row_number <= limit)
+            .order_by(desc(TelegramUserHistory.changed_at), desc(TelegramUserHistory.id))
+        )
+        result = await self.db.execute(query)
+        for record in result.scalars():
+            history[record.telegram_user_id].append(record)
+        return history
+
     async def create_history_entry(self, history_data: TelegramUserHistoryCreate) -> TelegramUserHistory:
         """Create a new history entry"""
         history_entry = TelegramUserHistory(**history_data.dict())
@@ -9,6 +9,7 @@ from typing import Optional
 from app.models.telegram_users import TelegramUser
 from app.models.telegram_user_history import TelegramUserHistory
 from app.schemas.telegram_users import TelegramUserCreate, TelegramUserUpdate, TelegramUserData
+from app.services.username_search import UsernameSearchService
 
 
 class TelegramUserService:
@@ -22,7 +23,9 @@ class TelegramUserService:
         """Create a new telegram user"""
         db_user = TelegramUser(**user_data.model_dump())
         self.db.add(db_user)
+        await UsernameSearchService(self.db).index_user(db_user.telegram_user_id, db_user.username)
         await self.db.commit()
+        UsernameSearchService.invalidate_cached_searches({db_user.telegram_user_id: db_user.username})
         await self.db.refresh(db_user)
         return db_user
 
@@ -37,10 +40,17 @@ class TelegramUserService:
         if not db_user:
             return None
 
+        old_username = db_user.username
         for field, value in user_data.model_dump(exclude_unset=True).items():
             setattr(db_user, field, value)
 
+        reindex_username = db_user.username != old_username
+        if reindex_username:
+            await UsernameSearchService(self.db).index_user(telegram_user_id, db_user.username)
+
         await self.db.commit()
+        if reindex_username:
+            UsernameSearchService.invalidate_cached_searches({telegram_user_id: db_user.username})
         await self.db.refresh(db_user)
         return db_user
 
@@ -81,6 +91,8 @@ class TelegramUserService:
         """Create or update telegram user from Telegram API data"""
         # Try to find existing user
         db_user = await self.get_telegram_user(telegram_user_data.telegram_user_id)
+        # Username search index must follow username changes (and new users)
+        reindex_username = not db_user or db_user.username != telegram_user_data.username
 
         if db_user:
             # Record history changes for username only
@@ -107,7 +119,11 @@ class TelegramUserService:
             self.db.add(db_user)
 
         try:
+            if reindex_username:
+                await UsernameSearchService(self.db).index_user(db_user.telegram_user_id, db_user.username)
             await self.db.commit()
+            if reindex_username:
+                UsernameSearchService.invalidate_cached_searches({db_user.telegram_user_id: db_user.username})
             await self.db.refresh(db_user)
             return db_user
         except IntegrityError as e:
@@ -118,6 +134,8 @@ class TelegramUserService:
             # Fetch the user that was created by the other request
             db_user = await self.get_telegram_user(telegram_user_data.telegram_user_id)
             if db_user:
+                reindex_username = db_user.username != telegram_user_data.username
+
                 # Record history changes for username only
                 await self._record_history_change(db_user.telegram_user_id, 'username', db_user.username, telegram_user_data.username)
 
@@ -135,8 +153,12 @@ class TelegramUserService:
                 db_user.can_connect_to_business = telegram_user_data.can_connect_to_business
                 db_user.has_main_web_app = telegram_user_data.has_main_web_app
                 db_user.account_creation_date = telegram_user_data.account_creation_date
-                
+
+                if reindex_username:
+                    await UsernameSearchService(self.db).index_user(db_user.telegram_user_id, db_user.username)
                 await self.db.commit()
+                if reindex_username:
+                    UsernameSearchService.invalidate_cached_searches({db_user.telegram_user_id: db_user.username})
                 await self.db.refresh(db_user)
                 return db_user
             else:
@@ -3,21 +3,54 @@ User verification service for checking user info via Telegram API getChatMember
 """
 
 import asyncio
-from typing import Optional, List, Tuple, Dict, Any
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Optional, List, Tuple, Dict, Any, Deque
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, update, insert, exists
+from sqlalchemy.exc import IntegrityError
 from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
 
 from app.models.chat_members import ChatMember
 from app.models.telegram_users import TelegramUser
 from app.models.chats import Chat
-from app.services.telegram_users import TelegramUserService
+from app.models.telegram_user_history import TelegramUserHistory
+from app.services.username_search import UsernameSearchService
+from app.services.verification_runs import VerificationRunService
 from app.schemas.telegram_users import TelegramUserData
 from app.schemas.user_verification import (
     UserVerificationResult, BulkVerificationResponse,
     UserChangeDetail, ActiveUserInfo, ActiveUsersListResponse
 )
+from app.core.config import settings
+from app.core.database import async_session
+from app.utils.rate_limiter import AsyncRateLimiter
+
+
+MAX_RETRY_AFTER_ATTEMPTS = 3  # getChatMember attempts per user when Telegram asks to slow down
+THROUGHPUT_WINDOW_SECONDS = 10  # Live throughput is measured over this sliding window
+USER_LOOKUP_CHUNK_SIZE = 1000  # IDs per IN (...) when preloading stored usernames
+
+# Fields refreshed from getChatMember. account_creation_date is not part of
+# the API response, so a verification must not overwrite it.
+USER_UPDATE_FIELDS = (
+    'is_bot', 'first_name', 'last_name', 'username', 'language_code', 'is_premium',
+    'added_to_attachment_menu', 'can_join_groups', 'can_read_all_group_messages',
+    'supports_inline_queries', 'can_connect_to_business', 'has_main_web_app'
+)
+
+
+@dataclass(frozen=True)
+class _PendingUserWrite:
+    """Verified user data waiting for the next batched write"""
+    user_data: TelegramUserData
+    is_new_user: bool
+    old_username: Optional[str]
+    chat_db_id: Optional[int]
+    is_member: bool
+    result: UserVerificationResult
 
 
 class UserVerificationService:
@@ -33,7 +66,6 @@ class UserVerificationService:
         """
         self.bot = bot
         self.db = db
-        self.telegram_user_service = TelegramUserService(db, bot)
         
         # Progress tracking
         self.is_running = False
@@ -45,6 +77,41 @@ class UserVerificationService:
         self.users_with_errors = 0
         self.started_at = None
         self.estimated_time_remaining = None
+        self.flood_waits = 0
+        # Monotonic completion times of recently verified users, for live throughput
+        self._completed_times: Deque[float] = deque()
+        self._rate_limiter: Optional[AsyncRateLimiter] = None
+        # Users checked in this run whose last_verified_at is not written yet
+        self._verified_user_ids: List[int] = []
+        # Fresh user data not written yet, flushed every VERIFICATION_WRITE_BATCH_SIZE users
+        self._pending_writes: List[_PendingUserWrite] = []
+        # Results of the current run not stored yet; only counters stay in memory
+        self.run_id: Optional[int] = None
+        self._pending_results: List[UserVerificationResult] = []
+        # Monotonic time of the last flush; flushes double as the run's heartbeat
+        self._last_flush_at = 0.0
+        # A session can't be used concurrently, so workers take turns on it
+        self._db_lock = asyncio.Lock()
+
+    async def _get_chat_member(self, telegram_chat_id: int, telegram_user_id: int):
+        """
+        Call getChatMember through the run's rate limiter.
+        On flood wait all workers are paused and the call is retried.
+        """
+        for attempt in range(1, MAX_RETRY_AFTER_ATTEMPTS + 1):
+            if self._rate_limiter:
+                await self._rate_limiter.acquire()
+            try:
+                return await self.bot.get_chat_member(telegram_chat_id, telegram_user_id)
+            except TelegramRetryAfter as e:
+                self.flood_waits += 1
+                print(f"Flood wait during verification, pausing for {e.retry_after}s")
+                if attempt == MAX_RETRY_AFTER_ATTEMPTS:
+                    raise
+                if self._rate_limiter:
+                    self._rate_limiter.pause(e.retry_after)
+                else:
+                    await asyncio.sleep(e.retry_after)
 
     async def verify_user_info(
         self,
@@ -64,19 +131,46 @@ class UserVerificationService:
             UserVerificationResult with verification details
         """
         try:
-            # Get chat information from database for the title
-            chat_query = select(Chat).where(Chat.telegram_chat_id == telegram_chat_id)
-            chat_result = await self.db.execute(chat_query)
-            chat = chat_result.scalar_one_or_none()
-            chat_title = chat.title if chat else None
-            chat_db_id = chat.id if chat else None
+            chats = await self._load_chats([telegram_chat_id])
+            usernames = await self._load_usernames([telegram_user_id])
+        except Exception as e:
+            return UserVerificationResult(
+                telegram_user_id=telegram_user_id,
+                chat_id=telegram_chat_id,
+                chat_title=None,
+                is_updated=False,
+                has_changes=False,
+                changes={},
+                current_status=None,
+                checked_at=datetime.utcnow(),
+                error=f"Unexpected error: {str(e)}"
+            )
 
-            # Get current user data from database
-            current_user = await self.telegram_user_service.get_telegram_user(telegram_user_id)
+        result = await self._check_user(telegram_user_id, telegram_chat_id, auto_update, chats, usernames)
+        await self._flush_pending_writes()
+        return result
+
+    async def _check_user(
+        self,
+        telegram_user_id: int,
+        telegram_chat_id: int,
+        auto_update: bool,
+        chats: Dict[int, Tuple[int, Optional[str]]],
+        usernames: Dict[int, Optional[str]]
+    ) -> UserVerificationResult:
+        """
+        Check one user against Telegram and queue the database update.
 
+        Args:
+            chats: telegram_chat_id -> (chat id, title), resolved once per run
+            usernames: telegram_user_id -> stored username for known users
+        """
+        chat_db_id, chat_title = chats.get(telegram_chat_id, (None, None))
+
+        try:
             # Get actual user data from Telegram API
             try:
-                chat_member = await self.bot.get_chat_member(telegram_chat_id, telegram_user_id)
+                chat_member = await self._get_chat_member(telegram_chat_id, telegram_user_id)
             except TelegramBadRequest as e:
                 return UserVerificationResult(
                     telegram_user_id=telegram_user_id,
@@ -111,7 +205,8 @@ class UserVerificationService:
             has_changes = False
 
             # Check username only
-            old_username = current_user.username if current_user else None
+            is_new_user = telegram_user_id not in usernames
+            old_username = usernames.get(telegram_user_id)
             new_username = telegram_user.username
             if old_username != new_username:
                 changes["username"] = UserChangeDetail(
@@ -120,8 +215,18 @@ class UserVerificationService:
                 )
                 has_changes = True
 
-            # Update data if requested and changes detected
-            is_updated = False
+            result = UserVerificationResult(
+                telegram_user_id=telegram_user_id,
+                chat_id=telegram_chat_id,
+                chat_title=chat_title,
+                is_updated=auto_update,
+                has_changes=has_changes,
+                changes=changes,
+                current_status=user_status,
+                checked_at=datetime.utcnow(),
+                error=None
+            )
+
             if auto_update:
                 # Prepare user data for update
                 telegram_user_data = TelegramUserData(
@@ -140,56 +245,23 @@ class UserVerificationService:
                     has_main_web_app=getattr(telegram_user, 'has_main_web_app', None),
                     account_creation_date=None
                 )
-
-                # This will automatically record history changes
-                await self.telegram_user_service.create_or_update_user_from_telegram(telegram_user_data)
-                is_updated = True
-                
-                # Add user to chat_members if not already there and status is valid
-                if chat_db_id and user_status in ['member', 'administrator', 'creator']:
-                    # Check if chat_member record exists
-                    member_query = select(ChatMember).where(
-                        and_(
-                            ChatMember.chat_id == chat_db_id,
-                            ChatMember.telegram_user_id == telegram_user_id
-                        )
-                    )
-                    member_result = await self.db.execute(member_query)
-                    existing_member = member_result.scalar_one_or_none()
-                    
-                    if existing_member:
-                        # Update existing member status to active
-                        existing_member.status = 'active'
-                        existing_member.left_at = None  # Clear left_at if member is back
-                    else:
-                        # Create new chat_member record
-                        new_member = ChatMember(
-                            chat_id=chat_db_id,
-                            telegram_user_id=telegram_user_id,
-                            status='active',
-                            joined_at=datetime.utcnow()
-                        )
-                        self.db.add(new_member)
-                    
-                    await self.db.commit()
-
-            return UserVerificationResult(
-                telegram_user_id=telegram_user_id,
-                chat_id=telegram_chat_id,
-                chat_title=chat_title,
-                is_updated=is_updated,
-                has_changes=has_changes,
-                changes=changes,
-                current_status=user_status,
-                checked_at=datetime.utcnow(),
-                error=None
-            )
+                self._pending_writes.append(_PendingUserWrite(
+                    user_data=telegram_user_data,
+                    is_new_user=is_new_user,
+                    old_username=old_username,
+                    chat_db_id=chat_db_id,
+                    is_member=user_status in ['member', 'administrator', 'creator'],
+                    result=result
+                ))
+                usernames[telegram_user_id] = new_username
+
+            return result
 
         except Exception as e:
             return UserVerificationResult(
                 telegram_user_id=telegram_user_id,
                 chat_id=telegram_chat_id,
-                chat_title=None,
+                chat_title=chat_title,
                 is_updated=False,
                 has_changes=False,
                 changes={},
@@ -198,24 +270,264 @@ class UserVerificationService:
                 error=f"Unexpected error: {str(e)}"
             )
 
+    async def _load_chats(self, telegram_chat_ids) -> Dict[int, Tuple[int, Optional[str]]]:
+        """Resolve telegram_chat_id -> (chat id, title) in one query"""
+        telegram_chat_ids = list(set(telegram_chat_ids))
+        if not telegram_chat_ids:
+            return {}
+
+        async with self._db_lock:
+            result = await self.db.execute(
+                select(Chat.telegram_chat_id, Chat.id, Chat.title)
+                .where(Chat.telegram_chat_id.in_(telegram_chat_ids))
+            )
+            return {telegram_chat_id: (chat_id, title) for telegram_chat_id, chat_id, title in result.all()}
+
+    async def _load_usernames(self, telegram_user_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Load stored usernames of known users, in chunks of USER_LOOKUP_CHUNK_SIZE"""
+        telegram_user_ids = list(set(telegram_user_ids))
+        usernames: Dict[int, Optional[str]] = {}
+
+        async with self._db_lock:
+            for i in range(0, len(telegram_user_ids), USER_LOOKUP_CHUNK_SIZE):
+                chunk = telegram_user_ids[i:i + USER_LOOKUP_CHUNK_SIZE]
+                result = await self.db.execute(
+                    select(TelegramUser.telegram_user_id, TelegramUser.username)
+                    .where(TelegramUser.telegram_user_id.in_(chunk))
+                )
+                usernames.update(result.all())
+
+        return usernames
+
+    async def _flush_pending_writes(self) -> None:
+        """
+        Write everything verified since the last flush in one transaction:
+        user rows, username history, search index, memberships,
+        last_verified_at and the run's results. Username change
+        notifications go out afterwards.
+        """
+        if not self._pending_writes and not self._verified_user_ids and not self._pending_results:
+            return
+
+        self._last_flush_at = time.monotonic()
+        writes, self._pending_writes = self._pending_writes, []
+        user_ids, self._verified_user_ids = self._verified_user_ids, []
+        results, self._pending_results = self._pending_results, []
+        run_service = VerificationRunService(self.db)
+
+        # The same user may be queued twice (e.g. duplicate IDs), the last check wins.
+        # Earlier checks already updated `usernames`, so the user is new and
+        # the username is compared against what the first check saw.
+        latest_writes: Dict[int, _PendingUserWrite] = {}
+        for write in writes:
+            earlier = latest_writes.get(write.user_data.telegram_user_id)
+            if earlier is not None:
+                write = replace(
+                    write,
+                    is_new_user=earlier.is_new_user or write.is_new_user,
+                    old_username=earlier.old_username
+                )
+            latest_writes[write.user_data.telegram_user_id] = write
+        username_changes = [
+            (write.user_data.telegram_user_id, write.old_username, write.user_data.username)
+            for write in latest_writes.values()
+            if not write.is_new_user and write.old_username != write.user_data.username
+        ]
+
+        reindexed_usernames = {
+            write.user_data.telegram_user_id: write.user_data.username
+            for write in latest_writes.values()
+            if write.is_new_user or write.old_username != write.user_data.username
+        }
+
+        async with self._db_lock:
+            try:
+                if latest_writes:
+                    await self._save_users(list(latest_writes.values()))
+                    await self._save_memberships(list(latest_writes.values()))
+
+                    if username_changes:
+                        for telegram_user_id, old_value, new_value in username_changes:
+                            print(f"[USER_CHANGE] User {telegram_user_id}: username changed from '{old_value}' to '{new_value}'")
+                        await self.db.execute(insert(TelegramUserHistory), [
+                            {
+                                "telegram_user_id": telegram_user_id,
+                                "field_name": "username",
+                                "old_value": old_value,
+                                "new_value": new_value
+                            }
+                            for telegram_user_id, old_value, new_value in username_changes
+                        ])
+
+                    await UsernameSearchService(self.db).index_users(reindexed_usernames)
+
+                if user_ids:
+                    await self.db.execute(
+                        update(TelegramUser)
+                        .where(TelegramUser.telegram_user_id.in_(user_ids))
+                        .values(last_verified_at=datetime.utcnow())
+                        .execution_options(synchronize_session=False)
+                    )
+
+                if self.run_id:
+                    await run_service.add_results(self.run_id, results)
+                    await run_service.record_heartbeat(self.run_id)
+
+                await self.db.commit()
+                UsernameSearchService.invalidate_cached_searches(reindexed_usernames)
+            except Exception as e:
+                print(f"Failed to save verification results for {len(writes)} users: {e}")
+                await self.db.rollback()
+                for write in writes:
+                    write.result.is_updated = False
+                    write.result.error = f"Database error: {str(e)}"
+                if self.is_running:
+                    self.updated_users -= len(writes)
+                    self.users_with_errors += len(writes)
+
+                # Still keep the (now failed) results of the run
+                if self.run_id:
+                    try:
+                        await run_service.add_results(self.run_id, results)
+                        await run_service.record_heartbeat(self.run_id)
+                        await self.db.commit()
+                    except Exception as store_error:
+                        print(f"Failed to store {len(results)} results of verification run {self.run_id}: {store_error}")
+                        await self.db.rollback()
+                return
+
+        if username_changes:
+            await self._notify_username_changes(username_changes)
+
+    async def _save_users(self, writes: List[_PendingUserWrite]) -> None:
+        """Bulk update known users by primary key and bulk insert new ones"""
+        new_rows = [write.user_data.model_dump() for write in writes if write.is_new_user]
+        update_rows = [
+            {
+                "telegram_user_id": write.user_data.telegram_user_id,
+                **{field: getattr(write.user_data, field) for field in USER_UPDATE_FIELDS}
+            }
+            for write in writes if not write.is_new_user
+        ]
+
+        if new_rows:
+            try:
+                async with self.db.begin_nested():
+                    await self.db.execute(insert(TelegramUser), new_rows)
+            except IntegrityError:
+                # Some users were created meanwhile (e.g. by the message handler), update those instead
+                print(f"IntegrityError when creating {len(new_rows)} users, retrying existing ones as update...")
+                existing = await self.db.execute(
+                    select(TelegramUser.telegram_user_id)
+                    .where(TelegramUser.telegram_user_id.in_([row["telegram_user_id"] for row in new_rows]))
+                )
+                existing_ids = set(existing.scalars().all())
+                update_rows.extend(
+                    {"telegram_user_id": row["telegram_user_id"], **{field: row[field] for field in USER_UPDATE_FIELDS}}
+                    for row in new_rows if row["telegram_user_id"] in existing_ids
+                )
+                new_rows = [row for row in new_rows if row["telegram_user_id"] not in existing_ids]
+                if new_rows:
+                    await self.db.execute(insert(TelegramUser), new_rows)
+
+        if update_rows:
+            await self.db.execute(update(TelegramUser), update_rows)
+
+    async def _save_memberships(self, writes: List[_PendingUserWrite]) -> None:
+        """Mark memberships of users still in their chat active, creating missing ones"""
+        pairs = {
+            (write.chat_db_id, write.user_data.telegram_user_id)
+            for write in writes
+            if write.chat_db_id and write.is_member
+        }
+        if not pairs:
+            return
+
+        result = await self.db.execute(
+            select(ChatMember.id, ChatMember.chat_id, ChatMember.telegram_user_id).where(
+                and_(
+                    ChatMember.chat_id.in_({chat_id for chat_id, _ in pairs}),
+                    ChatMember.telegram_user_id.in_({telegram_user_id for _, telegram_user_id in pairs})
+                )
+            )
+        )
+        existing_ids = []
+        for member_id, chat_id, telegram_user_id in result.all():
+            if (chat_id, telegram_user_id) in pairs:
+                existing_ids.append(member_id)
+                pairs.discard((chat_id, telegram_user_id))
+
+        if existing_ids:
+            # Update existing members to active, clearing left_at if they are back
+            await self.db.execute(
+                update(ChatMember)
+                .where(ChatMember.id.in_(existing_ids))
+                .values(status='active', left_at=None)
+                .execution_options(synchronize_session=False)
+            )
+
+        if pairs:
+            joined_at = datetime.utcnow()
+            await self.db.execute(insert(ChatMember), [
+                {
+                    "chat_id": chat_id,
+                    "telegram_user_id": telegram_user_id,
+                    "status": 'active',
+                    "joined_at": joined_at
+                }
+                for chat_id, telegram_user_id in pairs
+            ])
+
+    async def _notify_username_changes(self, username_changes: List[Tuple[int, Optional[str], Optional[str]]]) -> None:
+        """Send group notifications for saved username changes"""
+        if not self.bot:
+            return
+
+        from app.telegram.services.user_change_notifications import UserChangeNotificationService
+
+        # Own session, so workers can keep using the run's session meanwhile
+        async with async_session() as db:
+            notification_service = UserChangeNotificationService(db, self.bot)
+            for telegram_user_id, old_value, new_value in username_changes:
+                try:
+                    await notification_service.notify_user_changes(
+                        telegram_user_id=telegram_user_id,
+                        field_name='username',
+                        old_value=old_value,
+                        new_value=new_value
+                    )
+                except Exception as e:
+                    # Don't fail the verification if notification fails
+                    print(f"[USER_CHANGE] Failed to send user change notification: {e}")
+
     async def verify_all_active_users(
         self,
         chat_id: Optional[int] = None,
         telegram_user_ids: Optional[List[int]] = None,
         auto_update: bool = True,
-        delay_between_requests: float = 0.5
+        max_users: Optional[int] = None,
+        delay_between_requests: Optional[float] = None
     ) -> BulkVerificationResponse:
         """
         Verify multiple users using Telegram API getChatMember
-        
+
+        Users are checked by a pool of concurrent workers that share one rate
+        limiter, so throughput is bound by Telegram's limits instead of the
+        latency of each request.
+
         Args:
             chat_id: Optional database chat ID to filter users
             telegram_user_ids: Optional list of specific user IDs to check
             auto_update: Whether to automatically update user data
-            delay_between_requests: Delay in seconds between API requests
-            
+            max_users: Only verify this many users, least recently verified
+                first, so repeated runs cover everyone within a fixed budget.
+                Also applies to explicit telegram_user_ids
+            delay_between_requests: Optional minimum interval in seconds between
+                API requests; defaults to VERIFICATION_REQUESTS_PER_SECOND
+
         Returns:
-            BulkVerificationResponse with all verification results
+            BulkVerificationResponse with the run summary; results are
+            stored per run and read with VerificationRunService
         """
         self.is_running = True
         self.current_progress = 0
@@ -223,58 +535,44 @@ class UserVerificationService:
         self.updated_users = 0
         self.users_with_changes = 0
         self.users_with_errors = 0
+        self.flood_waits = 0
+        self._completed_times.clear()
+        self._verified_user_ids = []
+        self._pending_results = []
+        self._last_flush_at = time.monotonic()
+        self.run_id = None
+        self.total_users = 0
         started_at = datetime.utcnow()
         self.started_at = started_at
-        results = []
+        run_status = 'failed'
 
         try:
+            run = await VerificationRunService(self.db).create_run(chat_id, auto_update, started_at)
+            self.run_id = run.id
+
+            # (telegram_user_id, telegram_chat_id) pairs to verify
+            targets: List[Tuple[int, int]] = []
+
             # If specific telegram_user_ids are provided, check them directly in the specified chat
             if telegram_user_ids and chat_id:
                 # Get chat information
                 chat_query = select(Chat).where(Chat.id == chat_id)
                 chat_result = await self.db.execute(chat_query)
                 chat = chat_result.scalar_one_or_none()
-                
+
                 if not chat:
                     raise ValueError(f"Chat with id {chat_id} not found")
-                
-                # Set total users
-                self.total_users = len(telegram_user_ids)
-                
-                # Verify each user directly
-                for idx, telegram_user_id in enumerate(telegram_user_ids, 1):
-                    # Verify user in this specific chat
-                    verification_result = await self.verify_user_info(
-                        telegram_user_id=telegram_user_id,
-                        telegram_chat_id=chat.telegram_chat_id,
-                        auto_update=auto_update
-                    )
-                    results.append(verification_result)
-                    
-                    # Update progress tracking
-                    self.current_progress = idx
-                    self.checked_users = idx
-                    if verification_result.is_updated:
-                        self.updated_users += 1
-                    if verification_result.has_changes:
-                        self.users_with_changes += 1
-                    if verification_result.error:
-                        self.users_with_errors += 1
-                    
-                    # Calculate estimated time remaining
-                    if idx > 0:
-                        elapsed = (datetime.utcnow() - started_at).total_seconds()
-                        avg_time_per_user = elapsed / idx
-                        remaining_users = self.total_users - idx
-                        self.estimated_time_remaining = remaining_users * avg_time_per_user
-
-                    # Add delay to avoid rate limiting
-                    if delay_between_requests > 0:
-                        await asyncio.sleep(delay_between_requests)
+
+                # Each user once, duplicates would only cost extra API calls
+                requested_user_ids = list(dict.fromkeys(telegram_user_ids))
+                if max_users:
+                    requested_user_ids = await self._order_by_staleness(requested_user_ids, max_users)
+
+                targets = [(telegram_user_id, chat.telegram_chat_id) for telegram_user_id in requested_user_ids]
             else:
                 # Original logic: Build query to get active chat members
                 query = (
-                    select(ChatMember, Chat, TelegramUser)
+                    select(ChatMember.telegram_user_id, Chat.telegram_chat_id)
                     .join(Chat, ChatMember.chat_id == Chat.id)
                     .join(TelegramUser, ChatMember.telegram_user_id == TelegramUser.telegram_user_id)
                     .where(ChatMember.status == 'active')
@@ -288,91 +586,198 @@ class UserVerificationService:
                 if telegram_user_ids:
                     query = query.where(ChatMember.telegram_user_id.in_(telegram_user_ids))
 
+                stalest_user_ids = None
+                if max_users:
+                    stalest_user_ids = await self._get_stalest_user_ids(max_users, chat_id, telegram_user_ids)
+                    query = query.where(ChatMember.telegram_user_id.in_(stalest_user_ids))
+
                 # Execute query
                 result = await self.db.execute(query)
-                members_data = result.all()
-                
+
                 # Group by telegram_user_id to ensure unique users
                 # For each user, select one chat (the first one found)
-                unique_users = {}
-                for member, chat, telegram_user in members_data:
-                    user_id = member.telegram_user_id
-                    if user_id not in unique_users:
-                        unique_users[user_id] = (member, chat, telegram_user)
-                
-                # Convert to list for processing
-                unique_members_data = list(unique_users.values())
-                
-                # Set total users
-                self.total_users = len(unique_members_data)
-
-                # Verify each user
-                for idx, (member, chat, telegram_user) in enumerate(unique_members_data, 1):
-                    # Verify user in this specific chat
-                    verification_result = await self.verify_user_info(
-                        telegram_user_id=member.telegram_user_id,
-                        telegram_chat_id=chat.telegram_chat_id,
-                        auto_update=auto_update
+                unique_users: Dict[int, int] = {}
+                for telegram_user_id, telegram_chat_id in result.all():
+                    unique_users.setdefault(telegram_user_id, telegram_chat_id)
+
+                if stalest_user_ids is not None:
+                    # Keep the staleness order, so an interrupted run still did the most overdue users
+                    targets = [(uid, unique_users[uid]) for uid in stalest_user_ids if uid in unique_users]
+                else:
+                    targets = list(unique_users.items())
+
+            # Set total users
+            self.total_users = len(targets)
+
+            # Resolve chats and stored usernames once for the whole run
+            chats = await self._load_chats([telegram_chat_id for _, telegram_chat_id in targets])
+            usernames = await self._load_usernames([telegram_user_id for telegram_user_id, _ in targets])
+
+            if delay_between_requests and delay_between_requests > 0:
+                self._rate_limiter = AsyncRateLimiter(1, delay_between_requests)
+            else:
+                self._rate_limiter = AsyncRateLimiter(settings.VERIFICATION_REQUESTS_PER_SECOND)
+
+            queue: asyncio.Queue = asyncio.Queue()
+            for target in targets:
+                queue.put_nowait(target)
+
+            async def worker():
+                while True:
+                    try:
+                        telegram_user_id, telegram_chat_id = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+
+                    verification_result = await self._check_user(
+                        telegram_user_id, telegram_chat_id, auto_update, chats, usernames
                     )
-                    results.append(verification_result)
-                    
-                    # Update progress tracking
-                    self.current_progress = idx
-                    self.checked_users = idx
-                    if verification_result.is_updated:
-                        self.updated_users += 1
-                    if verification_result.has_changes:
-                        self.users_with_changes += 1
-                    if verification_result.error:
-                        self.users_with_errors += 1
-                    
-                    # Calculate estimated time remaining
-                    if idx > 0:
-                        elapsed = (datetime.utcnow() - started_at).total_seconds()
-                        avg_time_per_user = elapsed / idx
-                        remaining_users = self.total_users - idx
-                        self.estimated_time_remaining = remaining_users * avg_time_per_user
-
-                    # Add delay to avoid rate limiting
-                    if delay_between_requests > 0:
-                        await asyncio.sleep(delay_between_requests)
-
-            # Calculate statistics
-            completed_at = datetime.utcnow()
-            total_checked = len(results)
-            total_updated = sum(1 for r in results if r.is_updated)
-            total_errors = sum(1 for r in results if r.error is not None)
-            total_with_changes = sum(1 for r in results if r.has_changes)
-            duration_seconds = (completed_at - started_at).total_seconds()
-
-            return BulkVerificationResponse(
-                total_checked=total_checked,
-                total_updated=total_updated,
-                total_errors=total_errors,
-                total_with_changes=total_with_changes,
-                results=results,
-                started_at=started_at,
-                completed_at=completed_at,
-                duration_seconds=duration_seconds
-            )
+                    self._pending_results.append(verification_result)
+                    self._record_progress(verification_result)
+
+                    # Every attempt counts, so users that keep failing don't starve the rest
+                    self._verified_user_ids.append(telegram_user_id)
+                    if (
+                        len(self._verified_user_ids) >= settings.VERIFICATION_WRITE_BATCH_SIZE
+                        or time.monotonic() - self._last_flush_at >= VerificationRunService.HEARTBEAT_INTERVAL_SECONDS
+                    ):
+                        await self._flush_pending_writes()
+
+            worker_count = max(1, min(settings.VERIFICATION_WORKER_TASKS, len(targets)))
+            await asyncio.gather(*(worker() for _ in range(worker_count)))
+            await self._flush_pending_writes()
+
+            run_status = 'completed'
+            return self._build_summary(started_at, errors=0)
 
         except Exception as e:
-            completed_at = datetime.utcnow()
-            duration_seconds = (completed_at - started_at).total_seconds()
-
-            return BulkVerificationResponse(
-                total_checked=len(results),
-                total_updated=sum(1 for r in results if r.is_updated),
-                total_errors=len(results) + 1,  # +1 for the main error
-                total_with_changes=sum(1 for r in results if r.has_changes),
-                results=results,
-                started_at=started_at,
-                completed_at=completed_at,
-                duration_seconds=duration_seconds
-            )
+            print(f"Verification run {self.run_id} failed: {e}")
+            return self._build_summary(started_at, errors=1)  # +1 for the main error
         finally:
+            await self._flush_pending_writes()
+            await self._finish_run(run_status, started_at)
             self.is_running = False
             self.estimated_time_remaining = None
+            self._rate_limiter = None
+
+    async def _get_stalest_user_ids(
+        self,
+        limit: int,
+        chat_id: Optional[int] = None,
+        telegram_user_ids: Optional[List[int]] = None
+    ) -> List[int]:
+        """Get active members ordered by last_verified_at, never verified first"""
+        membership = exists().where(
+            and_(
+                ChatMember.telegram_user_id == TelegramUser.telegram_user_id,
+                ChatMember.status == 'active'
+            )
+        )
+        if chat_id:
+            membership = membership.where(ChatMember.chat_id == chat_id)
+
+        query = select(TelegramUser.telegram_user_id).where(membership)
+        if telegram_user_ids:
+            query = query.where(TelegramUser.telegram_user_id.in_(telegram_user_ids))
+
+        # MySQL and SQLite sort NULLs first in ascending order, so the
+        # last_verified_at index can serve this without a filesort
+        query = query.order_by(TelegramUser.last_verified_at, TelegramUser.telegram_user_id).limit(limit)
+
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def _order_by_staleness(self, telegram_user_ids: List[int], limit: int) -> List[int]:
+        """
+        Order explicitly requested users like _get_stalest_user_ids, without
+        requiring a membership: unknown and never verified users first
+        """
+        last_verified: Dict[int, datetime] = {}
+        for i in range(0, len(telegram_user_ids), USER_LOOKUP_CHUNK_SIZE):
+            chunk = telegram_user_ids[i:i + USER_LOOKUP_CHUNK_SIZE]
+            result = await self.db.execute(
+                select(TelegramUser.telegram_user_id, TelegramUser.last_verified_at)
+                .where(
+                    and_(
+                        TelegramUser.telegram_user_id.in_(chunk),
+                        TelegramUser.last_verified_at.isnot(None)
+                    )
+                )
+            )
+            last_verified.update(result.all())
+
+        # sorted() is stable, so never verified users keep the requested order
+        ordered = sorted(
+            telegram_user_ids,
+            key=lambda telegram_user_id: (
+                telegram_user_id in last_verified,
+                last_verified.get(telegram_user_id) or datetime.min
+            )
+        )
+        return ordered[:limit]
+
+    def _build_summary(self, started_at: datetime, errors: int) -> BulkVerificationResponse:
+        """Summary of the current run from its progress counters"""
+        completed_at = datetime.utcnow()
+        return BulkVerificationResponse(
+            run_id=self.run_id,
+            total_checked=self.checked_users,
+            total_updated=self.updated_users,
+            total_errors=self.users_with_errors + errors,
+            total_with_changes=self.users_with_changes,
+            started_at=started_at,
+            completed_at=completed_at,
+            duration_seconds=(completed_at - started_at).total_seconds()
+        )
+
+    async def _finish_run(self, status: str, started_at: datetime) -> None:
+        """Store the final summary of the current run"""
+        if not self.run_id:
+            return
+
+        completed_at = datetime.utcnow()
+        try:
+            await VerificationRunService(self.db).finish_run(
+                self.run_id,
+                status=status,
+                total_users=self.total_users,
+                total_checked=self.checked_users,
+                total_updated=self.updated_users,
+                total_errors=self.users_with_errors,
+                total_with_changes=self.users_with_changes,
+                completed_at=completed_at,
+                duration_seconds=(completed_at - started_at).total_seconds()
+            )
+        except Exception as e:
+            print(f"Failed to finish verification run {self.run_id}: {e}")
+            await self.db.rollback()
+
+    def _record_progress(self, verification_result: UserVerificationResult) -> None:
+        """Update progress counters after one user is verified"""
+        self.checked_users += 1
+        self.current_progress = self.checked_users
+        if verification_result.is_updated:
+            self.updated_users += 1
+        if verification_result.has_changes:
+            self.users_with_changes += 1
+        if verification_result.error:
+            self.users_with_errors += 1
+        self._completed_times.append(time.monotonic())
+
+    def _get_users_per_second(self) -> float:
+        """Verification throughput over the last few seconds"""
+        now = time.monotonic()
+        while self._completed_times and self._completed_times[0] < now - THROUGHPUT_WINDOW_SECONDS:
+            self._completed_times.popleft()
+        if not self._completed_times or not self.started_at:
+            return 0.0
+
+        # Young runs haven't filled the window yet
+        elapsed = (datetime.utcnow() - self.started_at).total_seconds()
+        window = min(THROUGHPUT_WINDOW_SECONDS, elapsed)
+        if window <= 0:
+            return 0.0
+        return round(len(self._completed_times) / window, 2)
 
     async def get_active_users_with_chats(
         self,
@@ -455,12 +860,19 @@ class UserVerificationService:
                 "users_with_errors": 0,
                 "progress_percentage": 0,
                 "estimated_time_remaining": None,
-                "started_at": None
+                "started_at": None,
+                "run_id": None,
+                "users_per_second": 0,
+                "flood_waits": 0
             }
         
         progress_percentage = 0
         if self.total_users > 0:
             progress_percentage = round((self.current_progress / self.total_users) * 100, 2)
+
+        users_per_second = self._get_users_per_second()
+        if users_per_second > 0:
+            self.estimated_time_remaining = (self.total_users - self.checked_users) / users_per_second
         
         return {
             "is_running": self.is_running,
@@ -472,5 +884,8 @@ class UserVerificationService:
             "users_with_errors": self.users_with_errors,
             "progress_percentage": progress_percentage,
             "estimated_time_remaining": self.estimated_time_remaining,
-            "started_at": self.started_at.isoformat() if self.started_at else None
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "run_id": self.run_id,
+            "users_per_second": users_per_second,
+            "flood_waits": self.flood_waits
         }
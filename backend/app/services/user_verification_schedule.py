@@ -40,6 +40,7 @@ class VerificationScheduleService:
             interval_hours=schedule_data.interval_hours,
             auto_update=schedule_data.auto_update,
             chat_id=schedule_data.chat_id,
+            max_users_per_run=schedule_data.max_users_per_run,
             next_run_at=next_run
         )
 
@@ -196,6 +197,7 @@ class VerificationScheduleService:
             "interval_hours": schedule.interval_hours,
             "auto_update": schedule.auto_update,
             "chat_id": schedule.chat_id,
+            "max_users_per_run": schedule.max_users_per_run,
             "created_at": schedule.created_at,
             "updated_at": schedule.updated_at,
             "last_run_at": schedule.last_run_at,
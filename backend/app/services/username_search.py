@@ -0,0 +1,130 @@
+"""
+Username search index service
+"""
+
+from typing import Dict, Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, func, or_
+from app.models.telegram_users import TelegramUser
+from app.models.telegram_user_search_index import TelegramUserUsernameTrigram
+from app.services.search_cache import search_result_cache
+
+
+class UsernameSearchService:
+    """
+    Service for maintaining and querying the username trigram index.
+    Usernames are split into lowercase trigrams, so a substring search is a
+    primary key lookup instead of a `LIKE '%q%'` scan over telegram_users.
+    """
+
+    TRIGRAM_SIZE = 3
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @classmethod
+    def build_trigrams(cls, text: Optional[str]) -> Set[str]:
+        """Split text into distinct lowercase trigrams"""
+        if not text:
+            return set()
+        text = text.lower()
+        return {text[i:i + cls.TRIGRAM_SIZE] for i in range(len(text) - cls.TRIGRAM_SIZE + 1)}
+
+    @staticmethod
+    def invalidate_cached_searches(usernames: Dict[int, Optional[str]]) -> None:
+        """
+        Drop cached searches that contain these users or would now match them.
+        Call it after the reindexing transaction is committed, otherwise a
+        concurrent search could cache the old index again.
+        """
+        for telegram_user_id, username in usernames.items():
+            search_result_cache.invalidate_user(telegram_user_id, username)
+
+    async def index_user(self, telegram_user_id: int, username: Optional[str]) -> None:
+        """
+        Replace index entries for a user. Does not commit, so the index is
+        updated in the same transaction as the user row; the caller calls
+        invalidate_cached_searches once it has committed.
+        """
+        await self.db.execute(
+            delete(TelegramUserUsernameTrigram).where(
+                TelegramUserUsernameTrigram.telegram_user_id == telegram_user_id
+            )
+        )
+
+        trigrams = self.build_trigrams(username)
+        if trigrams:
+            await self.db.execute(
+                insert(TelegramUserUsernameTrigram),
+                [{"trigram": trigram, "telegram_user_id": telegram_user_id} for trigram in trigrams]
+            )
+
+    async def index_users(self, usernames: Dict[int, Optional[str]]) -> None:
+        """
+        Replace index entries for many users at once. Does not commit, the
+        caller calls invalidate_cached_searches once it has committed.
+        """
+        if not usernames:
+            return
+
+        await self.db.execute(
+            delete(TelegramUserUsernameTrigram).where(
+                TelegramUserUsernameTrigram.telegram_user_id.in_(list(usernames))
+            )
+        )
+
+        entries = [
+            {"trigram": trigram, "telegram_user_id": telegram_user_id}
+            for telegram_user_id, username in usernames.items()
+            for trigram in self.build_trigrams(username)
+        ]
+        if entries:
+            await self.db.execute(insert(TelegramUserUsernameTrigram), entries)
+
+    def build_search_query(self, query: str, prefix_only: bool = False):
+        """
+        Build a SELECT of matching TelegramUser rows.
+
+        - numeric queries also match telegram_user_id exactly
+        - prefix mode uses a range scan on the username index
+        - substring mode joins the trigram candidates and rechecks them;
+          queries shorter than a trigram have no candidates to join, so
+          they fall back to a plain substring match
+        """
+        query_lower = query.lower().strip()
+
+        id_condition = None
+        if query_lower.isdigit():
+            id_condition = TelegramUser.telegram_user_id == int(query_lower)
+
+        trigrams = self.build_trigrams(query_lower)
+
+        if prefix_only or not trigrams:
+            if prefix_only:
+                username_condition = TelegramUser.username.startswith(query_lower, autoescape=True)
+            else:
+                username_condition = func.lower(TelegramUser.username).contains(query_lower, autoescape=True)
+            conditions = [username_condition] if id_condition is None else [username_condition, id_condition]
+            return select(TelegramUser).where(or_(*conditions))
+
+        candidates = (
+            select(TelegramUserUsernameTrigram.telegram_user_id)
+            .where(TelegramUserUsernameTrigram.trigram.in_(trigrams))
+            .group_by(TelegramUserUsernameTrigram.telegram_user_id)
+            .having(func.count() == len(trigrams))
+        )
+        if id_condition is not None:
+            candidates = candidates.union(
+                select(TelegramUser.telegram_user_id).where(id_condition)
+            )
+        candidates = candidates.subquery()
+
+        # Trigram hits are a superset of substring matches, so recheck them
+        username_condition = func.lower(TelegramUser.username).contains(query_lower, autoescape=True)
+        conditions = [username_condition] if id_condition is None else [username_condition, id_condition]
+
+        return (
+            select(TelegramUser)
+            .join(candidates, TelegramUser.telegram_user_id == candidates.c.telegram_user_id)
+            .where(or_(*conditions))
+        )
@@ -0,0 +1,235 @@
+"""
+Verification runs service for persisting and reading bulk verification results
+"""
+
+from typing import Optional, List, AsyncIterator
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete, func, and_
+
+from app.models.verification_runs import VerificationRun, VerificationResult
+from app.schemas.user_verification import (
+    UserVerificationResult, UserChangeDetail, VerificationRunResponse, VerificationResultsPage
+)
+
+
+RESULT_FILTERS = ('all', 'changes', 'errors')
+
+
+class VerificationRunService:
+    """
+    Service for verification runs.
+    Results are written in batches while a run is in progress, so a run
+    never has to keep all of its results in memory.
+    """
+
+    RUNS_TO_KEEP = 20  # Older runs and their results are pruned when a run finishes
+    HEARTBEAT_INTERVAL_SECONDS = 60  # A running run writes its progress at least this often
+    STALE_AFTER_MINUTES = 30  # Running runs without a heartbeat for this long died with their process
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_run(self, chat_id: Optional[int], auto_update: bool, started_at: datetime) -> VerificationRun:
+        """Create a run in 'running' state"""
+        await self.fail_stale_runs()
+
+        run = VerificationRun(
+            chat_id=chat_id,
+            auto_update=auto_update,
+            status='running',
+            started_at=started_at,
+            heartbeat_at=started_at
+        )
+        self.db.add(run)
+        await self.db.commit()
+        await self.db.refresh(run)
+        return run
+
+    async def record_heartbeat(self, run_id: int) -> None:
+        """Mark a run as still in progress. Does not commit."""
+        await self.db.execute(
+            update(VerificationRun)
+            .where(VerificationRun.id == run_id)
+            .values(heartbeat_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def fail_stale_runs(self) -> int:
+        """
+        Mark runs left 'running' by a process that died (crash, restart,
+        cancelled job) as failed, so they are listed and pruned like any
+        finished run. Returns the number of runs marked.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(minutes=self.STALE_AFTER_MINUTES)
+        result = await self.db.execute(
+            update(VerificationRun)
+            .where(
+                and_(
+                    VerificationRun.status == 'running',
+                    # Runs created before heartbeats were recorded only have started_at
+                    func.coalesce(VerificationRun.heartbeat_at, VerificationRun.started_at) < stale_before
+                )
+            )
+            .values(status='failed', completed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+
+        if result.rowcount > 0:
+            print(f"Marked {result.rowcount} abandoned verification runs as failed")
+        return result.rowcount
+
+    async def add_results(self, run_id: int, results: List[UserVerificationResult]) -> None:
+        """Insert results of a run in one statement. Does not commit."""
+        if not results:
+            return
+
+        await self.db.execute(insert(VerificationResult), [
+            {
+                "run_id": run_id,
+                "telegram_user_id": result.telegram_user_id,
+                "chat_id": result.chat_id,
+                "chat_title": result.chat_title,
+                "is_updated": result.is_updated,
+                "has_changes": result.has_changes,
+                "changes": {field: change.model_dump() for field, change in result.changes.items()} or None,
+                "current_status": result.current_status,
+                "checked_at": result.checked_at,
+                "error": result.error
+            }
+            for result in results
+        ])
+
+    async def finish_run(
+        self,
+        run_id: int,
+        status: str,
+        total_users: int,
+        total_checked: int,
+        total_updated: int,
+        total_errors: int,
+        total_with_changes: int,
+        completed_at: datetime,
+        duration_seconds: float
+    ) -> None:
+        """Store the summary of a finished run and prune old runs"""
+        run = await self.db.get(VerificationRun, run_id)
+        if not run:
+            return
+
+        run.status = status
+        run.total_users = total_users
+        run.total_checked = total_checked
+        run.total_updated = total_updated
+        run.total_errors = total_errors
+        run.total_with_changes = total_with_changes
+        run.completed_at = completed_at
+        run.duration_seconds = duration_seconds
+        await self.db.commit()
+
+        await self._prune_old_runs()
+
+    async def _prune_old_runs(self) -> None:
+        """Delete finished runs beyond RUNS_TO_KEEP together with their results"""
+        result = await self.db.execute(
+            select(VerificationRun.id)
+            .where(VerificationRun.status != 'running')
+            .order_by(VerificationRun.id.desc())
+            .offset(self.RUNS_TO_KEEP)
+        )
+        old_run_ids = list(result.scalars().all())
+        if not old_run_ids:
+            return
+
+        await self.db.execute(delete(VerificationResult).where(VerificationResult.run_id.in_(old_run_ids)))
+        await self.db.execute(delete(VerificationRun).where(VerificationRun.id.in_(old_run_ids)))
+        await self.db.commit()
+
+    async def get_run(self, run_id: int) -> Optional[VerificationRunResponse]:
+        """Get run summary by ID"""
+        run = await self.db.get(VerificationRun, run_id)
+        return VerificationRunResponse.model_validate(run) if run else None
+
+    async def get_runs(self, skip: int = 0, limit: int = 20) -> List[VerificationRunResponse]:
+        """Get most recent runs first"""
+        result = await self.db.execute(
+            select(VerificationRun).order_by(VerificationRun.id.desc()).offset(skip).limit(limit)
+        )
+        return [VerificationRunResponse.model_validate(run) for run in result.scalars().all()]
+
+    def _results_query(self, run_id: int, result_filter: str = 'all'):
+        query = select(VerificationResult).where(VerificationResult.run_id == run_id)
+        if result_filter == 'changes':
+            query = query.where(VerificationResult.has_changes == True)
+        elif result_filter == 'errors':
+            query = query.where(VerificationResult.error.isnot(None))
+        return query
+
+    async def get_results(
+        self,
+        run_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        result_filter: str = 'all'
+    ) -> VerificationResultsPage:
+        """Get one page of run results in the order they were produced"""
+        query = self._results_query(run_id, result_filter)
+
+        total_result = await self.db.execute(
+            select(func.count()).select_from(query.subquery())
+        )
+        total = total_result.scalar()
+
+        result = await self.db.execute(
+            query.order_by(VerificationResult.id).offset(skip).limit(limit)
+        )
+        results = [self._to_schema(row) for row in result.scalars().all()]
+
+        return VerificationResultsPage(
+            run_id=run_id,
+            results=results,
+            total=total,
+            skip=skip,
+            limit=limit
+        )
+
+    async def iter_results(
+        self,
+        run_id: int,
+        result_filter: str = 'all',
+        batch_size: int = 1000
+    ) -> AsyncIterator[UserVerificationResult]:
+        """Yield all run results, reading them in primary key batches"""
+        last_id = 0
+        while True:
+            result = await self.db.execute(
+                self._results_query(run_id, result_filter)
+                .where(VerificationResult.id > last_id)
+                .order_by(VerificationResult.id)
+                .limit(batch_size)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                return
+
+            for row in rows:
+                yield self._to_schema(row)
+            last_id = rows[-1].id
+            # Rows were converted already, keep the identity map small
+            self.db.expunge_all()
+
+    @staticmethod
+    def _to_schema(row: VerificationResult) -> UserVerificationResult:
+        return UserVerificationResult(
+            telegram_user_id=row.telegram_user_id,
+            chat_id=row.chat_id,
+            chat_title=row.chat_title,
+            is_updated=row.is_updated,
+            has_changes=row.has_changes,
+            changes={field: UserChangeDetail(**change) for field, change in (row.changes or {}).items()},
+            current_status=row.current_status,
+            checked_at=row.checked_at,
+            error=row.error
+        )
@@ -0,0 +1,187 @@
+"""
+Persistent queue of welcome messages to delete once their lifetime is over
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete, func
+
+from app.core.database import async_session
+from app.models.welcome_message_deletions import WelcomeMessageDeletion
+from app.services.chat_post_scheduler import to_timestamp
+
+
+DELETE_MESSAGES_LIMIT = 100  # Telegram's deleteMessages accepts at most 100 IDs per call
+DUE_BATCH_SIZE = 1000  # Due rows loaded per pass
+COALESCE_SECONDS = 5  # Wait this long past the earliest due time so messages of a join raid are deleted together
+IDLE_CHECK_SECONDS = 60  # Re-read the queue even without notifications (picks up rows queued by other API workers)
+RETRY_DELAY_SECONDS = 60  # Retry delay after a failed deletion or while the bot is unavailable
+MAX_ATTEMPTS = 5  # Rows are dropped after this many failed deletions
+
+
+class WelcomeMessageDeletionService:
+    """Service for the welcome message deletion queue"""
+
+    def __init__(self, db: AsyncSession, bot: Optional[Bot] = None):
+        self.db = db
+        self.bot = bot
+
+    async def enqueue(self, chat_id: int, message_id: int, delay_seconds: int) -> datetime:
+        """Persist a deletion and wake the worker if it is due before its next check"""
+        delete_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+        await self.db.execute(insert(WelcomeMessageDeletion).values(
+            chat_id=chat_id,
+            message_id=message_id,
+            delete_at=delete_at,
+            attempts=0
+        ))
+        await self.db.commit()
+
+        welcome_message_deletion_worker.notify(delete_at)
+        return delete_at
+
+    async def get_next_delete_at(self) -> Optional[datetime]:
+        """Earliest pending deletion time, or None if the queue is empty"""
+        result = await self.db.execute(select(func.min(WelcomeMessageDeletion.delete_at)))
+        return result.scalar()
+
+    async def delete_due_messages(self) -> int:
+        """
+        Delete due messages with one deleteMessages call per chat and up to
+        DELETE_MESSAGES_LIMIT messages. Returns the number of processed rows.
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(WelcomeMessageDeletion)
+            .where(WelcomeMessageDeletion.delete_at <= now)
+            .order_by(WelcomeMessageDeletion.delete_at)
+            .limit(DUE_BATCH_SIZE)
+        )
+        due_rows = result.scalars().all()
+        if not due_rows:
+            return 0
+
+        rows_by_chat: Dict[int, List[WelcomeMessageDeletion]] = {}
+        for row in due_rows:
+            rows_by_chat.setdefault(row.chat_id, []).append(row)
+
+        done_ids: List[int] = []
+        failed_rows: List[WelcomeMessageDeletion] = []
+        for chat_id, rows in rows_by_chat.items():
+            for start in range(0, len(rows), DELETE_MESSAGES_LIMIT):
+                chunk = rows[start:start + DELETE_MESSAGES_LIMIT]
+                try:
+                    await self.bot.delete_messages(chat_id=chat_id, message_ids=[row.message_id for row in chunk])
+                    done_ids.extend(row.id for row in chunk)
+                except TelegramRetryAfter as e:
+                    # Leave the remaining rows due, they are picked up on the next pass
+                    print(f"[WelcomeDeletions] Flood wait of {e.retry_after}s while deleting in chat {chat_id}")
+                    await self._save_progress(done_ids, failed_rows)
+                    await asyncio.sleep(e.retry_after)
+                    return len(done_ids) + len(failed_rows)
+                except (TelegramBadRequest, TelegramForbiddenError) as e:
+                    # Messages are gone or can't be deleted by the bot anymore, retrying won't help
+                    print(f"[WelcomeDeletions] Can't delete {len(chunk)} messages in chat {chat_id}: {e}")
+                    done_ids.extend(row.id for row in chunk)
+                except Exception as e:
+                    print(f"[WelcomeDeletions] Failed to delete {len(chunk)} messages in chat {chat_id}: {e}")
+                    failed_rows.extend(chunk)
+
+        await self._save_progress(done_ids, failed_rows)
+        return len(due_rows)
+
+    async def _save_progress(self, done_ids: List[int], failed_rows: List[WelcomeMessageDeletion]) -> None:
+        """Drop processed rows and push failed ones back, in one transaction"""
+        if done_ids:
+            await self.db.execute(delete(WelcomeMessageDeletion).where(WelcomeMessageDeletion.id.in_(done_ids)))
+
+        given_up_ids = [row.id for row in failed_rows if row.attempts + 1 >= MAX_ATTEMPTS]
+        if given_up_ids:
+            print(f"[WelcomeDeletions] Giving up on {len(given_up_ids)} messages after {MAX_ATTEMPTS} attempts")
+            await self.db.execute(delete(WelcomeMessageDeletion).where(WelcomeMessageDeletion.id.in_(given_up_ids)))
+
+        retry_ids = [row.id for row in failed_rows if row.attempts + 1 < MAX_ATTEMPTS]
+        if retry_ids:
+            await self.db.execute(
+                update(WelcomeMessageDeletion)
+                .where(WelcomeMessageDeletion.id.in_(retry_ids))
+                .values(
+                    attempts=WelcomeMessageDeletion.attempts + 1,
+                    delete_at=datetime.now(timezone.utc) + timedelta(seconds=RETRY_DELAY_SECONDS)
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        await self.db.commit()
+
+
+class WelcomeMessageDeletionWorker:
+    """
+    Single task deleting queued welcome messages when they are due.
+
+    It sleeps until the earliest pending deletion and is woken early by
+    notify() when a message is enqueued with an earlier deletion time, so a
+    join raid adds rows to the queue instead of thousands of sleeping tasks,
+    and pending deletions survive a restart.
+    """
+
+    def __init__(self):
+        self._wake_at = float('inf')
+        self._wakeup = asyncio.Event()
+
+    def notify(self, delete_at: datetime) -> None:
+        """Move the wake-up time forward if a deletion is due before it"""
+        due_at = to_timestamp(delete_at) + COALESCE_SECONDS
+        if due_at < self._wake_at:
+            self._wake_at = due_at
+            self._wakeup.set()
+
+    async def _process(self) -> float:
+        """Delete all due messages, returns when the worker should look again"""
+        from app.main import get_telegram_bot
+
+        telegram_bot = get_telegram_bot()
+        if not telegram_bot or not telegram_bot.is_running:
+            print("[WelcomeDeletions] Telegram bot is not available, retrying later")
+            return time.time() + RETRY_DELAY_SECONDS
+
+        async with async_session() as db:
+            service = WelcomeMessageDeletionService(db, telegram_bot.bot)
+            while await service.delete_due_messages() >= DUE_BATCH_SIZE:
+                pass
+
+            next_delete_at = await service.get_next_delete_at()
+
+        idle_until = time.time() + IDLE_CHECK_SECONDS
+        if next_delete_at is None:
+            return idle_until
+        return min(to_timestamp(next_delete_at) + COALESCE_SECONDS, idle_until)
+
+    async def run(self) -> None:
+        """Worker loop, runs until cancelled"""
+        while True:
+            # Deletions enqueued while processing lower _wake_at through notify()
+            self._wake_at = float('inf')
+            try:
+                next_check = await self._process()
+            except Exception as e:
+                print(f"[WelcomeDeletions] Error processing deletion queue: {e}")
+                next_check = time.time() + RETRY_DELAY_SECONDS
+            self._wake_at = min(self._wake_at, next_check)
+
+            # notify() only moves the wake-up time forward, sleep until it is reached
+            while time.time() < self._wake_at:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._wake_at - time.time())
+                except asyncio.TimeoutError:
+                    pass
+
+
+# Global worker instance of this process
+welcome_message_deletion_worker = WelcomeMessageDeletionWorker()
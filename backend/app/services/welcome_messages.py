@@ -2,7 +2,6 @@
 Welcome message service for handling message variables and sending
 """
 
-import asyncio
 import json
 from typing import Optional, Dict, Any
 from aiogram import Bot
@@ -12,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.chats import Chat
 from app.models.telegram_users import TelegramUser
+from app.services.welcome_message_deletions import WelcomeMessageDeletionService
 from app.core.config import settings
 
 
@@ -166,12 +166,10 @@ class WelcomeMessageService:
             
             # Schedule message deletion if lifetime is set
             if sent_message and chat.welcome_message_lifetime_minutes:
-                asyncio.create_task(
-                    self.schedule_message_deletion(
-                        chat.telegram_chat_id,
-                        sent_message.message_id,
-                        chat.welcome_message_lifetime_minutes * 60  # Convert to seconds
-                    )
+                await self.schedule_message_deletion(
+                    chat.telegram_chat_id,
+                    sent_message.message_id,
+                    chat.welcome_message_lifetime_minutes * 60  # Convert to seconds
                 )
             
             return sent_message.message_id if sent_message else None
@@ -188,9 +186,8 @@ class WelcomeMessageService:
             return None
 
     async def schedule_message_deletion(self, chat_id: int, message_id: int, delay_seconds: int):
-        """Schedule message deletion after specified delay"""
+        """Queue message deletion after specified delay, the deletion worker performs it"""
         try:
-            await asyncio.sleep(delay_seconds)
-            await self.bot.delete_message(chat_id=chat_id, message_id=message_id)
+            await WelcomeMessageDeletionService(self.db).enqueue(chat_id, message_id, delay_seconds)
         except Exception as e:
-            print(f"Failed to delete welcome message {message_id} in chat {chat_id}: {e}")
\ No newline at end of file
+            print(f"Failed to schedule deletion of welcome message {message_id} in chat {chat_id}: {e}")
@@ -299,11 +299,8 @@ async def handle_edited_message(message: types.Message, db: AsyncSession, bot: B
         if has_active_subscription:
             ai_check_available = True
         else:
+            # The subscription expiry task disables the setting itself when the subscription ends
             print(f"AI content check subscription expired or not found for chat {chat.id}")
-            # Automatically disable AI check for this chat if subscription expired
-            print(f"Automatically disabling AI content check for chat {chat.id} due to expired subscription")
-            chat.ai_content_check_enabled = False
-            await db.commit()
 
     if ai_check_available:
         try:
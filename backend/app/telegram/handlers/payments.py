@@ -12,6 +12,7 @@ from app.services.subscription_prices import SubscriptionPricesService
 from app.services.chat_subscriptions import ChatSubscriptionsService
 from app.services.chats import ChatService
 from app.services.search_boost import SearchBoostService
+from app.services.search_quota import SearchQuotaService
 from app.models.users import User
 from app.telegram.keyboards.payment_keyboard import payment_keyboard, payment_options_keyboard, cancel_payment_keyboard
 from app.telegram.utils.constants import PaymentMessages
@@ -252,6 +253,8 @@ async def success_payment_handler(
                 price_stars=message.successful_payment.total_amount,
                 telegram_payment_charge_id=message.successful_payment.telegram_payment_charge_id
             )
+            # Reload the cached boost balance on the next search
+            SearchQuotaService.invalidate(user.id)
             
             confirmation_message = (
                 f"✅ Оплата успешна!\n\n"
@@ -0,0 +1,41 @@
+"""
+Async rate limiting utilities for Telegram Bot API calls
+"""
+
+import asyncio
+from typing import Optional
+
+
+class AsyncRateLimiter:
+    """
+    Evenly spaced rate limiter shared by concurrent tasks.
+
+    Every call to acquire() reserves the next free time slot, so N tasks
+    calling it in parallel are released at most `rate` times per `period`
+    without waiting for each other's requests to finish.
+    """
+
+    def __init__(self, rate: float, period: float = 1.0):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.interval = period / rate
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until the caller is allowed to perform one request"""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float, now: Optional[float] = None) -> None:
+        """Push back all future slots, e.g. after a flood-wait response"""
+        if now is None:
+            now = asyncio.get_running_loop().time()
+        self._next_slot = max(self._next_slot, now + seconds)
@@ -0,0 +1,39 @@
+"""
+Shared fixtures: the app runs against a throwaway SQLite database
+"""
+
+import os
+import tempfile
+
+# Must be set before app.core.config is imported anywhere
+_db_path = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import Base, engine, async_session
+
+
+@pytest.fixture
+async def db():
+    """Session on freshly created tables"""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with async_session() as session:
+        yield session
+
+
+@pytest.fixture
+def statement_counter():
+    """Counts SQL statements sent to the database while the test runs"""
+    counter = {"count": 0}
+
+    def on_execute(*args):
+        counter["count"] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
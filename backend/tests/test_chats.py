@@ -0,0 +1,67 @@
+"""
+Tests for the chat list queries
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.models.chats import Chat
+from app.models.users import User
+from app.models.chat_moderators import ChatModerator
+from app.models.chat_subscriptions import ChatSubscription
+from app.services.chats import ChatService
+
+
+async def _create_chats(db, count):
+    """Groups with an admin, two moderators, a subscription and a linked channel each"""
+    now = datetime.now()
+    await db.execute(insert(User), [
+        {"id": i, "telegram_id": 1000 + i, "username": f"user{i}", "first_name": "User"}
+        for i in range(1, count + 1)
+    ])
+    await db.execute(insert(Chat), [
+        {"id": 10000 + i, "telegram_chat_id": -10000 - i, "chat_type": "channel", "title": f"Channel {i}", "added_by_user_id": i}
+        for i in range(1, count + 1)
+    ])
+    await db.execute(insert(Chat), [
+        {
+            "id": i, "telegram_chat_id": -i, "chat_type": "supergroup", "title": f"Group {i}",
+            "added_by_user_id": i, "linked_channel_id": 10000 + i
+        }
+        for i in range(1, count + 1)
+    ])
+    await db.execute(insert(ChatModerator), [
+        {"chat_id": i, "moderator_user_id": 100 * i + n, "first_name": "Moderator", "added_by_user_id": i}
+        for i in range(1, count + 1)
+        for n in range(2)
+    ])
+    await db.execute(insert(ChatSubscription), [
+        {
+            "chat_id": i, "subscription_type": "month", "price_stars": 1,
+            "start_date": now - timedelta(days=1), "end_date": now + timedelta(days=30)
+        }
+        for i in range(1, count + 1)
+    ])
+    await db.commit()
+
+
+async def test_chat_list_uses_constant_number_of_statements(db, statement_counter):
+    statement_counts = []
+    for count in (5, 50):
+        await _create_chats(db, count)
+
+        statement_counter["count"] = 0
+        chats = await ChatService(db).get_chats_with_linked_channels_info(0, 1000)
+        statement_counts.append(statement_counter["count"])
+
+        assert len(chats) == count
+        assert all(len(chat.chat_moderators) == 2 for chat in chats)
+        assert all(chat.active_subscription is not None for chat in chats)
+        assert all(chat.linked_channel_info is not None for chat in chats)
+
+        for model in (ChatSubscription, ChatModerator, Chat, User):
+            await db.execute(model.__table__.delete())
+        await db.commit()
+
+    assert statement_counts[0] == statement_counts[1]
@@ -0,0 +1,129 @@
+"""
+Tests for the background job runner
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.core.jobs import CronSchedule, IntervalSchedule, Job, JobRunner
+
+
+async def _wait_for(condition, timeout=2.0):
+    """Poll until condition() is true"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.01)
+
+
+def test_cron_steps():
+    schedule = CronSchedule("*/15 * * * *")
+    assert schedule.next_run(datetime(2026, 10, 19, 10, 7, 30)) == datetime(2026, 10, 19, 10, 15)
+    assert schedule.next_run(datetime(2026, 10, 19, 10, 45)) == datetime(2026, 10, 19, 11, 0)
+
+    schedule = CronSchedule("10-30/10 3 * * *")
+    assert schedule.minutes == {10, 20, 30}
+    assert schedule.next_run(datetime(2026, 10, 19, 3, 30)) == datetime(2026, 10, 20, 3, 10)
+
+
+def test_cron_day_of_month_or_day_of_week():
+    # Both day fields restricted: the 13th or any Friday
+    schedule = CronSchedule("0 0 13 * 5")
+    assert schedule.next_run(datetime(2026, 10, 19, 12, 0)) == datetime(2026, 10, 23)  # Friday
+    assert schedule.next_run(datetime(2026, 11, 7, 12, 0)) == datetime(2026, 11, 13)  # Friday the 13th
+    assert schedule.next_run(datetime(2027, 1, 9, 12, 0)) == datetime(2027, 1, 13)  # Wednesday
+
+    # Only day-of-week restricted, 7 is Sunday as well
+    assert CronSchedule("0 0 * * 7").next_run(datetime(2026, 10, 19)) == datetime(2026, 10, 25)
+
+
+def test_cron_february_29():
+    schedule = CronSchedule("0 12 29 2 *")
+    assert schedule.next_run(datetime(2026, 3, 1)) == datetime(2028, 2, 29, 12, 0)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "5-1 * * * *", "*/0 * * * *", "0 0 31 2 *"])
+def test_cron_rejects_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression).next_run(datetime(2026, 1, 1))
+
+
+def test_retry_delay_grows_and_is_capped():
+    job = Job("job", None, retry_delay_seconds=30, max_retry_delay_seconds=100)
+    delays = []
+    for failures in range(5):
+        job.metrics.consecutive_failures = failures
+        delays.append(job.get_retry_delay())
+    assert delays == [30, 30, 60, 100, 100]
+
+
+async def test_failure_streak_restarts_after_long_run():
+    async def fail_late():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("boom")
+
+    job = Job("job", fail_late, max_retry_delay_seconds=0.01)
+    job.metrics.consecutive_failures = 5
+    assert not await job.run_once()
+    assert job.metrics.consecutive_failures == 1
+
+
+async def test_job_timeout():
+    async def hang():
+        await asyncio.sleep(10)
+
+    job = Job("job", hang, timeout_seconds=0.05)
+    assert not await job.run_once()
+    assert job.metrics.last_error == "Timed out after 0.05s"
+    assert job.metrics.failures == 1 and not job.metrics.is_running
+
+
+async def test_timeout_error_raised_by_job_without_timeout():
+    async def network_timeout():
+        raise TimeoutError("socket")
+
+    job = Job("job", network_timeout)
+    assert not await job.run_once()
+    assert job.metrics.last_error == "TimeoutError: socket"
+
+
+async def test_worker_is_restarted_after_crash():
+    calls = []
+
+    async def worker():
+        calls.append(None)
+        if len(calls) == 1:
+            raise TimeoutError("socket")
+        if len(calls) == 2:
+            raise RuntimeError("boom")
+
+    runner = JobRunner()
+    job = runner.add_worker("worker", worker, retry_delay_seconds=0.01)
+    await runner.start()
+    try:
+        await _wait_for(lambda: len(calls) >= 4)
+    finally:
+        await runner.stop()
+
+    assert job.metrics.failures == 2
+    assert job.metrics.last_error == "RuntimeError: boom"
+    assert not runner.is_running
+
+
+async def test_overrunning_job_skips_missed_slots():
+    async def slow():
+        await asyncio.sleep(0.05)
+
+    runner = JobRunner()
+    job = runner.add_job("slow", slow, IntervalSchedule(0.01))
+    await runner.start()
+    try:
+        await _wait_for(lambda: job.metrics.runs >= 3)
+    finally:
+        await runner.stop()
+
+    assert job.metrics.overruns >= 2
+    assert job.metrics.failures == 0
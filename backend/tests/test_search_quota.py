@@ -0,0 +1,56 @@
+"""
+Tests for the mini-app search quota
+"""
+
+from sqlalchemy import insert, select, update, func
+
+from app.models.users import User
+from app.models.user_search_logs import UserSearchLog
+from app.models.search_boost_purchases import SearchBoostPurchase
+from app.services.search_quota import SearchQuotaService
+
+
+async def _create_user_out_of_daily_searches(db):
+    await db.execute(insert(User).values(id=1, telegram_id=1001, username="user", first_name="User"))
+    await db.execute(insert(UserSearchLog), [
+        {"user_id": 1, "telegram_user_id": 1001, "search_query": "query", "results_count": 0}
+        for _ in range(SearchQuotaService.MAX_SEARCHES_PER_DAY)
+    ])
+    await db.execute(insert(SearchBoostPurchase).values(
+        id=1, user_id=1, telegram_user_id=1001, boost_amount=1, price_stars=1
+    ))
+    await db.commit()
+    SearchQuotaService.invalidate(1)
+
+
+async def _count_search_logs(db):
+    return (await db.execute(select(func.count()).select_from(UserSearchLog))).scalar()
+
+
+async def test_record_uses_boost_search(db):
+    await _create_user_out_of_daily_searches(db)
+    quota_service = SearchQuotaService(db)
+
+    decision = await quota_service.try_consume(1)
+    assert decision.allowed and decision.used_boost
+    assert await quota_service.record(decision, 1001, "query", 0)
+
+    assert await _count_search_logs(db) == SearchQuotaService.MAX_SEARCHES_PER_DAY + 1
+    purchase = (await db.execute(select(SearchBoostPurchase))).scalar_one()
+    assert purchase.used_searches == 1 and not purchase.is_active
+
+
+async def test_record_rejects_search_when_boost_was_spent_elsewhere(db):
+    await _create_user_out_of_daily_searches(db)
+    quota_service = SearchQuotaService(db)
+
+    decision = await quota_service.try_consume(1)
+    assert decision.allowed and decision.used_boost
+
+    # Another worker spends the last boost search in the meantime
+    await db.execute(update(SearchBoostPurchase).values(used_searches=1, is_active=False))
+    await db.commit()
+
+    assert not await quota_service.record(decision, 1001, "query", 0)
+    assert await _count_search_logs(db) == SearchQuotaService.MAX_SEARCHES_PER_DAY
+    assert not (await quota_service.try_consume(1)).allowed
@@ -0,0 +1,82 @@
+"""
+Tests for the bulk user verification
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.chats import Chat
+from app.models.telegram_users import TelegramUser
+from app.services.user_verification import UserVerificationService
+
+
+class FakeBot:
+    """Answers getChatMember for any user with a member named after its ID"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_chat_member(self, chat_id, user_id):
+        self.calls.append(user_id)
+        user = SimpleNamespace(id=user_id, is_bot=False, first_name="User", last_name=None, username=f"user{user_id}")
+        return SimpleNamespace(status="member", user=user)
+
+
+async def test_duplicate_ids_insert_new_user(db, monkeypatch):
+    monkeypatch.setattr(settings, "VERIFICATION_REQUESTS_PER_SECOND", 1000)
+    chat = Chat(telegram_chat_id=-100, chat_type="supergroup", title="Chat", is_active=True, added_by_user_id=1)
+    db.add(chat)
+    await db.commit()
+
+    bot = FakeBot()
+    response = await UserVerificationService(bot, db).verify_all_active_users(
+        chat_id=chat.id, telegram_user_ids=[42, 42, 43]
+    )
+
+    assert response.total_errors == 0
+    assert sorted(bot.calls) == [42, 43]
+    result = await db.execute(select(TelegramUser.telegram_user_id, TelegramUser.username))
+    assert sorted(result.all()) == [(42, "user42"), (43, "user43")]
+
+
+async def test_repeated_checks_of_new_user_are_merged(db):
+    chat = Chat(telegram_chat_id=-100, chat_type="supergroup", title="Chat", is_active=True, added_by_user_id=1)
+    db.add(chat)
+    await db.commit()
+
+    service = UserVerificationService(FakeBot(), db)
+    chats = {chat.telegram_chat_id: (chat.id, chat.title)}
+    usernames = {}
+    results = [
+        await service._check_user(42, chat.telegram_chat_id, True, chats, usernames)
+        for _ in range(2)
+    ]
+    await service._flush_pending_writes()
+
+    assert [result.error for result in results] == [None, None]
+    result = await db.execute(select(TelegramUser.username).where(TelegramUser.telegram_user_id == 42))
+    assert result.scalar_one() == "user42"
+
+
+async def test_max_users_caps_explicit_ids_stalest_first(db, monkeypatch):
+    monkeypatch.setattr(settings, "VERIFICATION_REQUESTS_PER_SECOND", 1000)
+    chat = Chat(telegram_chat_id=-100, chat_type="supergroup", title="Chat", is_active=True, added_by_user_id=1)
+    db.add(chat)
+    db.add_all([
+        TelegramUser(telegram_user_id=1, username="user1", first_name="User", last_verified_at=datetime(2026, 1, 2)),
+        TelegramUser(telegram_user_id=2, username="user2", first_name="User", last_verified_at=datetime(2026, 1, 1)),
+        TelegramUser(telegram_user_id=3, username="user3", first_name="User", last_verified_at=None),
+    ])
+    await db.commit()
+
+    bot = FakeBot()
+    response = await UserVerificationService(bot, db).verify_all_active_users(
+        chat_id=chat.id, telegram_user_ids=[1, 2, 3, 4], max_users=3
+    )
+
+    assert response.total_checked == 3
+    # Unknown and never verified users first, then the least recently verified
+    assert sorted(bot.calls) == [2, 3, 4]
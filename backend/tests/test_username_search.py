@@ -0,0 +1,44 @@
+"""
+Tests for the username search query
+"""
+
+from app.schemas.telegram_users import TelegramUserData
+from app.services.telegram_users import TelegramUserService
+from app.services.search_cache import search_result_cache
+from app.services.username_search import UsernameSearchService
+
+
+async def _search(db, query, prefix_only=False):
+    result = await db.execute(UsernameSearchService(db).build_search_query(query, prefix_only))
+    return sorted(user.telegram_user_id for user in result.scalars().all())
+
+
+async def test_search_modes(db):
+    service = TelegramUserService(db)
+    for telegram_user_id, username in [(1, "ScamBoss"), (2, "bossman"), (3, "a_b"), (4, "axb")]:
+        await service.create_or_update_user_from_telegram(
+            TelegramUserData(telegram_user_id=telegram_user_id, username=username, first_name="User", is_bot=False)
+        )
+
+    assert await _search(db, "BOSS") == [1, 2]
+    assert await _search(db, "boss", prefix_only=True) == [2]
+    assert await _search(db, "a_b") == [3]
+    # Shorter than a trigram: still a substring match unless prefix_only is set
+    assert await _search(db, "os") == [1, 2]
+    assert await _search(db, "os", prefix_only=True) == []
+    assert await _search(db, "b") == [1, 2, 3, 4]
+
+
+async def test_cached_searches_are_invalidated_after_commit(db, monkeypatch):
+    invalidated = []
+
+    def invalidate_user(telegram_user_id, username):
+        # A search running now must already see the committed index
+        invalidated.append((telegram_user_id, username, db.in_transaction()))
+
+    monkeypatch.setattr(search_result_cache, "invalidate_user", invalidate_user)
+    await TelegramUserService(db).create_or_update_user_from_telegram(
+        TelegramUserData(telegram_user_id=1, username="bossman", first_name="User", is_bot=False)
+    )
+
+    assert invalidated == [(1, "bossman", False)]
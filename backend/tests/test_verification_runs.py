@@ -0,0 +1,41 @@
+"""
+Tests for stored verification runs
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from app.models.verification_runs import VerificationRun
+from app.services.verification_runs import VerificationRunService
+
+
+async def test_abandoned_runs_are_failed_when_a_run_starts(db):
+    now = datetime.utcnow()
+    long_ago = now - timedelta(minutes=VerificationRunService.STALE_AFTER_MINUTES + 1)
+    await db.execute(insert(VerificationRun), [
+        # Process died without finishing the run
+        {"id": 1, "status": "running", "started_at": long_ago, "heartbeat_at": long_ago},
+        # Run from before heartbeats were recorded
+        {"id": 2, "status": "running", "started_at": long_ago, "heartbeat_at": None},
+        # Long run that is still alive
+        {"id": 3, "status": "running", "started_at": long_ago, "heartbeat_at": now},
+    ])
+    await db.commit()
+
+    service = VerificationRunService(db)
+    run = await service.create_run(chat_id=None, auto_update=True, started_at=now)
+
+    result = await db.execute(select(VerificationRun.id, VerificationRun.status).order_by(VerificationRun.id))
+    assert result.all() == [(1, "failed"), (2, "failed"), (3, "running"), (run.id, "running")]
+
+
+async def test_heartbeat_keeps_run_alive(db):
+    long_ago = datetime.utcnow() - timedelta(minutes=VerificationRunService.STALE_AFTER_MINUTES + 1)
+    service = VerificationRunService(db)
+    run = await service.create_run(chat_id=None, auto_update=True, started_at=long_ago)
+
+    await service.record_heartbeat(run.id)
+    await db.commit()
+
+    assert await service.fail_stale_runs() == 0
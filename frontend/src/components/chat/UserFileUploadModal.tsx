@@ -15,6 +15,7 @@ interface UserVerificationResult {
 }
 
 interface BulkVerificationResponse {
+  run_id: number | null;
   total_checked: number;
   total_updated: number;
   total_errors: number;
@@ -31,6 +32,25 @@ interface UserFileUploadModalProps {
   onSuccess?: () => void;
 }
 
+const RESULTS_PAGE_SIZE = 1000; // Largest page the results endpoint serves
+
+const loadRunResults = async (runId: number): Promise<UserVerificationResult[]> => {
+  const results: UserVerificationResult[] = [];
+  while (true) {
+    const response = await fetch(
+      `/api/v1/admin/user-verification/runs/${runId}/results?skip=${results.length}&limit=${RESULTS_PAGE_SIZE}`
+    );
+    if (!response.ok) {
+      throw new Error('Не удалось загрузить результаты проверки');
+    }
+    const page: { results: UserVerificationResult[]; total: number } = await response.json();
+    results.push(...page.results);
+    if (page.results.length === 0 || results.length >= page.total) {
+      return results;
+    }
+  }
+};
+
 export const UserFileUploadModal: React.FC<UserFileUploadModalProps> = ({ chatId, onClose, onSuccess }) => {
   const [uploadedFile, setUploadedFile] = useState<File | null>(null);
   const [uploadedUserIds, setUploadedUserIds] = useState<number[]>([]);
@@ -171,8 +191,7 @@ export const UserFileUploadModal: React.FC<UserFileUploadModalProps> = ({ chatId
         body: JSON.stringify({
           chat_id: chatId,
           telegram_user_ids: uploadedUserIds,
-          auto_update: autoUpdate,
-          delay_between_requests: 0.5
+          auto_update: autoUpdate
         })
       });
 
@@ -182,8 +201,12 @@ export const UserFileUploadModal: React.FC<UserFileUploadModalProps> = ({ chatId
       }
 
       const result: BulkVerificationResponse = await response.json();
-      setResults(result.results);
       setStats(result);
+
+      // Results are stored per run, load all of their pages
+      if (result.run_id) {
+        setResults(await loadRunResults(result.run_id));
+      }
       
       // Don't call onSuccess here - let user see results first
       // onSuccess will be called when modal is closed
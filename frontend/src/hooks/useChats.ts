@@ -2,12 +2,22 @@ import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { api } from '../utils/api';
 import { Chat, ChatDetailResponse, LinkChannelResponse, ChatModerator, AddModeratorRequest, ModeratorResponse, ChatSubscription, ChatSubscriptionCreate, ChatMembersResponse, WelcomeMessageSettings } from '../types';
 
+const CHATS_PAGE_SIZE = 100;
+
 export const useChats = () => {
   return useQuery({
     queryKey: ['chats'],
     queryFn: async (): Promise<{ chats: Chat[] }> => {
-      const response = await api.get('/chats');
-      return response.data;
+      // The API returns one page at a time, load pages until a short one
+      const chats: Chat[] = [];
+      for (let skip = 0; ; skip += CHATS_PAGE_SIZE) {
+        const response = await api.get('/chats', { params: { skip, limit: CHATS_PAGE_SIZE } });
+        const page: Chat[] = response.data.chats;
+        chats.push(...page);
+        if (page.length < CHATS_PAGE_SIZE) {
+          return { chats };
+        }
+      }
     },
   });
 };
@@ -30,6 +30,7 @@ interface UserVerificationResult {
 }
 
 interface BulkVerificationResponse {
+  run_id: number | null;
   total_checked: number;
   total_updated: number;
   total_errors: number;
@@ -47,6 +48,7 @@ interface VerificationSchedule {
   interval_hours: number;
   auto_update: boolean;
   chat_id: number | null;
+  max_users_per_run: number | null;
   created_at: string;
   updated_at: string;
   last_run_at: string | null;
@@ -87,7 +89,8 @@ export const UserVerification: React.FC = () => {
     schedule_time: '02:00',
     interval_hours: 24,
     auto_update: true,
-    chat_id: ''
+    chat_id: '',
+    max_users_per_run: ''
   });
   const [editingScheduleId, setEditingScheduleId] = useState<number | null>(null);
   
@@ -240,6 +243,7 @@ export const UserVerification: React.FC = () => {
       const result = await response.json();
       setResults([result]);
       setStats({
+        run_id: null,
         total_checked: 1,
         total_with_changes: result.has_changes ? 1 : 0,
         total_updated: result.is_updated ? 1 : 0,
@@ -268,8 +272,7 @@ export const UserVerification: React.FC = () => {
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
           chat_id: bulkChatId ? parseInt(bulkChatId) : null,
-          auto_update: bulkAutoUpdate,
-          delay_between_requests: 0.5
+          auto_update: bulkAutoUpdate
         })
       });
       
@@ -278,9 +281,17 @@ export const UserVerification: React.FC = () => {
         throw new Error(error.detail || 'Ошибка проверки');
       }
       
-      const result = await response.json();
-      setResults(result.results);
+      const result: BulkVerificationResponse = await response.json();
       setStats(result);
+
+      // Results are stored per run, load the first page of them
+      if (result.run_id) {
+        const resultsResponse = await fetch(`/api/v1/admin/user-verification/runs/${result.run_id}/results?limit=1000`);
+        if (resultsResponse.ok) {
+          const page = await resultsResponse.json();
+          setResults(page.results);
+        }
+      }
     } catch (error: any) {
       console.error('Error verifying users:', error);
       alert('Ошибка проверки: ' + error.message);
@@ -306,7 +317,8 @@ export const UserVerification: React.FC = () => {
       const payload = {
         ...scheduleForm,
         schedule_time: scheduleForm.schedule_time + ':00',
-        chat_id: scheduleForm.chat_id ? parseInt(scheduleForm.chat_id) : null
+        chat_id: scheduleForm.chat_id ? parseInt(scheduleForm.chat_id) : null,
+        max_users_per_run: scheduleForm.max_users_per_run ? parseInt(scheduleForm.max_users_per_run) : null
       };
 
       const url = editingScheduleId 
@@ -332,7 +344,8 @@ export const UserVerification: React.FC = () => {
         schedule_time: '02:00',
         interval_hours: 24,
         auto_update: true,
-        chat_id: ''
+        chat_id: '',
+        max_users_per_run: ''
       });
     } catch (error: any) {
       console.error('Error saving schedule:', error);
@@ -377,7 +390,8 @@ export const UserVerification: React.FC = () => {
       schedule_time: schedule.schedule_time.substring(0, 5),
       interval_hours: schedule.interval_hours,
       auto_update: schedule.auto_update,
-      chat_id: schedule.chat_id ? schedule.chat_id.toString() : ''
+      chat_id: schedule.chat_id ? schedule.chat_id.toString() : '',
+      max_users_per_run: schedule.max_users_per_run ? schedule.max_users_per_run.toString() : ''
     });
     setShowScheduleForm(true);
   };
@@ -676,7 +690,8 @@ export const UserVerification: React.FC = () => {
                       schedule_time: '02:00',
                       interval_hours: 24,
                       auto_update: true,
-                      chat_id: ''
+                      chat_id: '',
+                      max_users_per_run: ''
                     });
                   }
                 }}
@@ -718,6 +733,23 @@ export const UserVerification: React.FC = () => {
                       className="w-full px-4 py-2.5 border border-gray-300 rounded-lg focus:ring-2 focus:ring-purple-500 focus:border-transparent"
                     />
                   </div>
+
+                  <div className="md:col-span-2">
+                    <label className="block text-sm font-medium text-gray-700 mb-2">
+                      Пользователей за запуск
+                    </label>
+                    <input
+                      type="number"
+                      min="1"
+                      placeholder="Все"
+                      value={scheduleForm.max_users_per_run}
+                      onChange={(e) => setScheduleForm({ ...scheduleForm, max_users_per_run: e.target.value })}
+                      className="w-full px-4 py-2.5 border border-gray-300 rounded-lg focus:ring-2 focus:ring-purple-500 focus:border-transparent"
+                    />
+                    <p className="mt-1 text-xs text-gray-500">
+                      Проверяются пользователи, которые дольше всех не проверялись
+                    </p>
+                  </div>
                 </div>
 
                 <div className="mb-4">
@@ -801,6 +833,11 @@ export const UserVerification: React.FC = () => {
                             <Clock className="w-4 h-4" />
                             {schedule.schedule_time} / {schedule.interval_hours}ч
                           </span>
+                          {schedule.max_users_per_run && (
+                            <span className="text-sm text-gray-600 bg-white px-2 py-1 rounded">
+                              👥 до {schedule.max_users_per_run}
+                            </span>
+                          )}
                           {schedule.chat_title && (
                             <span className="text-sm text-gray-600 bg-white px-2 py-1 rounded">
                               📱 {schedule.chat_title}
@@ -34,6 +34,9 @@ export interface UserSearchRequest {
   limit?: number
   offset?: number
   telegram_user_id: number  // User performing the search
+  prefix_only?: boolean  // Match usernames starting with query instead of containing it
+  after_telegram_user_id?: number | null  // Keyset cursor (next_cursor of previous page)
+  exact_count?: boolean  // Count all matches instead of stopping at the count cap
 }
 
 export interface UserHistoryEntry {
@@ -64,6 +67,8 @@ export interface UserSearchResponse {
   total: number
   limit: number
   offset: number
+  total_capped: boolean  // True when total stopped at the count cap ("1000+")
+  next_cursor?: number | null  // Pass as after_telegram_user_id to get the next page
 }
 
 export interface SearchLimitResponse {